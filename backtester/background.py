@@ -0,0 +1,116 @@
+"""Background backtest runs with progress and partial equity curves"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from backtester.data_handler import DataHandler
+from backtester.engine import Backtester
+from backtester.price_cache import file_fingerprint, load_prices
+
+class BacktestCancelled(Exception):
+    pass
+
+class BacktestJob:
+    """Handle to one background run.
+
+    The worker thread replaces the progress fields wholesale on each
+    report, so a reader (e.g. a Streamlit rerun) always sees a consistent
+    snapshot without locking.
+    """
+    def __init__(self, config: Dict):
+        self.config = config
+        self.steps = 0
+        self.bars_total = None
+        self.equity_curve = np.empty(0)
+        self.stats = {}
+        self.results = None
+        self.error = None
+        self.cached = False
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def done(self) -> bool:
+        return self._future is not None and self._future.done()
+
+    @property
+    def fraction(self) -> float:
+        if self.done:
+            return 1.0
+        if not self.bars_total:
+            return 0.0
+        return min(self.steps / self.bars_total, 1.0)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        self._future.result(timeout)
+        return self.results
+
+    def _report(self, snapshot: Dict):
+        if self._cancel.is_set():
+            raise BacktestCancelled()
+        self.steps = snapshot['steps']
+        self.bars_total = snapshot['bars_total']
+        self.equity_curve = snapshot['equity_curve']
+        self.stats = snapshot['stats']
+
+class PriceStore:
+    """Loaded price arrays per CSV, reloaded only when the file's fingerprint changes"""
+    def __init__(self):
+        self._prices = {}  # csv_path: (fingerprint, index, columns)
+        self._lock = threading.Lock()
+
+    def get(self, csv_path: str) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+        fingerprint = file_fingerprint(csv_path)
+        with self._lock:
+            entry = self._prices.get(csv_path)
+            if entry is None or entry[0] != fingerprint:
+                entry = self._prices[csv_path] = (fingerprint, *load_prices(csv_path))
+        return entry[1], entry[2]
+
+    def data_handler(self, data_config: Dict) -> Optional[DataHandler]:
+        """Fresh cursor over resident arrays, or None for configs the engine must load itself"""
+        if 'universe' in data_config or data_config.get('streaming', False):
+            return None
+        return DataHandler.from_arrays(data_config['symbol'], *self.get(data_config['csv_path']))
+
+class BacktestRunner:
+    """Thread pool of backtest workers sharing one PriceStore.
+
+    Prices are loaded once per CSV (and again only when the file changes);
+    every job gets its own DataHandler cursor over the same read-only
+    arrays, so concurrent and repeated runs skip loading entirely.
+    """
+    def __init__(self, max_workers: int = 2, progress_every: int = 250):
+        self.progress_every = progress_every
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='backtest')
+        self.store = PriceStore()
+
+    def prices(self, csv_path: str) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+        return self.store.get(csv_path)
+
+    def submit(self, config: Dict) -> BacktestJob:
+        job = BacktestJob(config)
+        job._future = self._pool.submit(self._run, job)
+        return job
+
+    def _run(self, job: BacktestJob):
+        config = job.config
+        try:
+            backtester = Backtester(config, self.store.data_handler(config['data']))
+            # run_backtest checks the result cache itself; a hit reports no progress
+            job.results = backtester.run_backtest(job._report, self.progress_every)
+            job.cached = backtester.cached
+            job.equity_curve = job.results['equity_curve']
+        except BacktestCancelled:
+            logging.info("Backtest cancelled")
+        except Exception as exc:
+            logging.exception("Backtest failed")
+            job.error = exc
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,132 @@
+"""Thin client for the backtest server (standard library only, so it starts fast).
+
+    python -m backtester.client                  # run config.json on the server
+    python -m backtester.client --submit-only    # print the job id and return
+    python -m backtester.client --status <id>
+
+If no server is listening, the config is run in-process as run_backtest.py
+would (unless --no-fallback).
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_URL = os.environ.get('BACKTEST_SERVER', 'http://127.0.0.1:8765')
+
+def _path_fields(config: Dict) -> List[Tuple[Dict, str]]:
+    """(container, key) of every file path a config names"""
+    data_config = config.get('data', {})
+    fields = [(data_config, 'csv_path')] if 'csv_path' in data_config else []
+    universe = data_config.get('universe')
+    if isinstance(universe, dict):
+        fields.extend((universe, symbol) for symbol in universe)
+    backtest_config = config.get('backtest', {})
+    if backtest_config.get('journal'):
+        fields.append((backtest_config, 'journal'))
+    return fields
+
+def relative_paths(config: Dict) -> List[str]:
+    return [container[key] for container, key in _path_fields(config)
+            if not os.path.isabs(container[key])]
+
+def absolute_paths(config: Dict) -> Dict:
+    """Copy of the config with its file paths resolved against this process's working directory"""
+    config = copy.deepcopy(config)
+    for container, key in _path_fields(config):
+        container[key] = os.path.abspath(container[key])
+    return config
+
+def _request(url: str, method: str = 'GET', payload: Optional[Dict] = None,
+             timeout: float = 3600) -> Dict:
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as exc:
+        return {'status': 'error', 'code': exc.code, **json.load(exc)}
+
+def server_available(url: str = DEFAULT_URL, timeout: float = 0.5) -> bool:
+    try:
+        return _request(f'{url}/health', timeout=timeout).get('status') == 'ok'
+    except OSError:
+        return False
+
+def submit(config: Dict, url: str = DEFAULT_URL, wait: bool = True,
+           include_equity: bool = False, timeout: float = 3600) -> Dict:
+    """Send a job; with wait the response carries the results.
+
+    Relative paths in the config are made absolute first, since the server
+    runs in its own working directory.
+    """
+    return _request(f'{url}/jobs', 'POST', {
+        'config': absolute_paths(config),
+        'wait': wait,
+        'include_equity': include_equity,
+        'timeout': timeout
+    }, timeout=timeout + 5)
+
+def status(job_id: str, url: str = DEFAULT_URL) -> Dict:
+    return _request(f'{url}/jobs/{job_id}')
+
+def cancel(job_id: str, url: str = DEFAULT_URL) -> Dict:
+    return _request(f'{url}/jobs/{job_id}', 'DELETE')
+
+def run_local(config: Dict) -> Dict:
+    """One-shot in-process fallback with the same result shape as the server"""
+    from backtester.server import run_job
+    return {'status': 'done', 'local': True, 'results': run_job(config)}
+
+def _print_results(response: Dict):
+    if response.get('status') != 'done':
+        print(json.dumps(response, indent=2))
+        return
+    results = response['results']
+    tearsheet = results.get('tearsheet') or {}
+    print("\n=== BACKTEST RESULTS ===" + (" (local)" if response.get('local') else ""))
+    print(f"Signals generated: {results['signals']}")
+    print(f"Total fills: {results['fills']}")
+    print("\nPortfolio stats:", results['stats'])
+    if tearsheet:
+        print(f"Sharpe ratio: {tearsheet['sharpe_ratio']:.3f}")
+        print(f"Max drawdown: {tearsheet['max_drawdown']['max_drawdown_pct']:.2f}%")
+        print(f"Total return: {tearsheet['total_return']:.2f}%")
+    print(f"\nRun time: {results['elapsed_s'] * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--url', default=DEFAULT_URL)
+    parser.add_argument('--submit-only', action='store_true')
+    parser.add_argument('--status', metavar='JOB_ID', default=None)
+    parser.add_argument('--cancel', metavar='JOB_ID', default=None)
+    parser.add_argument('--json', action='store_true', help="print the raw JSON response")
+    parser.add_argument('--no-fallback', action='store_true', help="fail instead of running locally")
+    args = parser.parse_args()
+
+    if args.status or args.cancel:
+        response = status(args.status, args.url) if args.status else cancel(args.cancel, args.url)
+        print(json.dumps(response, indent=2))
+        sys.exit(0)
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    if server_available(args.url):
+        response = submit(config, args.url, wait=not args.submit_only)
+    elif args.no_fallback:
+        sys.exit(f"No backtest server at {args.url}")
+    else:
+        response = run_local(config)
+
+    if args.json or args.submit_only:
+        print(json.dumps(response, indent=2))
+    else:
+        _print_results(response)
+    sys.exit(0 if response.get('status') in ('done', 'queued') else 1)
@@ -1,36 +1,433 @@
 """Data handler for loading and providing market data"""
 import pandas as pd
-from typing import Dict, List, Optional
+import numpy as np
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
+from backtester.price_cache import load_prices
+from backtester.resample import TimeframePyramid, TimeframeView
+
+class Bar(Mapping):
+    """Read-only view of one bar in a data handler's column arrays.
+
+    Behaves like the old ``{'datetime', 'symbol', 'open', ...}`` dict without
+    copying any values out of the arrays. The handler provides ``columns``,
+    ``symbol`` and ``timestamp_at(index)``.
+    """
+    __slots__ = ('_handler', 'index')
+
+    def __init__(self, handler: 'DataHandler', index: int):
+        self._handler = handler
+        self.index = index
+
+    def __getitem__(self, key: str):
+        if key == 'datetime':
+            return self._handler.timestamp_at(self.index)
+        if key == 'symbol':
+            return self._handler.symbol
+        return self._handler.columns[key][self.index]
+
+    def __iter__(self):
+        yield 'datetime'
+        yield 'symbol'
+        yield from self._handler.columns
+
+    def __len__(self) -> int:
+        return len(self._handler.columns) + 2
+
+    def to_dict(self) -> Dict:
+        return dict(self.items())
 
 class DataHandler:
-    def __init__(self, csv_path: str, symbol: str):
+    def __init__(self, csv_path: str, symbol: str, use_cache: bool = True):
         self.symbol = symbol
-        self.data = self._load_data(csv_path)
-        self.current_bar = 0
-        self.bars_total = len(self.data)
+        self.use_cache = use_cache
+        self.csv_path = csv_path
+        self._attach(*self._load_data(csv_path))
         logging.info(f"Loaded {self.bars_total} bars for {symbol}")
 
-    def _load_data(self, csv_path: str) -> pd.DataFrame:
+    @classmethod
+    def from_arrays(cls, symbol: str, index: pd.DatetimeIndex,
+                    columns: Dict[str, np.ndarray]) -> 'DataHandler':
+        """Handler with its own cursor over already-loaded (read-only, shared) arrays"""
+        handler = cls.__new__(cls)
+        handler.symbol = symbol
+        handler.use_cache = True
+        handler.csv_path = None
+        handler._attach(index, columns)
+        return handler
+
+    def _attach(self, index: pd.DatetimeIndex, columns: Dict[str, np.ndarray]):
+        self.index, self.columns = index, columns
+        self.current_bar = -1  # index of the latest bar delivered by update_bars
+        self.bars_total = len(self.index)
+        self._frame = None
+        self._pyramid = None
+        self._views = {}  # timeframe: TimeframeView
+
+    @property
+    def symbols(self) -> List[str]:
+        return [self.symbol]
+
+    def timestamp_at(self, index: int) -> pd.Timestamp:
+        return self.index[index]
+
+    def _load_data(self, csv_path: str) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+        if self.use_cache:
+            # Memory-mapped binary columns, rebuilt only when the CSV changes
+            return load_prices(csv_path)
+
         df = pd.read_csv(csv_path, parse_dates=["datetime"])
         df.set_index("datetime", inplace=True)
         df.sort_index(inplace=True)
-        return df
 
-    def get_latest_bar(self, symbol: str) -> Optional[Dict]:
-        if self.current_bar >= len(self.data):
+        columns = {}
+        for name in df.columns:
+            # An owned copy, so the indicator cache can rely on it never changing
+            column = df[name].to_numpy(copy=True)
+            column.flags.writeable = False
+            columns[name] = column
+        return df.index, columns
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """DataFrame over the column arrays, built on first use for pandas-based callers"""
+        if self._frame is None:
+            self._frame = pd.DataFrame(self.columns, index=self.index)
+        return self._frame
+
+    @property
+    def continue_backtest(self) -> bool:
+        return self.current_bar + 1 < self.bars_total
+
+    def get_latest_bar(self, symbol: str) -> Optional[Bar]:
+        if self.current_bar < 0 or self.current_bar >= self.bars_total:
             return None
-        bar = self.data.iloc[self.current_bar].to_dict()
-        return bar
+        return Bar(self, self.current_bar)
 
-    def update_bars(self) -> List[Dict]:
+    def update_bars(self) -> List[Bar]:
         """Advance to next bar"""
         self.current_bar += 1
-        return [self.get_latest_bar(self.symbol)] if self.get_latest_bar(self.symbol) else []
+        bar = self.get_latest_bar(self.symbol)
+        return [bar] if bar is not None else []
+
+    @property
+    def pyramid(self) -> TimeframePyramid:
+        """Higher-timeframe aggregates, built (or loaded from disk) on first use"""
+        if self._pyramid is None:
+            self._pyramid = TimeframePyramid(self.index, self.columns, self.csv_path, self.use_cache)
+        return self._pyramid
+
+    def _timeframe_window(self, num_bars: int, timeframe: str) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+        view = self._views.get(timeframe)
+        if view is None:
+            view = self._views[timeframe] = TimeframeView(self.pyramid.level(timeframe), self.columns)
+        return view.window(min(self.current_bar, self.bars_total - 1), num_bars)
 
-    def get_bars(self, symbol: str, num_bars: int = 500) -> pd.DataFrame:
-        """Get recent N bars for strategy calculations"""
-        end_idx = min(self.current_bar + 1, len(self.data))
+    def get_window(self, symbol: str, num_bars: int = 500,
+                   timeframe: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Recent N bars as read-only column slices (views, no copy).
+
+        With a ``timeframe`` ('15min', '1h', '1D', ...) the bars are
+        aggregates, and the last one is still forming: it only covers
+        source bars up to the current one.
+        """
+        if timeframe is not None:
+            return self._timeframe_window(num_bars, timeframe)[1]
+        end_idx = min(self.current_bar + 1, self.bars_total)
+        start_idx = max(0, end_idx - num_bars)
+        return {name: column[start_idx:end_idx] for name, column in self.columns.items()}
+
+    def get_bars(self, symbol: str, num_bars: int = 500, timeframe: Optional[str] = None) -> pd.DataFrame:
+        """Get recent N bars for strategy calculations, optionally at a higher timeframe"""
+        if timeframe is not None:
+            index, columns = self._timeframe_window(num_bars, timeframe)
+            return pd.DataFrame(columns, index=index)
+        end_idx = min(self.current_bar + 1, self.bars_total)
         start_idx = max(0, end_idx - num_bars)
         return self.data.iloc[start_idx:end_idx]
+
+class RingBuffer:
+    """Fixed-capacity window over streamed columns.
+
+    Every value is written twice (at i and i + capacity), so the most
+    recent n <= capacity values are always one contiguous slice and windows
+    never need a copy.
+    """
+    def __init__(self, capacity: int, dtypes: Dict[str, np.dtype]):
+        self.capacity = capacity
+        self.columns = {name: np.zeros(2 * capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self.count = 0  # values appended so far
+
+    def append(self, values: Dict):
+        i = self.count % self.capacity
+        for name, column in self.columns.items():
+            column[i] = column[i + self.capacity] = values[name]
+        self.count += 1
+
+    @property
+    def latest(self) -> int:
+        """Storage position of the most recent value"""
+        return (self.count - 1) % self.capacity + self.capacity
+
+    def window(self, num_values: int) -> Dict[str, np.ndarray]:
+        end = self.latest + 1
+        start = end - min(num_values, self.count, self.capacity)
+        window = {}
+        for name, column in self.columns.items():
+            window[name] = column[start:end]
+            window[name].flags.writeable = False
+        return window
+
+class RingBufferBars:
+    """Bar queries over one symbol's RingBuffer of recent bars.
+
+    Subclasses fill ``_buffer`` (with an int64 'datetime' column of UTC
+    nanoseconds), ``columns``, ``tz`` and ``current_bar``.
+    """
+    def timestamp_at(self, index: int) -> pd.Timestamp:
+        stamp = pd.Timestamp(int(self._buffer.columns['datetime'][index]))
+        return stamp.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else stamp
+
+    def get_latest_bar(self, symbol: str) -> Optional[Bar]:
+        if self.current_bar < 0:
+            return None
+        return Bar(self, self._buffer.latest)
+
+    def get_window(self, symbol: str, num_bars: int = 500,
+                   timeframe: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Recent N bars (at most lookback) as read-only column slices of the ring buffer"""
+        if timeframe is not None:
+            raise ValueError("Higher timeframes need the whole series; use DataHandler")
+        if self._buffer is None:
+            return {}
+        window = self._buffer.window(num_bars)
+        window.pop('datetime')
+        return window
+
+    def get_bars(self, symbol: str, num_bars: int = 500, timeframe: Optional[str] = None) -> pd.DataFrame:
+        """Get recent N bars (at most lookback) for strategy calculations"""
+        if timeframe is not None:
+            raise ValueError("Higher timeframes need the whole series; use DataHandler")
+        if self._buffer is None:
+            return pd.DataFrame(index=pd.DatetimeIndex([], dtype='datetime64[ns]', name='datetime'))
+        window = self._buffer.window(num_bars)
+        index = pd.DatetimeIndex(window.pop('datetime').view('datetime64[ns]'), name='datetime')
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+        return pd.DataFrame(window, index=index)
+
+class StreamingDataHandler(RingBufferBars):
+    """Single-symbol handler that reads the CSV in bounded chunks.
+
+    Only the last ``lookback`` bars are retained (in a RingBuffer), so
+    memory is O(lookback + chunk_size) regardless of file size. The CSV
+    must already be sorted by datetime; the total number of bars is not
+    known up front, so ``bars_total`` is None.
+    """
+    def __init__(self, csv_path: str, symbol: str, lookback: int = 500, chunk_size: int = 100_000):
+        self.symbol = symbol
+        self.csv_path = csv_path
+        self.lookback = lookback
+        self.chunk_size = chunk_size
+        self.current_bar = -1
+        self.bars_total = None
+        self.tz = None
+
+        self._chunks = self._read_chunks()
+        self._chunk = None
+        self._chunk_pos = 0
+        self._last_stamp = None
+        self._buffer = None
+        self.columns = {}
+        self._next_chunk()
+
+    @property
+    def symbols(self) -> List[str]:
+        return [self.symbol]
+
+    def _read_chunks(self):
+        """Generator of (nanosecond timestamps, {column: values}) per CSV chunk"""
+        reader = pd.read_csv(self.csv_path, parse_dates=["datetime"], chunksize=self.chunk_size)
+        for chunk in reader:
+            stamps = pd.DatetimeIndex(chunk.pop("datetime")).as_unit('ns')
+            self.tz = stamps.tz
+            nanos = stamps.asi8
+            first = nanos[0] if len(nanos) else None
+            if len(nanos) and (np.any(np.diff(nanos) < 0)
+                               or (self._last_stamp is not None and first < self._last_stamp)):
+                raise ValueError(f"{self.csv_path} must be sorted by datetime for streaming")
+            if len(nanos):
+                self._last_stamp = nanos[-1]
+            yield nanos, {name: chunk[name].to_numpy() for name in chunk.columns}
+
+    def _next_chunk(self) -> bool:
+        for nanos, columns in self._chunks:
+            if not len(nanos):
+                continue
+            if self._buffer is None:
+                dtypes = {name: values.dtype for name, values in columns.items()}
+                self._buffer = RingBuffer(self.lookback, {'datetime': np.dtype('int64'), **dtypes})
+                self.columns = {name: self._buffer.columns[name] for name in dtypes}
+            self._chunk = {'datetime': nanos, **columns}
+            self._chunk_pos = 0
+            return True
+        self._chunk = None
+        return False
+
+    @property
+    def continue_backtest(self) -> bool:
+        if self._chunk is not None and self._chunk_pos < len(self._chunk['datetime']):
+            return True
+        return self._next_chunk()
+
+    def update_bars(self) -> List[Bar]:
+        """Advance to next bar"""
+        if not self.continue_backtest:
+            return []
+        pos = self._chunk_pos
+        self._buffer.append({name: values[pos] for name, values in self._chunk.items()})
+        self._chunk_pos += 1
+        self.current_bar += 1
+        return [self.get_latest_bar(self.symbol)]
+
+class UniverseDataHandler:
+    """Many symbols merged into one timestamp-ordered bar stream.
+
+    Each symbol keeps its own DataHandler (and memory-mapped columns); the
+    merge is a pre-aligned index over all timestamps built once with a
+    stable argsort. A symbol with no bar at a timestamp simply emits
+    nothing there, so sparse histories are never forward-filled and
+    get_bars(symbol) only ever sees that symbol's real bars.
+    """
+    def __init__(self, csv_paths: Dict[str, str], use_cache: bool = True):
+        self.handlers = {
+            symbol: DataHandler(csv_path, symbol, use_cache)
+            for symbol, csv_path in csv_paths.items()
+        }
+        self.symbols = list(self.handlers)
+        self._handler_list = list(self.handlers.values())
+        self.current_bar = -1  # index of the latest timestamp delivered by update_bars
+        self._build_stream()
+        logging.info(f"Merged {len(self._stream_symbols)} bars for {len(self.symbols)} symbols "
+                     f"into {self.bars_total} timestamps")
+
+    def _build_stream(self):
+        stamps = [handler.index.as_unit('ns').asi8 for handler in self._handler_list]
+        symbol_ids = np.repeat(np.arange(len(stamps), dtype=np.int32), [len(s) for s in stamps])
+        all_stamps = np.concatenate(stamps) if stamps else np.empty(0, dtype=np.int64)
+
+        # Stable sort keeps each symbol's rows in order, so emitting a symbol
+        # always means advancing its handler by exactly one bar
+        order = np.argsort(all_stamps, kind='stable')
+        self._stream_symbols = symbol_ids[order]
+        timestamps, offsets = np.unique(all_stamps[order], return_index=True)
+        self.timestamps = pd.DatetimeIndex(timestamps.view('datetime64[ns]'), name='datetime')
+        if self._handler_list and self._handler_list[0].index.tz is not None:
+            self.timestamps = self.timestamps.tz_localize('UTC').tz_convert(self._handler_list[0].index.tz)
+        self._offsets = np.append(offsets, len(order))
+        self.bars_total = len(timestamps)
+
+    @property
+    def continue_backtest(self) -> bool:
+        return self.current_bar + 1 < self.bars_total
+
+    @property
+    def current_datetime(self) -> Optional[pd.Timestamp]:
+        if self.current_bar < 0 or self.current_bar >= self.bars_total:
+            return None
+        return self.timestamps[self.current_bar]
+
+    def update_bars(self) -> List[Bar]:
+        """Advance to the next timestamp and return every symbol's bar at it"""
+        self.current_bar += 1
+        if self.current_bar >= self.bars_total:
+            return []
+        start, end = self._offsets[self.current_bar], self._offsets[self.current_bar + 1]
+        bars = []
+        for symbol_id in self._stream_symbols[start:end]:
+            bars.extend(self._handler_list[symbol_id].update_bars())
+        return bars
+
+    def get_latest_bar(self, symbol: str) -> Optional[Bar]:
+        return self.handlers[symbol].get_latest_bar(symbol)
+
+    def get_window(self, symbol: str, num_bars: int = 500,
+                   timeframe: Optional[str] = None) -> Dict[str, np.ndarray]:
+        return self.handlers[symbol].get_window(symbol, num_bars, timeframe)
+
+    def get_bars(self, symbol: str, num_bars: int = 500, timeframe: Optional[str] = None) -> pd.DataFrame:
+        return self.handlers[symbol].get_bars(symbol, num_bars, timeframe)
+
+class PushedBars(RingBufferBars):
+    """One symbol's bars as they are pushed, the last ``lookback`` kept"""
+    def __init__(self, symbol: str, lookback: int = 500):
+        self.symbol = symbol
+        self.lookback = lookback
+        self.current_bar = -1
+        self.tz = None
+        self._buffer = None
+        self.columns = {}
+
+    def append(self, bar: Mapping) -> Optional[Bar]:
+        """Store a bar; one not newer than the last stored bar is ignored (None)"""
+        stamp = pd.Timestamp(bar['datetime'])
+        if self._buffer is None:
+            dtypes = {name: np.asarray(bar[name]).dtype for name in bar if name not in ('datetime', 'symbol')}
+            self._buffer = RingBuffer(self.lookback, {'datetime': np.dtype('int64'), **dtypes})
+            self.columns = {name: self._buffer.columns[name] for name in dtypes}
+            self.tz = stamp.tz
+        elif stamp.value <= self._buffer.columns['datetime'][self._buffer.latest]:
+            return None
+        self._buffer.append({'datetime': stamp.value, **{name: bar[name] for name in self.columns}})
+        self.current_bar += 1
+        return self.get_latest_bar(self.symbol)
+
+class LiveDataHandler:
+    """Bars pushed one at a time by a live or replayed feed (see backtester.paper).
+
+    ``push`` queues a bar and ``update_bars`` delivers what was pushed, so
+    the engine advances exactly as it does over a file. Each symbol keeps
+    its last ``lookback`` bars in a RingBuffer. Bars for other symbols, and
+    bars not newer than their symbol's last one, are counted in ``skipped``
+    and dropped. The feed has no known end, so ``bars_total`` is None.
+    """
+    def __init__(self, symbols: List[str], lookback: int = 500):
+        self.handlers = {symbol: PushedBars(symbol, lookback) for symbol in symbols}
+        self.symbols = list(self.handlers)
+        self.current_bar = -1  # bars delivered so far, minus one
+        self.bars_total = None
+        self.skipped = 0
+        self._pending = []
+
+    @property
+    def continue_backtest(self) -> bool:
+        return bool(self._pending)
+
+    def push(self, bar: Mapping):
+        self._pending.append(bar)
+
+    def update_bars(self) -> List[Bar]:
+        """Deliver the bars pushed since the last call"""
+        bars = []
+        for bar in self._pending:
+            handler = self.handlers.get(bar['symbol'])
+            stored = handler.append(bar) if handler is not None else None
+            if stored is None:
+                self.skipped += 1
+            else:
+                bars.append(stored)
+        self._pending = []
+        self.current_bar += len(bars)
+        return bars
+
+    def get_latest_bar(self, symbol: str) -> Optional[Bar]:
+        return self.handlers[symbol].get_latest_bar(symbol)
+
+    def get_window(self, symbol: str, num_bars: int = 500,
+                   timeframe: Optional[str] = None) -> Dict[str, np.ndarray]:
+        return self.handlers[symbol].get_window(symbol, num_bars, timeframe)
+
+    def get_bars(self, symbol: str, num_bars: int = 500, timeframe: Optional[str] = None) -> pd.DataFrame:
+        return self.handlers[symbol].get_bars(symbol, num_bars, timeframe)
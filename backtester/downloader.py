@@ -0,0 +1,284 @@
+"""Concurrent, incremental market-data downloads into a local per-symbol store.
+
+    python -m backtester.downloader RELIANCE.NS TCS.NS --start 2024-01-01 --end 2024-06-30
+    python -m backtester.downloader RELIANCE.NS --provider synthetic --interval 5min   # offline
+
+Each symbol lives in ``<store>/<symbol>.csv`` with its binary cache written
+alongside in the ``.price_cache`` layout, so a backtest can use the file as
+``csv_path`` (or in a ``universe``) and load it without parsing. A sidecar
+``<symbol>.coverage.json`` remembers which date range was already
+requested. Later runs only fetch what is missing, plus the last stored
+bar, which may have been incomplete. New bars are validated and
+deduplicated, then merged into the store. Prices are stored exactly as
+the provider sent them.
+"""
+import argparse
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from backtester.price_cache import file_fingerprint, load_prices, write_cache
+
+COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+class DataProvider(ABC):
+    """Source of OHLCV bars for one symbol at a time"""
+    @abstractmethod
+    def fetch(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Bars with start <= datetime < end: a DatetimeIndex and COLUMNS"""
+
+class YahooProvider(DataProvider):
+    """Yahoo Finance through yfinance (imported on first use)"""
+    def __init__(self, interval: str = '1d'):
+        self.interval = interval
+
+    def fetch(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        import yfinance as yf
+        data = yf.download(symbol, start=start, end=end, interval=self.interval,
+                           progress=False, auto_adjust=False, threads=False)
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        data = data.rename(columns=str.lower)
+        data.index.name = 'datetime'
+        return data[COLUMNS] if len(data) else pd.DataFrame(columns=COLUMNS)
+
+class CSVProvider(DataProvider):
+    """Local stand-in serving ``<directory>/<symbol>.csv`` (e.g. files from another machine)"""
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def fetch(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        data = pd.read_csv(os.path.join(self.directory, f'{symbol}.csv'), parse_dates=['datetime'])
+        data = data.set_index('datetime')
+        start, end = _bounds_for(pd.DatetimeIndex(data.index), start, end)
+        return data.loc[(data.index >= start) & (data.index < end), COLUMNS]
+
+class SyntheticProvider(DataProvider):
+    """Offline stand-in with deterministic bars on a fixed grid.
+
+    Every bar is a function of (symbol, timestamp) only, so overlapping
+    requests return identical bars, like a real source.
+    """
+    def __init__(self, interval: str = '5min'):
+        self.step = pd.Timedelta(interval)
+
+    @staticmethod
+    def _noise(keys: np.ndarray) -> np.ndarray:
+        """splitmix64 of the keys, mapped to [-0.5, 0.5)"""
+        x = keys.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+        return (x >> np.uint64(11)).astype(np.float64) / 2.0 ** 53 - 0.5
+
+    def fetch(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        index = pd.date_range(start.ceil(self.step), end, freq=self.step,
+                              inclusive='left', name='datetime').as_unit('ns')
+        steps = index.asi8 // self.step.value
+        seed = int.from_bytes(symbol.encode()[:8].ljust(8, b'\0'), 'little') & 0x7FFFFFFF
+        keys = steps * 4 + (seed << 32)
+        close = 100 * (1 + 0.1 * np.sin(steps / 500 + seed % 7)) * (1 + 0.002 * self._noise(keys))
+        open_ = close * (1 + 0.002 * self._noise(keys + 1))
+        spread = 1 + 0.001 * np.abs(self._noise(keys + 2))
+        return pd.DataFrame({
+            'open': open_,
+            'high': np.maximum(open_, close) * spread,
+            'low': np.minimum(open_, close) / spread,
+            'close': close,
+            'volume': (10_000 * (1.5 + self._noise(keys + 3))).astype(np.int64)
+        }, index=index)
+
+def _utc_naive(timestamp) -> pd.Timestamp:
+    """Coverage bounds are compared as naive UTC timestamps"""
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_convert('UTC').tz_localize(None) if timestamp.tz is not None else timestamp
+
+def _bounds_for(index: pd.DatetimeIndex, start: pd.Timestamp, end: pd.Timestamp):
+    """Naive UTC bounds in the timezone of an index, for filtering it"""
+    if index.tz is None:
+        return start, end
+    return start.tz_localize('UTC').tz_convert(index.tz), end.tz_localize('UTC').tz_convert(index.tz)
+
+PROVIDERS = {
+    'yahoo': YahooProvider,
+    'csv': CSVProvider,
+    'synthetic': SyntheticProvider
+}
+
+def validate_bars(bars: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+    """Sorted, deduplicated bars with consistent OHLC; returns (bars, rows dropped).
+
+    Invalid rows are dropped, never repaired: kept prices are unchanged.
+    """
+    rows = len(bars)
+    bars = bars[COLUMNS].copy()
+    bars.index = pd.DatetimeIndex(bars.index, name='datetime')
+    prices = bars[['open', 'high', 'low', 'close']].astype(float)
+    valid = (
+        prices.notna().all(axis=1).to_numpy()
+        & bars['volume'].notna().to_numpy()
+        & (prices > 0).all(axis=1).to_numpy()
+        & (prices['high'] >= prices[['open', 'close', 'low']].max(axis=1)).to_numpy()
+        & (prices['low'] <= prices[['open', 'close']].min(axis=1)).to_numpy()
+        & (bars['volume'].fillna(-1) >= 0).to_numpy()
+        & bars.index.notna()
+    )
+    bars = bars[valid]
+    # A re-sent bar replaces the earlier copy
+    bars = bars[~bars.index.duplicated(keep='last')].sort_index()
+    bars[['open', 'high', 'low', 'close']] = bars[['open', 'high', 'low', 'close']].astype(np.float64)
+    bars['volume'] = bars['volume'].astype(np.int64)
+    return bars, rows - len(bars)
+
+def missing_ranges(coverage: Optional[Dict], last_bar: Optional[pd.Timestamp],
+                   start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """[start, end) ranges not requested before; the tail re-fetches the last stored bar.
+
+    Coverage is one interval, so a request that lies wholly before or after
+    it also fetches the gap in between; the merged coverage then has no
+    holes.
+    """
+    if coverage is None:
+        return [(start, end)]
+    ranges = []
+    covered_start, covered_end = pd.Timestamp(coverage['start']), pd.Timestamp(coverage['end'])
+    if start < covered_start:
+        ranges.append((start, covered_start))
+    if end > covered_end:
+        tail_start = min(covered_end, last_bar) if last_bar is not None else covered_end
+        ranges.append((tail_start, end))
+    return ranges
+
+class SymbolStore:
+    """Directory of one CSV plus binary cache and coverage sidecar per symbol"""
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def csv_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.replace(os.sep, '_')}.csv")
+
+    def _coverage_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.replace(os.sep, '_')}.coverage.json")
+
+    def coverage(self, symbol: str) -> Optional[Dict]:
+        try:
+            with open(self._coverage_path(symbol), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Stored bars (from the binary cache), or None for a new symbol"""
+        csv_path = self.csv_path(symbol)
+        if not os.path.exists(csv_path):
+            return None
+        index, columns = load_prices(csv_path)
+        return pd.DataFrame({name: np.asarray(column) for name, column in columns.items()}, index=index)
+
+    def merge(self, symbol: str, bars: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> Dict:
+        """Merge validated bars into the store and extend the covered range to [start, end)"""
+        csv_path = self.csv_path(symbol)
+        stored = self.load(symbol)
+        if stored is not None and len(bars) and stored.index.tz != bars.index.tz:
+            bars = bars.tz_convert(stored.index.tz) if bars.index.tz is not None else bars.tz_localize(stored.index.tz)
+
+        if stored is None or not len(stored):
+            merged, appended = bars, stored is None
+        else:
+            merged = pd.concat([stored, bars])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+            # Pure appends extend the CSV; anything touching stored rows rewrites it
+            head = merged.iloc[:len(stored)]
+            appended = head.index.equals(stored.index) and np.array_equal(
+                head[COLUMNS].to_numpy(), stored[COLUMNS].to_numpy())
+
+        added = len(merged) - (len(stored) if stored is not None else 0)
+        if stored is None or not appended:
+            tmp_path = csv_path + '.tmp'
+            merged.to_csv(tmp_path, index_label='datetime')
+            os.replace(tmp_path, csv_path)
+        elif added:
+            merged.iloc[len(stored):].to_csv(csv_path, mode='a', header=False, index_label='datetime')
+        if stored is None or not appended or added:
+            # The cache comes from the merged arrays, the CSV is never parsed back. It holds
+            # the provider's exact floats, which a CSV parse may differ from in the last digit
+            write_cache(csv_path, merged.index, {name: merged[name].to_numpy() for name in COLUMNS},
+                        source=file_fingerprint(csv_path))
+
+        coverage = self.coverage(symbol)
+        if coverage is not None:
+            start = min(start, pd.Timestamp(coverage['start']))
+            end = max(end, pd.Timestamp(coverage['end']))
+        tmp_path = self._coverage_path(symbol) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'start': start.isoformat(), 'end': end.isoformat()}, f)
+        os.replace(tmp_path, self._coverage_path(symbol))
+        return {'rows': len(merged), 'added': added, 'rewritten': stored is not None and not appended}
+
+def update_symbol(store: SymbolStore, provider: DataProvider, symbol: str,
+                  start: pd.Timestamp, end: pd.Timestamp) -> Dict:
+    """Fetch and merge whatever part of [start, end) the store is missing for one symbol"""
+    stored = store.load(symbol)
+    last_bar = _utc_naive(stored.index[-1]) if stored is not None and len(stored) else None
+    ranges = missing_ranges(store.coverage(symbol), last_bar, start, end)
+    summary = {'symbol': symbol, 'requests': len(ranges), 'fetched': 0, 'dropped': 0,
+               'added': 0, 'rows': len(stored) if stored is not None else 0}
+    if not ranges:
+        return summary
+
+    fetched = [provider.fetch(symbol, range_start, range_end) for range_start, range_end in ranges]
+    bars, dropped = validate_bars(pd.concat(fetched) if fetched else pd.DataFrame(columns=COLUMNS))
+    summary.update(fetched=sum(map(len, fetched)), dropped=dropped)
+    if dropped:
+        logging.warning(f"{symbol}: dropped {dropped} invalid or duplicate bars")
+    summary.update(store.merge(symbol, bars, start, end))
+    return summary
+
+def download(symbols: List[str], provider: DataProvider, store: SymbolStore, start, end,
+             workers: int = 8) -> List[Dict]:
+    """Update every symbol on a bounded thread pool; failures are reported per symbol"""
+    start, end = _utc_naive(start), _utc_naive(end)
+
+    def run(symbol: str) -> Dict:
+        try:
+            return update_symbol(store, provider, symbol, start, end)
+        except Exception as exc:
+            logging.exception(f"{symbol}: download failed")
+            return {'symbol': symbol, 'error': f"{type(exc).__name__}: {exc}"}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(symbols))),
+                            thread_name_prefix='download') as pool:
+        return list(pool.map(run, symbols))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('symbols', nargs='+')
+    parser.add_argument('--start', required=True)
+    parser.add_argument('--end', default=None, help="exclusive; defaults to now")
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--provider', choices=sorted(PROVIDERS), default='yahoo')
+    parser.add_argument('--source-dir', default=None, help="directory of <symbol>.csv for --provider csv")
+    parser.add_argument('--store', default='data/store')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.provider == 'csv':
+        if not args.source_dir:
+            parser.error("--provider csv needs --source-dir")
+        provider = CSVProvider(args.source_dir)
+    else:
+        provider = PROVIDERS[args.provider](args.interval)
+    store = SymbolStore(args.store)
+    for result in download(args.symbols, provider, store, args.start,
+                           args.end or pd.Timestamp.now().floor('min'), args.workers):
+        if 'error' in result:
+            print(f"{result['symbol']}: {result['error']}")
+        else:
+            print(f"{result['symbol']}: +{result['added']} bars ({result['rows']} stored, "
+                  f"{result['requests']} requests, {result['dropped']} dropped) -> {store.csv_path(result['symbol'])}")
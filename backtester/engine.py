@@ -1,100 +1,424 @@
 """Main event-driven backtesting engine"""
-import queue
+import copy
 import logging
+from collections import deque
 from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import numpy as np
 from backtester.events import *
-from backtester.data_handler import DataHandler
+from backtester.data_handler import DataHandler, StreamingDataHandler, UniverseDataHandler
 from backtester.portfolio import Portfolio
 from backtester.execution import ExecutionHandler
-from strategies.ma import MACrossoverStrategy
+from backtester.journal import TradeJournal
+from backtester.order_book import GOOD_TILL_CANCELLED, OrderBook
+from backtester.performance import OnlineMetrics
+from backtester.profiling import StageProfiler
+from backtester.result_cache import backtest_key, default_cache
+from strategies.factory import build_strategy
+
+def strategy_names(backtest_config: Dict) -> List[str]:
+    """config['strategies'] sections a run trades (backtest.strategies, default just 'ma')"""
+    return list(backtest_config.get('strategies') or ['ma'])
+
+def allocate_capital(backtest_config: Dict, names: List[str]) -> Dict[str, float]:
+    """Starting capital of each strategy's sub-portfolio.
+
+    ``allocation: 'split'`` (default) divides initial_capital by
+    ``weights`` (equal when not given); ``'independent'`` gives every
+    strategy the full initial_capital, as if it ran alone.
+    """
+    capital = backtest_config['initial_capital']
+    allocation = backtest_config.get('allocation', 'split')
+    if allocation == 'independent' or len(names) == 1:
+        return {name: capital for name in names}
+    if allocation != 'split':
+        raise ValueError(f"Unknown allocation '{allocation}' (expected 'split' or 'independent')")
+    weights = backtest_config.get('weights') or {name: 1.0 for name in names}
+    total = sum(weights.get(name, 0.0) for name in names)
+    return {name: capital * weights.get(name, 0.0) / total for name in names}
+
+def combine_stats(stats: List[Dict]) -> Dict:
+    """Portfolio stats of several sub-portfolios added up"""
+    return {key: sum(s[key] for s in stats) for key in stats[0]}
 
 class Backtester:
-    def __init__(self, config):
+    def __init__(self, config, data_handler=None):
         self.config = config
-        self.data_handler = None
-        self.strategy = None
+        # A preloaded handler (e.g. DataHandler.from_arrays) skips loading from data config
+        self.data_handler = data_handler
+        self.strategies = {}  # symbol: strategy instance (single-strategy runs)
+        self.strategy_names = strategy_names(config['backtest'])
+        self.multi = len(self.strategy_names) > 1
+        # Multi-strategy runs: symbol: [(name, strategy)] and one sub-portfolio per strategy
+        self.strategy_slots = {}
+        self.portfolios = {}  # name: Portfolio
         self.portfolio = None
+        self.combined_metrics = None
+        # Order types from backtest.orders; market orders fill at the signal bar's close
+        self.orders = config['backtest'].get('orders') or {'type': 'market'}
+        self.order_type = str(self.orders.get('type', 'market')).upper()
+        self.order_book = None
         self.execution_handler = None
-        self.events_queue = queue.Queue()
-        self.signals = []
-        self.fills = []
+        # Single-threaded event loop: a plain deque and a type-keyed handler table
+        self.events_queue = deque()
+        self._handlers = {
+            MarketEvent: self._on_market,
+            SignalEvent: self._on_signal,
+            OrderEvent: self._on_order,
+            FillEvent: self._on_fill
+        }
+        # Streaming indicators via Strategy.on_bar instead of re-slicing get_bars every bar
+        self.incremental = config['backtest'].get('incremental_indicators', True)
+        # Opt-in stage timers; when off the hot path is not touched at all
+        self.profiler = StageProfiler() if config['backtest'].get('profile', False) else None
+        # Repeated runs of the same config, code and data are served from the result cache
+        # Every signal and fill goes to the journal, if configured; memory keeps only the latest few
+        self.journal = None
+        retain = config['backtest'].get('retain_events', 1000)
+        self.signals = deque(maxlen=retain)
+        self.fills = deque(maxlen=retain)
+        self.signal_count = 0
+        self.fill_count = 0
+        use_result_cache = (config['backtest'].get('result_cache', True) and not self.profiler
+                            and not config['backtest'].get('journal'))
+        self.result_cache = default_cache() if use_result_cache else None
+        self.cached = False  # results came from the result cache; see run_backtest
 
     def _initialize_components(self):
         data_config = self.config['data']
         backtest_config = self.config['backtest']
         
-        self.data_handler = DataHandler(
-            data_config['csv_path'],
-            data_config['symbol']
-        )
+        symbols = list(data_config['universe']) if 'universe' in data_config else [data_config['symbol']]
+        names = self.strategy_names
+        self.strategy_slots = {
+            symbol: [(name, build_strategy(name, self.config['strategies'][name], symbol)) for name in names]
+            for symbol in symbols
+        }
+        if self.multi:
+            self._handlers[MarketEvent] = self._on_market_multi
+        else:
+            self.strategies = {symbol: slots[0][1] for symbol, slots in self.strategy_slots.items()}
         
-        self.strategy = MACrossoverStrategy(
-            self.config['strategies']['ma']['short_window'],
-            self.config['strategies']['ma']['long_window'],
-            data_config['symbol']
-        )
+        if self.data_handler is None:
+            self.data_handler = self._build_data_handler(data_config)
         
-        self.portfolio = Portfolio(
-            backtest_config['initial_capital'],
-            backtest_config['slippage_bps'],
-            backtest_config['commission_per_trade']
-        )
+        self.portfolios = {
+            name: Portfolio(
+                capital,
+                backtest_config['slippage_bps'],
+                backtest_config['commission_per_trade'],
+                backtest_config.get('record_history', True)
+            )
+            for name, capital in allocate_capital(backtest_config, names).items()
+        }
+        if self.multi:
+            self.combined_metrics = OnlineMetrics()
+            self._combined_pending = False
+        else:
+            self.portfolio = self.portfolios[names[0]]
         
         self.execution_handler = ExecutionHandler(
             backtest_config['slippage_bps'],
-            backtest_config['commission_per_trade']
+            backtest_config['commission_per_trade'],
+            backtest_config.get('log_fills', False)
         )
+        self.order_book = OrderBook(self.execution_handler)
+        
+        if backtest_config.get('journal'):
+            self.journal = TradeJournal(
+                backtest_config['journal'],
+                backtest_config.get('journal_buffer_size', 4096)
+            )
 
-    def run_backtest(self):
-        logging.basicConfig(level=logging.INFO)
-        self._initialize_components()
+    def _build_data_handler(self, data_config):
+        if 'universe' in data_config:
+            # {symbol: csv_path}, merged into one time-ordered stream
+            return UniverseDataHandler(
+                data_config['universe'],
+                data_config.get('use_cache', True)
+            )
+        if data_config.get('streaming', False):
+            # Bounded-memory chunked reads; keep only what the strategies look back over
+            return StreamingDataHandler(
+                data_config['csv_path'],
+                data_config['symbol'],
+                data_config.get('lookback') or max(strategy.lookback for slots in self.strategy_slots.values()
+                                                   for _, strategy in slots),
+                data_config.get('chunk_size', 100_000)
+            )
+        return DataHandler(
+            data_config['csv_path'],
+            data_config['symbol'],
+            data_config.get('use_cache', True)
+        )
+
+    def _instrument(self):
+        profiler = self.profiler
+        profiler.instrument(self.data_handler, 'update_bars', 'data_advance')
+        for slots in self.strategy_slots.values():
+            for _, strategy in slots:
+                profiler.instrument(strategy, 'on_bar', 'strategy')
+                profiler.instrument(strategy, 'generate_signals', 'strategy')
+        self._handlers[SignalEvent] = profiler.wrap('order_sizing', self._on_signal)
+        profiler.instrument(self.execution_handler, 'execute_order', 'execution')
+        profiler.instrument(self.order_book, 'match', 'execution')
+        for portfolio in self.portfolios.values():
+            profiler.instrument(portfolio, 'update_timeindex', 'portfolio_update')
+            profiler.instrument(portfolio, 'execute_fill', 'portfolio_update')
+
+    def _on_market(self, event: MarketEvent):
+        self.portfolio.update_timeindex(event.data)
         
-        while self.data_handler.current_bar < self.data_handler.bars_total:
-            # Update market data
-            market_events = self.data_handler.update_bars()
-            for market_event_data in market_events:
-                self.events_queue.put(MarketEvent(market_event_data))
-            
-            # Handle events
-            while not self.events_queue.empty():
-                event = self.events_queue.get()
-                
-                if isinstance(event, MarketEvent):
-                    self.portfolio.update_timeindex(event.data)
-                    
-                    bars = self.data_handler.get_bars(self.data_handler.symbol)
-                    signals = self.strategy.generate_signals(bars, self.signals, {
-                        'current_positions': self.portfolio.current_positions
-                    })
-                    
-                    for signal in signals:
-                        signal_event = SignalEvent(**signal)
-                        self.events_queue.put(signal_event)
-                        self.signals.append(signal)
-                
-                elif isinstance(event, SignalEvent):
-                    quantity = int(self.portfolio.current_capital * 0.1 / 100)
-                    order = OrderEvent(
-                        event.symbol,
-                        event.datetime,
-                        'MARKET',
-                        quantity,
-                        event.signal_type
-                    )
-                    self.events_queue.put(order)
-                
-                elif isinstance(event, OrderEvent):
-                    market_price = event.data['close'] if 'data' in event.__dict__ else 100.0
-                    fill = self.execution_handler.execute_order(vars(event), market_price)
-                    fill_event = FillEvent(**fill)
-                    self.events_queue.put(fill_event)
-                    self.fills.append(fill)
-                    self.portfolio.execute_fill(fill)
-            
-            self.data_handler.current_bar += 1
+        symbol = event.data['symbol']
+        strategy = self.strategies[symbol]
+        portfolio_state = {'current_positions': self.portfolio.current_positions}
+        if self.incremental:
+            signals = strategy.on_bar(event.data, portfolio_state)
+        else:
+            bars = self.data_handler.get_bars(symbol)
+            signals = strategy.generate_signals(bars, self.signals, portfolio_state)
         
+        if signals:
+            self._emit(signals)
+
+    def _on_market_multi(self, event: MarketEvent):
+        """Fan one bar out to every strategy, each trading its own sub-portfolio"""
+        bar = event.data
+        symbol = bar['symbol']
+        portfolios = self.portfolios
+        for portfolio in portfolios.values():
+            portfolio.update_timeindex(bar)
+        if bar['datetime'] != self._combined_datetime:
+            # Every sub-portfolio has just recorded the previous timestamp
+            if self._combined_pending:
+                self._record_combined()
+            self._combined_datetime = bar['datetime']
+            self._combined_pending = True
+
+        bars = None if self.incremental else self.data_handler.get_bars(symbol)
+        for name, strategy in self.strategy_slots[symbol]:
+            portfolio_state = {'current_positions': portfolios[name].current_positions}
+            if self.incremental:
+                signals = strategy.on_bar(bar, portfolio_state)
+            else:
+                signals = strategy.generate_signals(bars, self.signals, portfolio_state)
+            if signals:
+                for signal in signals:
+                    signal.strategy = name
+                self.strategy_signal_counts[name] += len(signals)
+                self._emit(signals)
+
+    def _record_combined(self):
+        self.combined_metrics.update(sum(p.metrics.last_equity for p in self.portfolios.values()))
+        self._combined_pending = False
+
+    def _emit(self, signals: list):
+        self.events_queue.extend(signals)
+        self.signals.extend(signals)
+        self.signal_count += len(signals)
+        if self.journal is not None:
+            self.journal.record_signals(signals)
+
+    def _on_signal(self, event: SignalEvent):
+        portfolio = self.portfolio if event.strategy is None else self.portfolios[event.strategy]
+        quantity = int(portfolio.current_capital * 0.1 / 100)
+        order = OrderEvent(
+            event.symbol,
+            event.datetime,
+            'MARKET',
+            quantity,
+            'BUY' if event.signal_type == 'LONG' else 'SELL',
+            strategy=event.strategy
+        )
+        if self.order_type != 'MARKET' or self._bracket:
+            self._price_order(order, portfolio)
+        self.events_queue.append(order)
+
+    @property
+    def _bracket(self) -> bool:
+        return (self.orders.get('take_profit_bps') is not None
+                or self.orders.get('stop_loss_bps') is not None)
+
+    def _price_order(self, order: OrderEvent, portfolio: Portfolio):
+        """Apply backtest.orders: entry type and price, and bracket exits for new positions.
+
+        A new signal replaces whatever its strategy still has resting for the
+        symbol (an unfilled entry or the exits of the position it changes).
+        """
+        spec = self.orders
+        self.order_book.cancel(order.symbol, order.strategy)
+        close = self.data_handler.get_latest_bar(order.symbol)['close']
+        sign = 1 if order.direction == 'BUY' else -1
+        offset = spec.get('offset_bps', 10.0) / 10000
+        order.order_type = self.order_type
+        if order.order_type == 'LIMIT':
+            order.price = close * (1 - sign * offset)  # below the close to buy, above to sell
+        elif order.order_type == 'STOP':
+            order.price = close * (1 + sign * offset)  # breakout entry
+        elif order.order_type != 'MARKET':
+            raise ValueError(f"Unknown order type '{spec.get('type')}' (expected market, limit or stop)")
+
+        if portfolio.current_positions.get(order.symbol, 0) == 0:
+            reference = close if order.price is None else order.price
+            if spec.get('take_profit_bps') is not None:
+                order.take_profit = reference * (1 + sign * spec['take_profit_bps'] / 10000)
+            if spec.get('stop_loss_bps') is not None:
+                order.stop_loss = reference * (1 - sign * spec['stop_loss_bps'] / 10000)
+
+    def _on_order(self, event: OrderEvent):
+        if event.order_type != 'MARKET':
+            self.order_book.add(event, self.orders.get('expire_bars', 1) or GOOD_TILL_CANCELLED)
+            return
+        # Market orders fill against the close of the bar that triggered them
+        market_price = self.data_handler.get_latest_bar(event.symbol)['close']
+        self.events_queue.append(self.execution_handler.execute_order(event, market_price))
+        if event.take_profit is not None or event.stop_loss is not None:
+            self.order_book.add_exits(event)
+
+    def _match_resting(self, bars: list):
+        """Fill resting orders against this step's bars before strategies see them"""
+        for portfolio in self.portfolios.values():
+            for bar in bars:
+                portfolio.update_timeindex(bar)
+        for fill in self.order_book.match(bars):
+            self._on_fill(fill)
+
+    def _on_fill(self, event: FillEvent):
+        self.fills.append(event)
+        self.fill_count += 1
+        if self.journal is not None:
+            self.journal.record_fill(event)
+        if event.strategy is None:
+            self.portfolio.execute_fill(event)
+        else:
+            self.strategy_fill_counts[event.strategy] += 1
+            self.portfolios[event.strategy].execute_fill(event)
+
+    def progress(self, steps: int) -> Dict:
+        """Snapshot for progress callbacks; the equity curve lags the current bar by one"""
+        if self.multi:
+            curves = [portfolio.history.column('equity') for portfolio in self.portfolios.values()]
+            equity_curve = np.sum([curve[:min(map(len, curves))] for curve in curves], axis=0)
+            stats = combine_stats([portfolio.stats for portfolio in self.portfolios.values()])
+        else:
+            equity_curve, stats = self.portfolio.history.column('equity'), self.portfolio.stats
+        return {
+            'steps': steps,
+            'bars_total': getattr(self.data_handler, 'bars_total', None),
+            'equity_curve': equity_curve,
+            'stats': stats
+        }
+
+    def _multi_results(self) -> Dict:
+        """Per-strategy results plus their sum as the combined portfolio"""
+        per_strategy = {}
+        for name, portfolio in self.portfolios.items():
+            per_strategy[name] = {
+                'initial_capital': portfolio.initial_capital,
+                'signals': self.strategy_signal_counts[name],
+                'fills': self.strategy_fill_counts[name],
+                'stats': portfolio.stats,
+                'equity_curve': portfolio.equity_curve,
+                'metrics': portfolio.metrics.tearsheet(portfolio.stats)
+            }
+        if self._combined_pending:
+            self._record_combined()
+        # Trade tallies live in the sub-portfolios; sum them into a copy so results can be taken again
+        combined = copy.copy(self.combined_metrics)
+        for portfolio in self.portfolios.values():
+            combined.wins += portfolio.metrics.wins
+            combined.losses += portfolio.metrics.losses
+            combined.gross_wins += portfolio.metrics.gross_wins
+            combined.gross_losses += portfolio.metrics.gross_losses
+        stats = combine_stats([result['stats'] for result in per_strategy.values()])
+        curves = [result['equity_curve'] for result in per_strategy.values()]
         return {
-            'signals': len(self.signals),
-            'fills': len(self.fills),
-            'stats': self.portfolio.stats
+            'signals': self.signal_count,
+            'fills': self.fill_count,
+            'stats': stats,
+            'equity_curve': np.sum(curves, axis=0) if all(len(c) for c in curves) else curves[0][:0],
+            'metrics': combined.tearsheet(stats),
+            'strategies': per_strategy
         }
+
+    def _start(self):
+        """Build the components and reset the per-run counters"""
+        self._initialize_components()
+        self.strategy_signal_counts = dict.fromkeys(self.strategy_names, 0)
+        self.strategy_fill_counts = dict.fromkeys(self.strategy_names, 0)
+        self._combined_datetime = None
+        if self.profiler:
+            self._instrument()
+            self.profiler.start()
+
+    def _step(self, bars: list):
+        """One time step: fill resting orders, then handle every event the bars cause"""
+        if self.order_book.live:
+            self._match_resting(bars)
+        events = self.events_queue
+        handlers = self._handlers
+        for bar in bars:
+            events.append(MarketEvent(bar))
+        while events:
+            event = events.popleft()
+            handlers[event.__class__](event)
+
+    def _results(self) -> Dict:
+        if self.multi:
+            results = self._multi_results()
+        else:
+            self.portfolio.finalize()
+            results = {
+                'signals': self.signal_count,
+                'fills': self.fill_count,
+                'stats': self.portfolio.stats,
+                'equity_curve': self.portfolio.equity_curve,
+                'metrics': self.portfolio.metrics.tearsheet(self.portfolio.stats)
+            }
+        if self.profiler:
+            self.profiler.stop()
+            results['profile'] = self.profiler.report()
+        return results
+
+    def run_backtest(self, progress: Optional[Callable[[Dict], None]] = None,
+                     progress_every: int = 1000):
+        """Run to the end of the data.
+
+        ``progress``, if given, is called with ``self.progress(steps)`` every
+        ``progress_every`` time steps; exceptions it raises abort the run.
+
+        On a result-cache hit nothing runs: ``cached`` is set and the
+        components (``portfolio``/``portfolios``, ``order_book``, ...) are
+        never built. Callers that inspect them afterwards must set
+        ``backtest.result_cache`` to false.
+        """
+        logging.basicConfig(level=logging.INFO)
+        if self.result_cache is not None:
+            cache_key = backtest_key(self.config)
+            results = self.result_cache.get(cache_key)
+            if results is not None:
+                logging.info(f"Loaded cached results {cache_key[:12]}")
+                self.cached = True
+                return results
+
+        self._start()
+        data_handler = self.data_handler
+        step = self._step
+        steps = 0
+        
+        try:
+            while data_handler.continue_backtest:
+                step(data_handler.update_bars())
+                if progress is not None:
+                    steps += 1
+                    if steps % progress_every == 0:
+                        progress(self.progress(steps))
+        finally:
+            # An aborted run still leaves a readable journal
+            if self.journal is not None:
+                self.journal.close()
+        
+        results = self._results()
+        if self.result_cache is not None:
+            self.result_cache.put(cache_key, results)
+        return results
@@ -2,51 +2,92 @@
 from abc import ABC, abstractmethod
 from enum import Enum
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 class EventType(Enum):
     MARKET = "MARKET"
-    SIGNAL = "SIGNAL" 
+    SIGNAL = "SIGNAL"
     ORDER = "ORDER"
     FILL = "FILL"
 
 class Event(ABC):
-    """Abstract base class for all events"""
-    def __init__(self, type_: EventType):
-        self.type = type_
+    """Abstract base class for all events.
+
+    Events are slotted (no per-instance __dict__) and keep their type as a
+    class attribute. Item access (``event['symbol']``) is supported so
+    handlers written against the old dict payloads keep working.
+    """
+    __slots__ = ()
+    type: EventType
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
 
 class MarketEvent(Event):
     """Handles market price updates"""
+    __slots__ = ('data',)
+    type = EventType.MARKET
+
     def __init__(self, data: Dict[str, Any]):
-        super().__init__(EventType.MARKET)
-        self.data = data  # {\'datetime\': dt, \'open\': o, \'high\': h, \'low\': l, \'close\': c, \'volume\': v}
+        self.data = data  # {'datetime': dt, 'symbol': s, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
 
 class SignalEvent(Event):
     """Strategy signal generation"""
-    def __init__(self, symbol: str, datetime: datetime, signal_type: str, strength: float = 1.0):
-        super().__init__(EventType.SIGNAL)
+    __slots__ = ('symbol', 'datetime', 'signal_type', 'strength', 'strategy')
+    type = EventType.SIGNAL
+
+    def __init__(self, symbol: str, datetime: datetime, signal_type: str, strength: float = 1.0,
+                 strategy: Optional[str] = None):
         self.symbol = symbol
         self.datetime = datetime
         self.signal_type = signal_type  # "LONG", "SHORT"
         self.strength = strength
+        self.strategy = strategy  # config name of the emitting strategy in multi-strategy runs
 
 class OrderEvent(Event):
     """Order placement"""
-    def __init__(self, symbol: str, datetime: datetime, order_type: str, quantity: int, 
-                 direction: str, slippage: float = 0.0):
-        super().__init__(EventType.ORDER)
+    __slots__ = ('symbol', 'datetime', 'order_type', 'quantity', 'direction', 'slippage', 'strategy',
+                 'price', 'take_profit', 'stop_loss')
+    type = EventType.ORDER
+
+    def __init__(self, symbol: str, datetime: datetime, order_type: str, quantity: int,
+                 direction: str, slippage: float = 0.0, strategy: Optional[str] = None,
+                 price: Optional[float] = None, take_profit: Optional[float] = None,
+                 stop_loss: Optional[float] = None):
         self.symbol = symbol
         self.datetime = datetime
-        self.order_type = order_type  # "MARKET"
+        self.order_type = order_type  # "MARKET", "LIMIT", "STOP"
         self.quantity = quantity
         self.direction = direction  # "BUY", "SELL"
         self.slippage = slippage
+        self.strategy = strategy
+        self.price = price  # limit price, or stop trigger
+        # Bracket exits placed once the order fills
+        self.take_profit = take_profit
+        self.stop_loss = stop_loss
 
 class FillEvent(Event):
     """Order fill confirmation"""
+    __slots__ = ('symbol', 'datetime', 'exchange', 'quantity', 'direction', 'fill_price', 'commission',
+                 'strategy', 'slipped')
+    type = EventType.FILL
+
     def __init__(self, symbol: str, datetime: datetime, exchange: str, quantity: int,
-                 direction: str, fill_price: float, commission: float = 0.0):
-        super().__init__(EventType.FILL)
+                 direction: str, fill_price: float, commission: float = 0.0,
+                 strategy: Optional[str] = None, slipped: bool = True):
         self.symbol = symbol
         self.datetime = datetime
         self.exchange = exchange
@@ -54,3 +95,5 @@ class FillEvent(Event):
         self.direction = direction
         self.fill_price = fill_price
         self.commission = commission
+        self.strategy = strategy
+        self.slipped = slipped  # fill_price includes market-order slippage (not so for limit fills)
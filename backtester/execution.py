@@ -3,32 +3,44 @@ import logging
 from typing import Dict
 from datetime import datetime
 import numpy as np
+from backtester.events import FillEvent
 
 class ExecutionHandler:
-    def __init__(self, slippage_bps: float, commission_per_trade: float):
+    def __init__(self, slippage_bps: float, commission_per_trade: float, log_fills: bool = False):
         self.slippage_bps = slippage_bps / 10000
         self.commission_per_trade = commission_per_trade
+        self.log_fills = log_fills  # one log line per fill; use a TradeJournal for long runs
 
-    def execute_order(self, order: Dict, market_price: float) -> Dict:
+    def execute_order(self, order: Dict, market_price: float) -> FillEvent:
         """Execute market order with realistic slippage"""
-        quantity = abs(order[\'quantity\'])
-        direction = order[\'direction\']
+        quantity = abs(order['quantity'])
+        direction = order['direction']
 
         # Apply slippage (worse fill for market orders)
-        slippage = market_price * self.slippage_bps * (1.5 if direction == \'BUY\' else 0.5)
-        fill_price = market_price + slippage if direction == \'BUY\' else market_price - slippage
+        slippage = market_price * self.slippage_bps * (1.5 if direction == 'BUY' else 0.5)
+        fill_price = market_price + slippage if direction == 'BUY' else market_price - slippage
 
         commission = self.commission_per_trade
 
-        fill = {
-            \'symbol\': order[\'symbol\'],
-            \'datetime\': order[\'datetime\'],
-            \'exchange\': \'BACKTEST\',
-            \'quantity\': quantity,
-            \'direction\': direction,
-            \'fill_price\': fill_price,
-            \'commission\': commission
-        }
+        fill = FillEvent(
+            order['symbol'],
+            order['datetime'],
+            'BACKTEST',
+            quantity,
+            direction,
+            fill_price,
+            commission,
+            order.get('strategy')
+        )
 
-        logging.info(f"FILL: {direction} {quantity} {order[\'symbol\']} @ {fill_price:.4f}")
+        if self.log_fills:
+            logging.info(f"FILL: {direction} {quantity} {order['symbol']} @ {fill_price:.4f}")
         return fill
+
+    def execute_orders(self, directions: np.ndarray, market_prices: np.ndarray) -> np.ndarray:
+        """Vectorized fill prices for market orders (+1 BUY, -1 SELL), same model as execute_order"""
+        directions = np.asarray(directions)
+        market_prices = np.asarray(market_prices, dtype=float)
+        buy = directions > 0
+        slippage = market_prices * self.slippage_bps * np.where(buy, 1.5, 0.5)
+        return np.where(buy, market_prices + slippage, market_prices - slippage)
@@ -0,0 +1,218 @@
+"""Buffered, append-only columnar journal of signals and fills.
+
+A journal is a directory holding one ``.col`` file per record kind plus a
+``meta.json`` with the schemas and the symbol and strategy tables. Records are written
+into fixed-size NumPy buffers. Each full buffer is appended to its file
+as one block: a little-endian int64 row count followed by every column's
+bytes in schema order. Memory use does not grow with the length of the
+run, and the file can be read back a column at a time.
+"""
+import json
+import os
+import struct
+from typing import Dict, Iterator, List
+import numpy as np
+import pandas as pd
+from backtester.ledger import to_nanos
+
+META_FILE = 'meta.json'
+JOURNAL_VERSION = 2
+
+SCHEMAS = {
+    'signals': {
+        'datetime': 'int64',
+        'symbol_id': 'int32',
+        'strategy_id': 'int16',  # -1 outside multi-strategy runs
+        'signal_type': 'int8',  # +1 LONG, -1 SHORT
+        'strength': 'float64'
+    },
+    'fills': {
+        'datetime': 'int64',
+        'symbol_id': 'int32',
+        'strategy_id': 'int16',
+        'quantity': 'int64',
+        'direction': 'int8',  # +1 BUY, -1 SELL
+        'fill_price': 'float64',
+        'commission': 'float64'
+    }
+}
+
+_BLOCK_HEADER = struct.Struct('<q')
+
+class ColumnFileWriter:
+    """Fixed-size column buffers flushed to an append-only block file"""
+    def __init__(self, path: str, schema: Dict[str, str], buffer_size: int = 4096):
+        self.path = path
+        self.buffers = [np.zeros(buffer_size, dtype=np.dtype(dtype).newbyteorder('<'))
+                        for dtype in schema.values()]
+        self.buffer_size = buffer_size
+        self.size = 0  # rows in the buffers
+        self.rows_written = 0
+        self._file = open(path, 'wb')
+
+    def append(self, *values):
+        """One row, values in schema order"""
+        row = self.size
+        for buffer, value in zip(self.buffers, values):
+            buffer[row] = value
+        self.size = row + 1
+        if self.size == self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.size:
+            self._file.write(_BLOCK_HEADER.pack(self.size))
+            for buffer in self.buffers:
+                self._file.write(buffer[:self.size].tobytes())
+            self.rows_written += self.size
+            self.size = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+def iter_column_blocks(path: str, schema: Dict[str, str]) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield one {column: array} dict per flushed block"""
+    dtypes = [(name, np.dtype(dtype).newbyteorder('<')) for name, dtype in schema.items()]
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(_BLOCK_HEADER.size)
+            if len(header) < _BLOCK_HEADER.size:
+                return
+            (rows,) = _BLOCK_HEADER.unpack(header)
+            block = {}
+            for name, dtype in dtypes:
+                data = f.read(rows * dtype.itemsize)
+                if len(data) < rows * dtype.itemsize:
+                    return  # truncated trailing block from an interrupted run
+                block[name] = np.frombuffer(data, dtype=dtype)
+            yield block
+
+def read_column_file(path: str, schema: Dict[str, str]) -> Dict[str, np.ndarray]:
+    blocks = list(iter_column_blocks(path, schema))
+    return {
+        name: (np.concatenate([block[name] for block in blocks]) if blocks
+               else np.empty(0, dtype=dtype))
+        for name, dtype in schema.items()
+    }
+
+class TradeJournal:
+    """Writes every signal and fill of a run to a journal directory.
+
+    The directory is overwritten when the journal is opened. ``close``
+    flushes the buffers and writes ``meta.json``; read with JournalReader.
+    """
+    def __init__(self, directory: str, buffer_size: int = 4096):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        # An earlier run's tables must not label this run's rows, even if it is never closed
+        try:
+            os.remove(os.path.join(directory, META_FILE))
+        except FileNotFoundError:
+            pass
+        self.symbols = []
+        self._symbol_ids = {}
+        self.strategies = []
+        self._strategy_ids = {}
+        self._writers = {
+            kind: ColumnFileWriter(os.path.join(directory, f'{kind}.col'), schema, buffer_size)
+            for kind, schema in SCHEMAS.items()
+        }
+        self._signals = self._writers['signals']
+        self._fills = self._writers['fills']
+
+    def _symbol_id(self, symbol: str) -> int:
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return symbol_id
+
+    def _strategy_id(self, strategy) -> int:
+        if strategy is None:
+            return -1
+        strategy_id = self._strategy_ids.get(strategy)
+        if strategy_id is None:
+            strategy_id = self._strategy_ids[strategy] = len(self.strategies)
+            self.strategies.append(strategy)
+        return strategy_id
+
+    def record_signals(self, signals: List):
+        for signal in signals:
+            self._signals.append(
+                to_nanos(signal.datetime),
+                self._symbol_id(signal.symbol),
+                self._strategy_id(signal.strategy),
+                1 if signal.signal_type == 'LONG' else -1,
+                signal.strength
+            )
+
+    def record_fill(self, fill):
+        self._fills.append(
+            to_nanos(fill.datetime),
+            self._symbol_id(fill.symbol),
+            self._strategy_id(fill.strategy),
+            fill.quantity,
+            1 if fill.direction == 'BUY' else -1,
+            fill.fill_price,
+            fill.commission
+        )
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        meta = {
+            'version': JOURNAL_VERSION,
+            'symbols': self.symbols,
+            'strategies': self.strategies,
+            'schemas': SCHEMAS,
+            'rows': {kind: writer.rows_written for kind, writer in self._writers.items()}
+        }
+        tmp_path = os.path.join(self.directory, META_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.directory, META_FILE))
+
+class JournalReader:
+    """Read back a journal directory as arrays or DataFrames"""
+    def __init__(self, directory: str):
+        self.directory = directory
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r') as f:
+                self.meta = json.load(f)
+        else:
+            # Run still in progress or interrupted: flushed blocks are readable, symbols are not
+            self.meta = {'version': JOURNAL_VERSION, 'symbols': [], 'strategies': [],
+                         'schemas': SCHEMAS, 'rows': {}}
+        self.symbols = self.meta['symbols']
+        self.strategies = self.meta.get('strategies', [])  # version 1 journals have none
+
+    def columns(self, kind: str) -> Dict[str, np.ndarray]:
+        return read_column_file(os.path.join(self.directory, f'{kind}.col'), self.meta['schemas'][kind])
+
+    def iter_blocks(self, kind: str) -> Iterator[Dict[str, np.ndarray]]:
+        return iter_column_blocks(os.path.join(self.directory, f'{kind}.col'), self.meta['schemas'][kind])
+
+    def _frame(self, kind: str, flag: str, labels) -> pd.DataFrame:
+        frame = pd.DataFrame(self.columns(kind))
+        frame['datetime'] = pd.to_datetime(frame['datetime'])
+        symbol_ids = frame.pop('symbol_id').to_numpy()
+        symbols = np.array(self.symbols + [None], dtype=object)
+        frame.insert(1, 'symbol', symbols[np.minimum(symbol_ids, len(self.symbols))])
+        if 'strategy_id' in frame:
+            # -1 (single-strategy run) and ids missing from the table both read as None
+            strategy_ids = frame.pop('strategy_id').to_numpy()
+            strategies = np.array(self.strategies + [None], dtype=object)
+            known = (strategy_ids >= 0) & (strategy_ids < len(self.strategies))
+            frame.insert(2, 'strategy', strategies[np.where(known, strategy_ids, len(self.strategies))])
+        frame[flag] = np.where(frame[flag] > 0, *labels)
+        return frame
+
+    def signals(self) -> pd.DataFrame:
+        return self._frame('signals', 'signal_type', ('LONG', 'SHORT'))
+
+    def fills(self) -> pd.DataFrame:
+        return self._frame('fills', 'direction', ('BUY', 'SELL'))
@@ -0,0 +1,77 @@
+"""Append-only columnar tables backed by preallocated NumPy arrays"""
+from typing import Dict, List, Tuple, Union
+import numpy as np
+import pandas as pd
+
+def to_nanos(dt) -> int:
+    """Nanosecond timestamp for int64 datetime columns"""
+    return dt.value if isinstance(dt, pd.Timestamp) else pd.Timestamp(dt).value
+
+class ColumnLedger:
+    """Table of NumPy columns with amortized O(1) appends.
+
+    Columns are preallocated and doubled when full, so a run of n rows costs
+    O(log n) reallocations instead of one Python object per row. A column
+    spec is a dtype, or ``(dtype, width)`` for a 2-D column whose width can
+    later grow with ``ensure_width`` (e.g. one position column per symbol).
+    """
+    def __init__(self, spec: Dict[str, Union[str, Tuple[str, int]]], capacity: int = 1024):
+        self._columns = {}
+        for name, dtype in spec.items():
+            if isinstance(dtype, tuple):
+                dtype, width = dtype
+                self._columns[name] = np.zeros((capacity, width), dtype=dtype)
+            else:
+                self._columns[name] = np.zeros(capacity, dtype=dtype)
+        self._capacity = capacity
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros((self._capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def ensure_width(self, name: str, width: int):
+        column = self._columns[name]
+        if column.shape[1] >= width:
+            return
+        grown = np.zeros((self._capacity, max(width, 2 * column.shape[1])), dtype=column.dtype)
+        grown[:, :column.shape[1]] = column
+        self._columns[name] = grown
+
+    def append(self, **values) -> int:
+        """Append one row; 2-D columns accept a row vector (shorter vectors are zero-padded)"""
+        if self._size == self._capacity:
+            self._grow()
+        row = self._size
+        for name, value in values.items():
+            column = self._columns[name]
+            if column.ndim == 2:
+                value = np.asarray(value)
+                column[row, :len(value)] = value
+                column[row, len(value):] = 0
+            else:
+                column[row] = value
+        self._size += 1
+        return row
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of the filled rows of one column"""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Copy 1-D columns into a DataFrame"""
+        return pd.DataFrame({
+            name: column[:self._size] for name, column in self._columns.items() if column.ndim == 1
+        })
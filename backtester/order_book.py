@@ -0,0 +1,240 @@
+"""Resting limit, stop and bracket orders matched against each bar's OHLC"""
+from typing import Dict, List, Optional
+import numpy as np
+from backtester.events import FillEvent, OrderEvent
+from backtester.execution import ExecutionHandler
+
+LIMIT = 1
+STOP = 2
+ORDER_KINDS = {'LIMIT': LIMIT, 'STOP': STOP}
+
+# Resting orders never expire unless given a bar count
+GOOD_TILL_CANCELLED = -1
+
+class OrderBook:
+    """Columnar book of resting orders for every symbol and strategy.
+
+    Each bar step matches every live order against its symbol's bar in a
+    few NumPy passes. There is no per-order Python work except for the
+    orders that fill.
+
+    - A buy limit fills when the low reaches its price, at the better of
+      the open and the limit.
+    - A sell limit fills when the high reaches its price, likewise.
+    - A stop triggers when the high (buy) or low (sell) crosses its price.
+      It then fills like a market order at the worse of the open and the
+      stop, with the execution handler's slippage.
+    - Every fill pays the handler's commission.
+
+    Bracket exits (a take-profit limit and a stop-loss stop) share an OCO
+    group. A resting entry's exits go live on the bar after the entry
+    fills. If both exits of a group trigger on the same bar, the stop-loss
+    is assumed to have filled first. Filled, cancelled and expired rows are
+    compacted away, so the arrays stay about the size of the live book.
+    """
+    _FIELDS = {
+        'order_id': 'int64',
+        'symbol_id': 'int32',
+        'strategy_id': 'int32',  # -1: single-strategy run
+        'direction': 'int8',  # +1 BUY, -1 SELL
+        'kind': 'int8',  # LIMIT or STOP
+        'quantity': 'int64',
+        'price': 'float64',
+        'group': 'int64',  # OCO group, -1 for none
+        'parent': 'int64',  # order that must fill before this one goes live, -1 for none
+        'remaining': 'int64',  # bars left before expiry, or GOOD_TILL_CANCELLED
+        'active': 'bool'
+    }
+
+    def __init__(self, execution_handler: ExecutionHandler, capacity: int = 256):
+        self.execution_handler = execution_handler
+        self._arrays = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self._FIELDS.items()}
+        self.size = 0
+        self.live = 0  # rows still active
+        self.symbols = []
+        self._symbol_ids = {}
+        self.strategies = []
+        self._strategy_ids = {}
+        self._next_id = 0
+        self._next_group = 0
+
+    def __len__(self) -> int:
+        return self.live
+
+    def _id(self, table: List, ids: Dict, name) -> int:
+        if name is None:
+            return -1
+        index = ids.get(name)
+        if index is None:
+            index = ids[name] = len(table)
+            table.append(name)
+        return index
+
+    def _append(self, **values) -> int:
+        if self.size == len(self._arrays['order_id']):
+            for name, array in self._arrays.items():
+                grown = np.zeros(2 * len(array), dtype=array.dtype)
+                grown[:self.size] = array[:self.size]
+                self._arrays[name] = grown
+        row = self.size
+        order_id = self._next_id
+        self._next_id += 1
+        self._arrays['order_id'][row] = order_id
+        self._arrays['active'][row] = True
+        for name, value in values.items():
+            self._arrays[name][row] = value
+        self.size += 1
+        self.live += 1
+        return order_id
+
+    def add(self, order: OrderEvent, expire_bars: int = GOOD_TILL_CANCELLED) -> int:
+        """Rest a LIMIT or STOP order, with its bracket exits if it has any; returns its id"""
+        kind = ORDER_KINDS[order.order_type]
+        symbol_id = self._id(self.symbols, self._symbol_ids, order.symbol)
+        strategy_id = self._id(self.strategies, self._strategy_ids, order.strategy)
+        direction = 1 if order.direction == 'BUY' else -1
+        order_id = self._append(symbol_id=symbol_id, strategy_id=strategy_id, direction=direction,
+                                kind=kind, quantity=order.quantity, price=order.price, group=-1,
+                                parent=-1, remaining=expire_bars)
+        self._add_exits(order, symbol_id, strategy_id, -direction, parent=order_id)
+        return order_id
+
+    def add_exits(self, order: OrderEvent):
+        """Rest the bracket exits of an entry that has already filled"""
+        self._add_exits(order, self._id(self.symbols, self._symbol_ids, order.symbol),
+                        self._id(self.strategies, self._strategy_ids, order.strategy),
+                        -1 if order.direction == 'BUY' else 1, parent=-1)
+
+    def _add_exits(self, order: OrderEvent, symbol_id: int, strategy_id: int, direction: int,
+                   parent: int):
+        exits = [(LIMIT, order.take_profit), (STOP, order.stop_loss)]
+        exits = [(kind, price) for kind, price in exits if price is not None]
+        if not exits:
+            return
+        group = self._next_group
+        self._next_group += 1
+        for kind, price in exits:
+            self._append(symbol_id=symbol_id, strategy_id=strategy_id, direction=direction, kind=kind,
+                         quantity=order.quantity, price=price, group=group, parent=parent,
+                         remaining=GOOD_TILL_CANCELLED)
+
+    def cancel(self, symbol: str, strategy: Optional[str] = None) -> int:
+        """Cancel every resting order of one symbol (and strategy); returns how many"""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None or not self.live:
+            return 0
+        n = self.size
+        a = self._arrays
+        mask = a['active'][:n] & (a['symbol_id'][:n] == symbol_id)
+        strategy_id = -1 if strategy is None else self._strategy_ids.get(strategy)
+        if strategy_id is None:
+            return 0
+        mask &= a['strategy_id'][:n] == strategy_id
+        cancelled = int(mask.sum())
+        a['active'][:n][mask] = False
+        self.live -= cancelled
+        self._compact()
+        return cancelled
+
+    def match(self, bars: List) -> List[FillEvent]:
+        """Match the book against one time step's bars and return the fills"""
+        if not self.live:
+            return []
+        n = self.size
+        a = self._arrays
+
+        # Per-symbol OHLC for this step; symbols without a bar stay NaN and match nothing
+        ohlc = np.full((3, len(self.symbols)), np.nan)
+        bar_of = {}
+        for bar in bars:
+            symbol_id = self._symbol_ids.get(bar['symbol'])
+            if symbol_id is not None:
+                ohlc[:, symbol_id] = (bar['open'], bar['high'], bar['low'])
+                bar_of[symbol_id] = bar
+        if not bar_of:
+            return []
+        symbol_ids = a['symbol_id'][:n]
+        bar_open, high, low = ohlc[:, symbol_ids]
+
+        active = a['active'][:n]
+        live = active & (a['parent'][:n] < 0)
+        buy = a['direction'][:n] > 0
+        stop = a['kind'][:n] == STOP
+        price = a['price'][:n]
+        # Buy limits and sell stops trade on a move down, the others on a move up
+        down = buy != stop
+        hit = live & np.where(down, low <= price, high >= price)
+
+        rows = np.flatnonzero(hit)
+        if len(rows):
+            group = a['group'][:n]
+            grouped = rows[group[rows] >= 0]
+            if len(grouped) > 1:
+                # One exit per OCO group: the stop-loss when both triggered
+                order = np.lexsort((-a['kind'][grouped], group[grouped]))
+                _, first = np.unique(group[grouped][order], return_index=True)
+                keep = np.zeros(n, dtype=bool)
+                keep[grouped[order][first]] = True
+                hit[grouped] = keep[grouped]
+                rows = np.flatnonzero(hit)
+
+        fills = []
+        if len(rows):
+            fill_prices = np.where(down[rows], np.minimum(bar_open[rows], price[rows]),
+                                   np.maximum(bar_open[rows], price[rows]))
+            stops = stop[rows]
+            if stops.any():
+                fill_prices[stops] = self.execution_handler.execute_orders(
+                    a['direction'][:n][rows[stops]], fill_prices[stops])
+            fills = self._fills(rows, fill_prices, bar_of)
+
+            # Filled orders, the rest of their OCO groups, and children of filled entries
+            filled_groups = group[rows][group[rows] >= 0]
+            done = hit | (active & np.isin(group, filled_groups))
+            active[done] = False
+            a['parent'][:n][np.isin(a['parent'][:n], a['order_id'][:n][rows])] = -1
+
+        # Expire what is left of orders whose symbol traded this step
+        remaining = a['remaining'][:n]
+        ticking = active & (remaining > 0) & ~np.isnan(bar_open)
+        remaining[ticking] -= 1
+        active[ticking & (remaining == 0)] = False
+        # Exits waiting on an entry that expired can no longer go live
+        pending = active & (a['parent'][:n] >= 0)
+        if pending.any():
+            active[pending & ~np.isin(a['parent'][:n], a['order_id'][:n][active])] = False
+
+        self.live = int(active.sum())
+        self._compact()
+        return fills
+
+    def _fills(self, rows: np.ndarray, fill_prices: np.ndarray, bar_of: Dict) -> List[FillEvent]:
+        a = self._arrays
+        commission = self.execution_handler.commission_per_trade
+        strategies = self.strategies
+        fills = []
+        for row, fill_price in zip(rows.tolist(), fill_prices.tolist()):
+            symbol_id = int(a['symbol_id'][row])
+            strategy_id = int(a['strategy_id'][row])
+            fills.append(FillEvent(
+                self.symbols[symbol_id],
+                bar_of[symbol_id]['datetime'],
+                'BACKTEST',
+                int(a['quantity'][row]),
+                'BUY' if a['direction'][row] > 0 else 'SELL',
+                fill_price,
+                commission,
+                strategies[strategy_id] if strategy_id >= 0 else None,
+                slipped=bool(a['kind'][row] == STOP)
+            ))
+        return fills
+
+    def _compact(self):
+        """Drop inactive rows once they are most of the book"""
+        if self.size < 64 or self.live * 2 > self.size:
+            return
+        keep = self._arrays['active'][:self.size]
+        for name, array in self._arrays.items():
+            kept = array[:self.size][keep]
+            array[:len(kept)] = kept
+        self.size = len(kept)
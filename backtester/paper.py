@@ -0,0 +1,287 @@
+"""Asyncio paper trading: the event engine fed bar by bar from a live-like feed.
+
+    python -m backtester.paper                          # replay config.json's data at paper.speed
+    python -m backtester.paper --speed 0                # as fast as the engine keeps up
+    python -m backtester.paper --serve 9000 --speed 60  # serve the replay as a socket feed
+    python -m backtester.paper --connect 127.0.0.1:9000
+
+Strategies, order sizing, the order book, ExecutionHandler and the
+portfolios are the backtest's own. Tick-to-signal and tick-to-fill latency
+histograms are reported at the end of the run.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Optional
+import numpy as np
+import pandas as pd
+from backtester.data_handler import DataHandler, LiveDataHandler, UniverseDataHandler
+from backtester.engine import Backtester
+from backtester.profiling import LatencyHistogram
+
+# What to do with a new bar when the queue is full
+OVERFLOW = ('block', 'drop_oldest')
+
+class BarFeed(ABC):
+    """Async source of bar dicts (datetime, symbol, open, high, low, close, volume)"""
+    @abstractmethod
+    def bars(self) -> AsyncIterator[Dict]:
+        """Async iterator over the bars, in arrival order"""
+
+class ReplayFeed(BarFeed):
+    """Bars of a file-backed data handler, paced by their timestamps.
+
+    ``speed`` is bar time per wall-clock time: 1 replays in real time, 60
+    plays an hour of bars per minute, 0 sends them as fast as they are
+    taken. Deadlines are measured from the first bar, so pacing does not
+    drift when the consumer is slow.
+    """
+    def __init__(self, data_handler, speed: float = 1.0):
+        self.data_handler = data_handler
+        self.speed = speed
+
+    async def bars(self) -> AsyncIterator[Dict]:
+        loop = asyncio.get_running_loop()
+        handler = self.data_handler
+        first_stamp = started = None
+        while handler.continue_backtest:
+            for bar in handler.update_bars():
+                bar = bar.to_dict()
+                if self.speed > 0:
+                    stamp = bar['datetime'].value
+                    if first_stamp is None:
+                        first_stamp, started = stamp, loop.time()
+                    delay = started + (stamp - first_stamp) / 1e9 / self.speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                yield bar
+            if self.speed <= 0:
+                await asyncio.sleep(0)  # let the consumer run between time steps
+
+class SocketFeed(BarFeed):
+    """Newline-delimited JSON bars read from a TCP server (e.g. ``--serve``)"""
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+
+    async def bars(self) -> AsyncIterator[Dict]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while line := await reader.readline():
+                bar = json.loads(line)
+                bar['datetime'] = pd.Timestamp(bar['datetime'])
+                yield bar
+        finally:
+            writer.close()
+
+def replay_feed(config: Dict, speed: float) -> ReplayFeed:
+    """Replay of the config's data (csv_path, or every symbol of a universe)"""
+    data_config = config['data']
+    use_cache = data_config.get('use_cache', True)
+    if 'universe' in data_config:
+        handler = UniverseDataHandler(data_config['universe'], use_cache)
+    else:
+        handler = DataHandler(data_config['csv_path'], data_config['symbol'], use_cache)
+    return ReplayFeed(handler, speed)
+
+def _json_value(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+async def serve_feed(make_feed: Callable[[], BarFeed], host: str = '127.0.0.1', port: int = 9000):
+    """Stream a fresh feed to every client as JSON lines until cancelled.
+
+    ``drain`` waits whenever the client falls behind, so a slow reader
+    slows the feed through TCP flow control instead of growing a buffer.
+    """
+    async def stream(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            async for bar in make_feed().bars():
+                writer.write(json.dumps(bar, default=_json_value).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(stream, host, port)
+    logging.info(f"Serving bars on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+class PaperTrader(Backtester):
+    """The event engine driven by an async bar feed instead of a file.
+
+    Received bars go through a bounded ``asyncio.Queue`` to one worker
+    thread. The event loop keeps receiving while a slow strategy runs, and
+    the engine state is only ever touched by that one thread. When the
+    queue is full, ``paper.overflow`` decides what happens:
+
+    - 'block' makes the feed wait. Replays slow down, and socket feeds
+      push back through TCP flow control.
+    - 'drop_oldest' discards the stalest queued bar and counts it, as a
+      live system that must act on current prices would.
+
+    Latencies are measured from the moment a bar is received, so they
+    include any time spent waiting in the queue.
+    """
+    def __init__(self, config, feed: BarFeed):
+        super().__init__(config)
+        paper_config = config.get('paper', {})
+        self.feed = feed
+        self.queue_size = paper_config.get('queue_size', 1024)
+        self.overflow = paper_config.get('overflow', 'block')
+        if self.overflow not in OVERFLOW:
+            raise ValueError(f"Unknown overflow '{self.overflow}' (expected one of {OVERFLOW})")
+        # A live feed is not reproducible, so results are never cached
+        self.result_cache = None
+        self.latency = {name: LatencyHistogram() for name in
+                        ('tick_to_signal', 'tick_to_fill', 'tick_to_processed')}
+        self.received = 0
+        self.dropped = 0
+        self.max_queue = 0
+        self._tick_ns = 0  # receive time of the bar being processed
+
+    def _build_data_handler(self, data_config):
+        symbols = list(data_config['universe']) if 'universe' in data_config else [data_config['symbol']]
+        return LiveDataHandler(
+            symbols,
+            data_config.get('lookback') or max(strategy.lookback for slots in self.strategy_slots.values()
+                                               for _, strategy in slots)
+        )
+
+    def _emit(self, signals: list):
+        elapsed = time.perf_counter_ns() - self._tick_ns
+        histogram = self.latency['tick_to_signal']
+        for _ in signals:
+            histogram.record(elapsed)
+        super()._emit(signals)
+
+    def _on_fill(self, event):
+        self.latency['tick_to_fill'].record(time.perf_counter_ns() - self._tick_ns)
+        super()._on_fill(event)
+
+    def _on_tick(self, received_ns: int, bar: Dict):
+        """Process one received bar (on the worker thread)"""
+        self._tick_ns = received_ns
+        self.data_handler.push(bar)
+        self._step(self.data_handler.update_bars())
+        self.latency['tick_to_processed'].record(time.perf_counter_ns() - received_ns)
+
+    async def _receive(self, queue: asyncio.Queue):
+        clock = time.perf_counter_ns
+        try:
+            async for bar in self.feed.bars():
+                item = (clock(), bar)
+                self.received += 1
+                if self.overflow == 'drop_oldest' and queue.full():
+                    queue.get_nowait()
+                    self.dropped += 1
+                    queue.put_nowait(item)
+                else:
+                    await queue.put(item)
+                if queue.qsize() > self.max_queue:
+                    self.max_queue = queue.qsize()
+        finally:
+            await queue.put(None)  # end of feed, also after a feed error
+
+    async def run(self, progress: Optional[Callable[[Dict], None]] = None,
+                  progress_every: int = 1000) -> Dict:
+        """Trade the feed to its end; results are a backtest's plus 'latency' and 'feed'"""
+        logging.basicConfig(level=logging.INFO)
+        self._start()
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(self.queue_size)
+        receiver = asyncio.create_task(self._receive(queue))
+        worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='paper')
+        steps = 0
+
+        try:
+            while (item := await queue.get()) is not None:
+                await loop.run_in_executor(worker, self._on_tick, *item)
+                if progress is not None:
+                    steps += 1
+                    if steps % progress_every == 0:
+                        progress(self.progress(steps))
+            await receiver  # re-raises a feed error
+        finally:
+            receiver.cancel()
+            worker.shutdown(wait=True)
+            if self.journal is not None:
+                self.journal.close()
+
+        results = self._results()
+        results['latency'] = {name: histogram.summary() for name, histogram in self.latency.items()}
+        results['feed'] = {
+            'received': self.received,
+            'processed': self.data_handler.current_bar + 1,
+            'dropped': self.dropped,
+            'skipped': self.data_handler.skipped,
+            'max_queue': self.max_queue
+        }
+        return results
+
+    def run_backtest(self, progress: Optional[Callable[[Dict], None]] = None,
+                     progress_every: int = 1000) -> Dict:
+        """Blocking ``run`` in a new event loop"""
+        return asyncio.run(self.run(progress, progress_every))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--speed', type=float, default=None,
+                        help="replay speed, bar time per wall time; 0 = unthrottled (overrides paper.speed)")
+    parser.add_argument('--connect', default=None, metavar='HOST:PORT', help="read bars from a socket feed")
+    parser.add_argument('--serve', type=int, default=None, metavar='PORT', help="serve the replay instead of trading it")
+    parser.add_argument('--queue-size', type=int, default=None)
+    parser.add_argument('--overflow', choices=OVERFLOW, default=None)
+    parser.add_argument('--strategies', nargs='+', default=None, metavar='NAME')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    paper_config = config.setdefault('paper', {})
+    for key in ('speed', 'queue_size', 'overflow'):
+        if getattr(args, key) is not None:
+            paper_config[key] = getattr(args, key)
+    if args.strategies:
+        config['backtest']['strategies'] = args.strategies
+    speed = paper_config.get('speed', 1.0)
+
+    if args.serve is not None:
+        try:
+            asyncio.run(serve_feed(lambda: replay_feed(config, speed), port=args.serve))
+        except KeyboardInterrupt:
+            pass
+        raise SystemExit(0)
+
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+        feed = SocketFeed(host, int(port))
+    else:
+        feed = replay_feed(config, speed)
+    trader = PaperTrader(config, feed)
+    results = trader.run_backtest()
+
+    print("\n=== PAPER TRADING RESULTS ===")
+    print(f"Signals generated: {results['signals']}")
+    print(f"Total fills: {results['fills']}")
+    print("\nPortfolio stats:", results['stats'])
+    feed_stats = results['feed']
+    print(f"\nBars received: {feed_stats['received']}  processed: {feed_stats['processed']}  "
+          f"dropped: {feed_stats['dropped']}  skipped: {feed_stats['skipped']}  "
+          f"max queued: {feed_stats['max_queue']}/{trader.queue_size}")
+    for name, histogram in trader.latency.items():
+        summary = histogram.summary()
+        print(f"\n--- {name}: {summary['count']} samples, mean {summary['mean_us']:,.1f} us, "
+              f"p50 {summary['p50_us']:,.1f} us, p99 {summary['p99_us']:,.1f} us, max {summary['max_us']:,.1f} us")
+        for line in histogram.render():
+            print(line)
@@ -1,34 +1,126 @@
 """Performance metrics calculation"""
+import math
 import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Sequence, Union
 
-def calculate_sharpe_ratio(returns: List[float], risk_free_rate: float = 0.0) -> float:
-    """Sharpe ratio calculation"""
-    if len(returns) == 0 or np.std(returns) == 0:
-        return 0.0
+def calculate_sharpe_ratio(returns, risk_free_rate: float = 0.0):
+    """Sharpe ratio calculation; a 2-D array gives one ratio per row"""
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.shape[-1] == 0:
+        return np.zeros(returns.shape[:-1]) if returns.ndim > 1 else 0.0
 
-    excess_returns = np.array(returns) - risk_free_rate / 252  # Annualized
-    return np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252)
+    excess_returns = returns - risk_free_rate / 252  # Annualized
+    std = excess_returns.std(axis=-1)
+    sharpe = np.divide(excess_returns.mean(axis=-1), std,
+                       out=np.zeros_like(std), where=std != 0) * np.sqrt(252)
+    return sharpe if sharpe.ndim else float(sharpe)
 
-def calculate_max_drawdown(equity_curve: List[float]) -> Dict:
-    """Maximum drawdown calculation"""
-    equity = np.array(equity_curve)
-    peak = np.maximum.accumulate(equity)
-    drawdown = (equity - peak) / peak
+def calculate_max_drawdown(equity_curve) -> Dict:
+    """Maximum drawdown calculation; a 2-D array gives one drawdown per row"""
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    max_drawdown = ((equity - peak) / peak).min(axis=-1)
     return {
-        \'max_drawdown\': np.min(drawdown),
-        \'max_drawdown_pct\': abs(np.min(drawdown)) * 100
+        'max_drawdown': max_drawdown,
+        'max_drawdown_pct': np.abs(max_drawdown) * 100
     }
 
-def create_tearsheet(stats: Dict, equity_curve: List[float]) -> Dict:
-    """Generate comprehensive performance report"""
-    returns = np.diff(equity_curve) / equity_curve[:-1]
+def create_tearsheet(stats: Union[Dict, Sequence[Dict]], equity_curve) -> Dict:
+    """Generate comprehensive performance report.
+
+    ``equity_curve`` may be a 2-D array with one curve per row (e.g. a
+    sweep or Monte Carlo batch); every metric then becomes an array with
+    one entry per row. ``stats`` is a stats dict whose values are scalars
+    or per-row arrays, or a list of stats dicts, one per row.
+    """
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    if not isinstance(stats, dict):
+        stats = {key: np.array([s.get(key, 0) for s in stats]) for key in ('total_trades', 'wins')}
+    returns = np.diff(equity, axis=-1) / equity[..., :-1]
+    total_trades = stats.get('total_trades', 0)
 
     return {
-        \'sharpe_ratio\': calculate_sharpe_ratio(returns.tolist()),
-        \'max_drawdown\': calculate_max_drawdown(equity_curve),
-        \'total_return\': (equity_curve[-1] / equity_curve[0] - 1) * 100,
-        \'num_trades\': stats.get(\'total_trades\', 0),
-        \'win_rate\': stats.get(\'wins\', 0) / max(stats.get(\'total_trades\', 1), 1) * 100
+        'sharpe_ratio': calculate_sharpe_ratio(returns),
+        'max_drawdown': calculate_max_drawdown(equity),
+        'total_return': (equity[..., -1] / equity[..., 0] - 1) * 100,
+        'num_trades': total_trades,
+        'win_rate': np.asarray(stats.get('wins', 0)) / np.maximum(total_trades, 1) * 100
     }
+
+class OnlineMetrics:
+    """Running Sharpe, drawdown and win/loss tallies in O(1) memory.
+
+    Fed one equity value per bar (``update``) and one realized P&L per
+    closed trade (``record_trade``). Returns use Welford's mean/variance,
+    so ``tearsheet`` matches ``create_tearsheet`` on the full curve without
+    keeping it.
+    """
+    __slots__ = ('bars', 'first_equity', 'last_equity', 'peak', 'max_drawdown',
+                 '_mean', '_m2', 'wins', 'losses', 'gross_wins', 'gross_losses')
+
+    def __init__(self):
+        self.bars = 0
+        self.first_equity = None
+        self.last_equity = None
+        self.peak = -math.inf
+        self.max_drawdown = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.wins = 0
+        self.losses = 0
+        self.gross_wins = 0.0
+        self.gross_losses = 0.0
+
+    def update(self, equity: float):
+        equity = float(equity)
+        if self.last_equity is None:
+            self.first_equity = equity
+        else:
+            ret = equity / self.last_equity - 1
+            count = self.bars  # returns seen after this one
+            delta = ret - self._mean
+            self._mean += delta / count
+            self._m2 += delta * (ret - self._mean)
+        self.bars += 1
+        self.last_equity = equity
+        if equity > self.peak:
+            self.peak = equity
+        drawdown = (equity - self.peak) / self.peak
+        if drawdown < self.max_drawdown:
+            self.max_drawdown = drawdown
+
+    def record_trade(self, pnl: float):
+        if pnl > 0:
+            self.wins += 1
+            self.gross_wins += pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.gross_losses -= pnl
+
+    @property
+    def sharpe_ratio(self) -> float:
+        count = self.bars - 1
+        if count < 1 or self._m2 <= 0:
+            return 0.0
+        return self._mean / math.sqrt(self._m2 / count) * math.sqrt(252)
+
+    @property
+    def total_return(self) -> float:
+        if self.first_equity is None:
+            return 0.0
+        return (self.last_equity / self.first_equity - 1) * 100
+
+    def tearsheet(self, stats: Dict) -> Dict:
+        """Same layout as create_tearsheet, from the running state"""
+        total_trades = stats.get('total_trades', 0)
+        return {
+            'sharpe_ratio': self.sharpe_ratio,
+            'max_drawdown': {
+                'max_drawdown': self.max_drawdown,
+                'max_drawdown_pct': abs(self.max_drawdown) * 100
+            },
+            'total_return': self.total_return,
+            'num_trades': total_trades,
+            'win_rate': self.wins / max(total_trades, 1) * 100
+        }
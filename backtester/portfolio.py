@@ -1,99 +1,213 @@
 """Portfolio tracking with P&L accounting"""
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 import pandas as pd
 import numpy as np
 import logging
+from backtester.ledger import ColumnLedger, to_nanos
+from backtester.performance import OnlineMetrics
 
 class Portfolio:
-    def __init__(self, initial_capital: float, slippage_bps: float, commission_per_trade: float):
+    def __init__(self, initial_capital: float, slippage_bps: float, commission_per_trade: float,
+                 record_history: bool = True):
         self.initial_capital = initial_capital
         self.current_capital = initial_capital
         self.slippage_bps = slippage_bps / 10000  # Convert to decimal
         self.commission_per_trade = commission_per_trade
 
-        self.all_positions = {}  # symbol: quantity
-        self.current_positions = {}
-        self.all_holdings = {}   # symbol: {\'avg_price\': x, \'quantity\': y}
-        self.current_holdings = {}
-
-        self.all_cash = [initial_capital]
+        # Live state, updated in place by execute_fill (never copied per bar)
+        self.current_positions = {}  # symbol: quantity
+        self.current_holdings = {}   # symbol: {'avg_price': x, 'quantity': y}
         self.current_cash = initial_capital
 
-        self.trades = []  # List of completed trades
-        self.stats = {
-            \'total_trades\': 0,
-            \'wins\': 0,
-            \'losses\': 0,
-            \'gross_wins\': 0.0,
-            \'gross_losses\': 0.0,
-            \'total_fees\': 0.0
-        }
+        self.latest_prices = {}  # symbol: last close seen
+        self.current_datetime = None
+        self._bar_pending = False
+
+        # Columnar history: one row per fill and one row per timestamp
+        self.symbols = []  # symbol ids index this list
+        self._symbol_ids = {}
+        self._position_vector = np.zeros(8, dtype=np.int64)
+        self.trades = ColumnLedger({
+            'datetime': 'int64',
+            'symbol_id': 'int32',
+            'quantity': 'int64',
+            'direction': 'int8',  # +1 BUY, -1 SELL
+            'fill_price': 'float64',
+            'commission': 'float64',
+            'pnl': 'float64',  # realized, before commission
+            'slipped': 'bool'  # market-order slippage is in fill_price (market and stop fills)
+        })
+        self.history = ColumnLedger({
+            'datetime': 'int64',
+            'cash': 'float64',
+            'market_value': 'float64',
+            'equity': 'float64',
+            'positions': ('int64', 8)  # one column per symbol id
+        })
+
+        # Running metrics; with record_history=False they are all that is kept per bar
+        self.record_history = record_history
+        self.metrics = OnlineMetrics()
+        self.total_trades = 0
+        self.total_fees = 0.0
+
+    def _symbol_id(self, symbol: str) -> int:
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            if symbol_id >= len(self._position_vector):
+                self._position_vector = np.concatenate(
+                    [self._position_vector, np.zeros_like(self._position_vector)])
+            self.history.ensure_width('positions', len(self._position_vector))
+        return symbol_id
 
     def update_timeindex(self, event: Dict):
-        """Update portfolio state"""
-        self.current_cash = self.initial_capital
-        self.current_positions = self.all_positions.copy()
-        self.current_holdings = self.all_holdings.copy()
+        """Update portfolio state for one symbol's bar; the previous timestamp is recorded once it closes"""
+        if event['datetime'] != self.current_datetime:
+            if self._bar_pending:
+                self._record_bar()
+            self.current_datetime = event['datetime']
+            self._bar_pending = True
+        self.latest_prices[event['symbol']] = event['close']
+
+    def _record_bar(self):
+        market_value = 0.0
+        for symbol, quantity in self.current_positions.items():
+            if quantity:
+                market_value += quantity * self.latest_prices[symbol]
+        equity = self.current_cash + market_value
+        self.metrics.update(equity)
+        if self.record_history:
+            self.history.append(
+                datetime=to_nanos(self.current_datetime),
+                cash=self.current_cash,
+                market_value=market_value,
+                equity=equity,
+                positions=self._position_vector[:len(self.symbols)]
+            )
+        self._bar_pending = False
+
+    def finalize(self):
+        """Record the last open timestamp; call once the data is exhausted"""
+        if self._bar_pending:
+            self._record_bar()
+
+    @property
+    def equity_curve(self) -> np.ndarray:
+        """Mark-to-market equity after each timestamp"""
+        self.finalize()
+        return self.history.column('equity')
+
+    @property
+    def all_cash(self) -> np.ndarray:
+        self.finalize()
+        return self.history.column('cash')
+
+    @property
+    def all_positions(self) -> pd.DataFrame:
+        """Per-timestamp positions, one column per symbol"""
+        self.finalize()
+        positions = self.history.column('positions')[:, :len(self.symbols)]
+        index = pd.to_datetime(self.history.column('datetime'))
+        return pd.DataFrame(positions, index=index, columns=self.symbols)
 
     def execute_fill(self, fill: Dict):
-        symbol = fill[\'symbol\']
-        quantity = fill[\'quantity\']
-        direction = fill[\'direction\']
-        fill_price = fill[\'fill_price\']
-        commission = fill[\'commission\']
+        symbol = fill['symbol']
+        quantity = fill['quantity']
+        direction = fill['direction']
+        fill_price = fill['fill_price']
+        commission = fill['commission']
+
+        sign = 1 if direction == 'BUY' else -1
+        signed_quantity = sign * quantity
+        holding = self.current_holdings.get(symbol)
+        old_quantity = holding['quantity'] if holding else 0
+        avg_price = holding['avg_price'] if holding else 0.0
+        new_quantity = old_quantity + signed_quantity
+
+        # Realized P&L on the part of the position this fill closes
+        pnl = 0.0
+        closes_position = old_quantity != 0 and (old_quantity > 0) != (signed_quantity > 0)
+        if closes_position:
+            closed = min(quantity, abs(old_quantity))
+            pnl = closed * (fill_price - avg_price) * (1 if old_quantity > 0 else -1)
 
         # Update holdings
-        if symbol not in self.current_holdings:
-            self.current_holdings[symbol] = {\'quantity\': 0, \'avg_price\': 0}
-            self.all_holdings[symbol] = {\'quantity\': 0, \'avg_price\': 0}
-
-        holding = self.current_holdings[symbol]
-        new_quantity = holding[\'quantity\'] + (1 if direction == \'BUY\' else -1) * quantity
-
         if new_quantity == 0:
-            del self.current_holdings[symbol]
+            self.current_holdings.pop(symbol, None)
+        elif old_quantity == 0 or (new_quantity > 0) != (old_quantity > 0):
+            self.current_holdings[symbol] = {'quantity': new_quantity, 'avg_price': fill_price}
+        elif not closes_position:
+            # Weighted average price when adding to a position
+            holding['avg_price'] = (old_quantity * avg_price + signed_quantity * fill_price) / new_quantity
+            holding['quantity'] = new_quantity
         else:
-            if holding[\'quantity\'] != 0:
-                # Weighted average price
-                total_cost = (holding[\'quantity\'] * holding[\'avg_price\'] 
-                            + quantity * fill_price)
-                holding[\'avg_price\'] = total_cost / new_quantity
-            else:
-                holding[\'avg_price\'] = fill_price
-            holding[\'quantity\'] = new_quantity
+            holding['quantity'] = new_quantity
 
-            self.all_holdings[symbol] = holding.copy()
+        symbol_id = self._symbol_id(symbol)
+        self.current_positions[symbol] = new_quantity
+        self._position_vector[symbol_id] = new_quantity
 
         # Update cash
-        self.current_cash -= quantity * fill_price * (1 if direction == \'BUY\' else -1)
+        self.current_cash -= quantity * fill_price * sign
         self.current_cash -= commission
 
         # Record trade
-        self.trades.append({
-            \'symbol\': symbol,
-            \'quantity\': quantity,
-            \'direction\': direction,
-            \'fill_price\': fill_price,
-            \'commission\': commission,
-            \'pnl\': 0.0  # Updated later
-        })
+        self.trades.append(
+            datetime=to_nanos(fill['datetime']),
+            symbol_id=symbol_id,
+            quantity=quantity,
+            direction=sign,
+            fill_price=fill_price,
+            commission=commission,
+            pnl=pnl,
+            slipped=fill.get('slipped', True)
+        )
+
+        self.total_trades += 1
+        self.total_fees += commission
+        if closes_position:
+            self.metrics.record_trade(pnl)
+
+    @property
+    def stats(self) -> Dict:
+        metrics = self.metrics
+        return {
+            'total_trades': self.total_trades,
+            'wins': metrics.wins,
+            'losses': metrics.losses,
+            'gross_wins': metrics.gross_wins,
+            'gross_losses': metrics.gross_losses,
+            'total_fees': self.total_fees
+        }
+
+    def trades_frame(self) -> pd.DataFrame:
+        """Fills as a DataFrame with symbol names and timestamps"""
+        frame = self.trades.to_frame()
+        frame['datetime'] = pd.to_datetime(frame['datetime'])
+        symbols = np.array(self.symbols + [None], dtype=object)
+        frame.insert(1, 'symbol', symbols[frame.pop('symbol_id').to_numpy()])
+        frame['direction'] = np.where(frame['direction'] > 0, 'BUY', 'SELL')
+        return frame
 
-        self.stats[\'total_trades\'] += 1
-        self.stats[\'total_fees\'] += commission
+    def calculate_performance(self, market_price: Optional[float] = None) -> Dict:
+        """Calculate current portfolio value and unrealized P&L
 
-    def calculate_performance(self, market_price: float) -> Dict:
-        """Calculate current portfolio value and unrealized P&L"""
+        Without market_price each holding is marked at its symbol's latest close.
+        """
         total = self.current_cash
 
         for symbol, holding in self.current_holdings.items():
-            market_value = holding[\'quantity\'] * market_price
-            unrealized_pnl = market_value - (holding[\'quantity\'] * holding[\'avg_price\'])
+            price = self.latest_prices[symbol] if market_price is None else market_price
+            market_value = holding['quantity'] * price
+            unrealized_pnl = market_value - (holding['quantity'] * holding['avg_price'])
             total += market_value
 
         return {
-            \'total\': total,
-            \'cash\': self.current_cash,
-            \'positions_value\': total - self.current_cash,
-            \'unrealized_pnl\': total - self.initial_capital - sum(h[\'quantity\'] * h[\'avg_price\'] for h in self.current_holdings.values())
+            'total': total,
+            'cash': self.current_cash,
+            'positions_value': total - self.current_cash,
+            'unrealized_pnl': total - self.initial_capital - sum(h['quantity'] * h['avg_price'] for h in self.current_holdings.values())
         }
@@ -0,0 +1,154 @@
+"""Binary columnar cache of price CSVs, memory-mapped on load"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+META_FILE = 'meta.json'
+INDEX_FILE = 'datetime.npy'
+
+def default_cache_dir(csv_path: str) -> str:
+    """<csv dir>/.price_cache/<csv file name>/"""
+    directory, name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(directory, '.price_cache', name)
+
+def file_fingerprint(path: str) -> Dict:
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_meta(cache_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(cache_dir, META_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_array(path: str, array: np.ndarray):
+    # Replace rather than overwrite so processes still mapping the old file keep valid pages
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+def _write_meta(cache_dir: str, meta: Dict):
+    # Written last and replaced atomically: a cache without meta is never trusted
+    tmp_path = os.path.join(cache_dir, META_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(cache_dir, META_FILE))
+
+def is_cache_valid(csv_path: str, cache_dir: Optional[str] = None) -> bool:
+    """True if the cache was built from the current contents of csv_path.
+
+    A matching size and mtime is trusted as is. If only the mtime moved
+    (file touched or copied), the content hash decides and the sidecar is
+    refreshed so the next check is cheap again.
+    """
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    meta = _read_meta(cache_dir)
+    if meta is None or meta.get('version') != CACHE_VERSION:
+        return False
+
+    source = file_fingerprint(csv_path)
+    if source == meta['source']:
+        return True
+    if source['size'] != meta['source']['size'] or file_hash(csv_path) != meta['sha256']:
+        return False
+
+    meta['source'] = source
+    _write_meta(cache_dir, meta)
+    return True
+
+def build_cache(csv_path: str, cache_dir: Optional[str] = None) -> str:
+    """Parse csv_path once and write one .npy file per column plus a meta.json sidecar"""
+    source = file_fingerprint(csv_path)
+    df = pd.read_csv(csv_path, parse_dates=["datetime"])
+    df.set_index("datetime", inplace=True)
+    df.sort_index(inplace=True)
+    columns = {name: df[name].to_numpy() for name in df.columns}
+    return write_cache(csv_path, pd.DatetimeIndex(df.index), columns, cache_dir, source)
+
+def write_cache(csv_path: str, index: pd.DatetimeIndex, columns: Dict[str, np.ndarray],
+                cache_dir: Optional[str] = None, source: Optional[Dict] = None) -> str:
+    """Write already-parsed columns as the cache of csv_path, whose contents they must match.
+
+    ``source`` is the CSV's fingerprint when it was read (defaults to now).
+    """
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    source = source or file_fingerprint(csv_path)
+    index = pd.DatetimeIndex(index).as_unit('ns')
+
+    meta_path = os.path.join(cache_dir, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    _save_array(os.path.join(cache_dir, INDEX_FILE), index.asi8)
+    dtypes = {}
+    for name, values in columns.items():
+        column = np.ascontiguousarray(values)
+        _save_array(os.path.join(cache_dir, f'{name}.npy'), column)
+        dtypes[name] = str(column.dtype)
+
+    _write_meta(cache_dir, {
+        'version': CACHE_VERSION,
+        'source': source,
+        'sha256': file_hash(csv_path),
+        'rows': len(index),
+        'tz': str(index.tz) if index.tz is not None else None,
+        'columns': dtypes
+    })
+    logging.info(f"Cached {len(index)} bars from {csv_path} in {cache_dir}")
+    return cache_dir
+
+def load_cache(cache_dir: str, mmap: bool = True) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+    """Load a cache built by build_cache; columns are read-only memory maps when mmap is set"""
+    meta = _read_meta(cache_dir)
+    if meta is None:
+        raise FileNotFoundError(f"No price cache in {cache_dir}")
+    mmap_mode = 'r' if mmap else None
+
+    nanos = np.load(os.path.join(cache_dir, INDEX_FILE), mmap_mode=mmap_mode)
+    index = pd.DatetimeIndex(nanos.view('datetime64[ns]'), name='datetime')
+    if meta['tz'] is not None:
+        index = index.tz_localize('UTC').tz_convert(meta['tz'])
+
+    columns = {}
+    for name in meta['columns']:
+        column = np.load(os.path.join(cache_dir, f'{name}.npy'), mmap_mode=mmap_mode)
+        column.flags.writeable = False
+        columns[name] = column
+    return index, columns
+
+def load_prices(csv_path: str, cache_dir: Optional[str] = None,
+                mmap: bool = True) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+    """Load price columns for csv_path, (re)building the binary cache when it is missing or stale"""
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    if not is_cache_valid(csv_path, cache_dir):
+        build_cache(csv_path, cache_dir)
+    return load_cache(cache_dir, mmap=mmap)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert price CSVs into the binary columnar cache")
+    parser.add_argument('csv_paths', nargs='+')
+    parser.add_argument('--force', action='store_true', help="rebuild even if the cache is current")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    for csv_path in args.csv_paths:
+        if args.force or not is_cache_valid(csv_path):
+            build_cache(csv_path)
+        else:
+            print(f"{csv_path}: cache is current")
@@ -0,0 +1,143 @@
+"""Opt-in per-stage timers and counters for the event-driven engine"""
+import json
+import math
+import time
+from typing import Callable, Dict, List
+
+# Engine stages in hot-path order
+STAGES = ('data_advance', 'strategy', 'order_sizing', 'execution', 'portfolio_update')
+
+class StageProfiler:
+    """Accumulates call counts and wall time per engine stage.
+
+    Nothing in the engine checks for a profiler: when profiling is enabled
+    the engine swaps the relevant bound methods for timed wrappers made by
+    ``instrument``, so a disabled profiler costs nothing at all.
+    """
+    def __init__(self):
+        self.calls = {stage: 0 for stage in STAGES}
+        self.nanos = {stage: 0 for stage in STAGES}
+        self.wall_nanos = 0
+        self._started = None
+
+    def wrap(self, stage: str, fn: Callable) -> Callable:
+        calls, nanos, clock = self.calls, self.nanos, time.perf_counter_ns
+        calls.setdefault(stage, 0)
+        nanos.setdefault(stage, 0)
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                nanos[stage] += clock() - start
+                calls[stage] += 1
+        return timed
+
+    def instrument(self, obj, method: str, stage: str):
+        """Replace obj.method with a timed wrapper (on the instance only)"""
+        setattr(obj, method, self.wrap(stage, getattr(obj, method)))
+
+    def start(self):
+        self._started = time.perf_counter_ns()
+
+    def stop(self):
+        if self._started is not None:
+            self.wall_nanos += time.perf_counter_ns() - self._started
+            self._started = None
+
+    def report(self) -> Dict:
+        stages = {}
+        for stage, calls in self.calls.items():
+            total = self.nanos[stage]
+            stages[stage] = {
+                'calls': calls,
+                'total_s': total / 1e9,
+                'mean_us': total / calls / 1e3 if calls else 0.0
+            }
+        return {
+            'wall_s': self.wall_nanos / 1e9,
+            # Event dispatch and everything not attributed to a stage
+            'other_s': max(self.wall_nanos - sum(self.nanos.values()), 0) / 1e9,
+            'stages': stages
+        }
+
+    def to_folded(self) -> str:
+        """Folded stacks (one 'frame;frame value' line per stage, in microseconds) for flamegraph.pl or speedscope"""
+        lines = [f"run_backtest;{stage} {nanos // 1000}" for stage, nanos in self.nanos.items() if nanos]
+        other = self.wall_nanos - sum(self.nanos.values())
+        if other > 0:
+            lines.append(f"run_backtest;other {other // 1000}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str):
+        """Write the report as JSON, or as folded stacks if path ends in .folded"""
+        with open(path, 'w') as f:
+            if path.endswith('.folded'):
+                f.write(self.to_folded())
+            else:
+                json.dump(self.report(), f, indent=2)
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram: O(1) to record, no samples kept.
+
+    Buckets are ``BUCKETS_PER_DECADE`` per power of ten from 1 us to 100 s
+    (plus one below and one above), so a percentile is the upper edge of
+    its bucket, at most about 26% above the true value.
+    """
+    BUCKETS_PER_DECADE = 10
+    MIN_NS = 1_000
+    DECADES = 8
+
+    def __init__(self):
+        self.counts = [0] * (self.DECADES * self.BUCKETS_PER_DECADE + 2)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, nanos: int):
+        self.count += 1
+        self.total_ns += nanos
+        if nanos > self.max_ns:
+            self.max_ns = nanos
+        if nanos < self.MIN_NS:
+            bucket = 0
+        else:
+            bucket = min(int(math.log10(nanos / self.MIN_NS) * self.BUCKETS_PER_DECADE) + 1,
+                         len(self.counts) - 1)
+        self.counts[bucket] += 1
+
+    def _upper_ns(self, bucket: int) -> float:
+        return self.MIN_NS * 10 ** (bucket / self.BUCKETS_PER_DECADE)
+
+    def percentile(self, q: float) -> float:
+        """Latency in microseconds that q% of the samples do not exceed"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        last = len(self.counts) - 1
+        for bucket, count in enumerate(self.counts[:last]):
+            seen += count
+            if seen >= rank:
+                return min(self._upper_ns(bucket), self.max_ns) / 1e3
+        # The overflow bucket has no upper edge
+        return self.max_ns / 1e3
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_us': self.total_ns / self.count / 1e3 if self.count else 0.0,
+            'p50_us': self.percentile(50),
+            'p90_us': self.percentile(90),
+            'p99_us': self.percentile(99),
+            'max_us': self.max_ns / 1e3
+        }
+
+    def render(self, width: int = 40) -> List[str]:
+        """One text line per non-empty bucket: upper edge, bar, count"""
+        peak = max(self.counts)
+        last = len(self.counts) - 1
+        return [f"{'> ' if bucket == last else '<='} {self._upper_ns(min(bucket, last - 1)) / 1e3:>11,.1f} us "
+                f"{'#' * max(1, round(width * count / peak)):<{width}} {count}"
+                for bucket, count in enumerate(self.counts) if count]
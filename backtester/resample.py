@@ -0,0 +1,220 @@
+"""Multi-timeframe OHLCV aggregates built once per timeframe, with look-ahead-safe forming bars"""
+import os
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from backtester.price_cache import default_cache_dir, file_fingerprint
+
+# How each column folds into a coarser bar; anything else keeps its last value
+AGGREGATIONS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+def timeframe_nanos(timeframe: str) -> int:
+    """'15min', '1h', '1D', ... as a fixed step in nanoseconds"""
+    try:
+        step = pd.Timedelta(timeframe).value
+    except ValueError:
+        step = 0
+    if not step > 0:
+        raise ValueError(f"Unsupported timeframe '{timeframe}' (expected a fixed duration like '15min', '1h' or '1D')")
+    return step
+
+def aggregate(starts: np.ndarray, columns: Dict[str, np.ndarray], step: int
+              ) -> Tuple[np.ndarray, Dict[str, np.ndarray], np.ndarray]:
+    """Fold time-sorted rows (labelled by int64 ns ``starts``) into ``step``-ns buckets.
+
+    Buckets are aligned to the epoch (midnight for daily steps) and labelled
+    by their start. Returns (bucket starts, aggregated columns, index of the
+    first input row of each bucket). Empty buckets are skipped.
+    """
+    buckets = starts // step * step
+    first = np.flatnonzero(np.diff(buckets, prepend=buckets[:1] - 1)) if len(buckets) else np.empty(0, dtype=np.int64)
+    last = np.append(first[1:], len(buckets)) - 1
+    aggregated = {}
+    for name, column in columns.items():
+        how = AGGREGATIONS.get(name, 'last')
+        if len(first) == 0:
+            aggregated[name] = column[:0].copy()
+        elif how == 'first':
+            aggregated[name] = column[first]
+        elif how == 'last':
+            aggregated[name] = column[last]
+        elif how == 'max':
+            aggregated[name] = np.maximum.reduceat(column, first)
+        elif how == 'min':
+            aggregated[name] = np.minimum.reduceat(column, first)
+        else:
+            aggregated[name] = np.add.reduceat(column, first)
+    return buckets[first], aggregated, first
+
+class TimeframeLevel:
+    """One timeframe's completed-bar arrays plus the mapping back to source bars"""
+    def __init__(self, timeframe: str, starts: np.ndarray, columns: Dict[str, np.ndarray],
+                 first: np.ndarray, n_source: int, tz=None):
+        self.timeframe = timeframe
+        self.tz = tz
+        self.step = timeframe_nanos(timeframe)
+        self.starts = starts
+        self.columns = columns
+        self.first = first  # first source bar of each bucket
+        # Bucket of every source bar
+        self.bucket_of = np.repeat(np.arange(len(first)), np.diff(np.append(first, n_source)))
+        for array in (starts, first, self.bucket_of, *columns.values()):
+            array.flags.writeable = False
+        self._index = None
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        if self._index is None:
+            index = pd.DatetimeIndex(self.starts.view('datetime64[ns]'), name='datetime')
+            self._index = index.tz_localize(self.tz) if self.tz is not None else index
+        return self._index
+
+class TimeframePyramid:
+    """Aggregation pyramid over one symbol's source bars.
+
+    Each level is built from the coarsest already-built level whose step
+    divides it (15min from 5min, 1h from 15min, 1D from 1h, ...), so
+    building a whole pyramid touches the source bars only once. With a
+    ``csv_path`` the levels are stored next to the price cache and reused
+    until the CSV changes.
+    """
+    def __init__(self, index: pd.DatetimeIndex, columns: Dict[str, np.ndarray],
+                 csv_path: Optional[str] = None, use_cache: bool = True):
+        # Buckets follow local wall time, so daily bars start at local midnight
+        self.tz = index.tz
+        self.source_starts = np.asarray((index.tz_localize(None) if index.tz is not None else index).as_unit('ns').asi8)
+        self.source_columns = columns
+        self.n_source = len(self.source_starts)
+        self.csv_path = csv_path if use_cache else None
+        self.levels = {}  # timeframe: TimeframeLevel
+
+    def _cache_path(self, timeframe: str) -> str:
+        return os.path.join(default_cache_dir(self.csv_path), 'resampled', f'{timeframe}.npz')
+
+    def _load_level(self, timeframe: str) -> Optional[TimeframeLevel]:
+        path = self._cache_path(timeframe)
+        fingerprint = file_fingerprint(self.csv_path)
+        try:
+            with np.load(path) as cached:
+                if (int(cached['source_size']) != fingerprint['size']
+                        or int(cached['source_mtime_ns']) != fingerprint['mtime_ns']):
+                    return None
+                columns = {name: cached[f'column_{name}'] for name in self.source_columns}
+                return TimeframeLevel(timeframe, cached['starts'], columns, cached['first'], self.n_source, self.tz)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save_level(self, level: TimeframeLevel):
+        path = self._cache_path(level.timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fingerprint = file_fingerprint(self.csv_path)
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, starts=level.starts, first=level.first,
+                 source_size=fingerprint['size'], source_mtime_ns=fingerprint['mtime_ns'],
+                 **{f'column_{name}': column for name, column in level.columns.items()})
+        os.replace(tmp_path, path)
+
+    def level(self, timeframe: str) -> TimeframeLevel:
+        level = self.levels.get(timeframe)
+        if level is not None:
+            return level
+        if self.csv_path is not None:
+            level = self._load_level(timeframe)
+        if level is None:
+            level = self._build_level(timeframe)
+            if self.csv_path is not None:
+                self._save_level(level)
+        self.levels[timeframe] = level
+        return level
+
+    def _build_level(self, timeframe: str) -> TimeframeLevel:
+        step = timeframe_nanos(timeframe)
+        parents = [level for level in self.levels.values() if level.step < step and step % level.step == 0]
+        if parents:
+            parent = max(parents, key=lambda level: level.step)
+            starts, columns, first = aggregate(parent.starts, parent.columns, step)
+            first = parent.first[first]
+        else:
+            starts, columns, first = aggregate(self.source_starts, self.source_columns, step)
+        return TimeframeLevel(timeframe, starts, columns, first, self.n_source, self.tz)
+
+    def build(self, *timeframes: str):
+        """Build (or load) several levels, finest first so coarser ones reuse them"""
+        for timeframe in sorted(timeframes, key=timeframe_nanos):
+            self.level(timeframe)
+
+class TimeframeView:
+    """Look-ahead-safe window over one level as the source cursor advances.
+
+    Buckets before the current bar's bucket are complete. The current
+    bucket is returned as a forming bar built only from source bars up to
+    the cursor. The forming bar is updated from the bars added since the
+    last call rather than recomputed.
+    """
+    def __init__(self, level: TimeframeLevel, source_columns: Dict[str, np.ndarray]):
+        self.level = level
+        self.source_columns = source_columns
+        self._bucket = -1
+        self._position = -1  # last source bar folded into the forming bar
+        self._forming = {}
+
+    def forming_bar(self, position: int) -> Dict:
+        bucket = self.level.bucket_of[position]
+        if bucket != self._bucket or position < self._position:
+            # New bucket (or a rewound cursor): start over from its first bar
+            self._bucket = bucket
+            self._position = self.level.first[bucket] - 1
+            self._forming = {}
+        if position > self._position:
+            lo, hi = self._position + 1, position + 1
+            forming = self._forming
+            for name, column in self.source_columns.items():
+                how = AGGREGATIONS.get(name, 'last')
+                values = column[lo:hi]
+                if how == 'first':
+                    forming.setdefault(name, values[0])
+                elif how == 'last':
+                    forming[name] = values[-1]
+                elif how == 'max':
+                    forming[name] = max(forming[name], values.max()) if name in forming else values.max()
+                elif how == 'min':
+                    forming[name] = min(forming[name], values.min()) if name in forming else values.min()
+                else:
+                    forming[name] = forming.get(name, 0) + values.sum()
+            self._position = position
+        return self._forming
+
+    def window(self, position: int, num_bars: int) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+        """(bucket start times, columns) of the last num_bars bars, the forming one last"""
+        if position < 0:
+            return self.level.index[:0], {name: column[:0] for name, column in self.level.columns.items()}
+        bucket = self.level.bucket_of[position]
+        lo = max(0, bucket - num_bars + 1)
+        forming = self.forming_bar(position)
+        columns = {}
+        for name, column in self.level.columns.items():
+            window = np.empty(bucket - lo + 1, dtype=column.dtype)
+            window[:-1] = column[lo:bucket]
+            window[-1] = forming[name]
+            columns[name] = window
+        return self.level.index[lo:bucket + 1], columns
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from backtester.price_cache import load_prices
+
+    parser = argparse.ArgumentParser(description="Prebuild the higher-timeframe cache for a price file")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--csv-path', default=None, help="defaults to data.csv_path in the config")
+    parser.add_argument('--timeframes', nargs='+', default=['15min', '1h', '4h', '1D'])
+    args = parser.parse_args()
+
+    csv_path = args.csv_path
+    if csv_path is None:
+        with open(args.config, 'r') as f:
+            csv_path = json.load(f)['data']['csv_path']
+    pyramid = TimeframePyramid(*load_prices(csv_path), csv_path=csv_path)
+    pyramid.build(*args.timeframes)
+    for timeframe in args.timeframes:
+        print(f"{timeframe}: {len(pyramid.level(timeframe).starts)} bars")
@@ -0,0 +1,216 @@
+"""Content-addressed cache of backtest results: in-memory LRU over a size-bounded disk tier"""
+import argparse
+import functools
+import glob
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import numpy as np
+from backtester.price_cache import file_fingerprint
+
+DEFAULT_CACHE_DIR = '.result_cache'
+CACHE_VERSION = 1
+
+# Settings that change how a run is executed but not what it returns
+_IGNORED = {
+    'data': ('use_cache', 'streaming', 'chunk_size', 'lookback'),
+    'backtest': ('profile', 'result_cache', 'log_fills', 'retain_events', 'journal', 'journal_buffer_size'),
+}
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@functools.lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the engine and strategy sources; any edit invalidates cached results"""
+    digest = hashlib.sha256()
+    for package in ('backtester', 'strategies'):
+        for path in sorted(glob.glob(os.path.join(_PROJECT_ROOT, package, '*.py'))):
+            digest.update(os.path.basename(path).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def normalize_config(config: Dict) -> Dict:
+    """Copy of config without the settings listed in _IGNORED"""
+    normalized = {}
+    for section, values in config.items():
+        ignored = _IGNORED.get(section, ())
+        normalized[section] = ({k: v for k, v in values.items() if k not in ignored}
+                               if isinstance(values, dict) else values)
+    return normalized
+
+def data_fingerprint(data_config: Dict) -> Dict:
+    """Size and mtime of every price file a data config reads"""
+    paths = data_config['universe'] if 'universe' in data_config else {data_config['symbol']: data_config['csv_path']}
+    return {symbol: {'path': os.path.abspath(path), **file_fingerprint(path)}
+            for symbol, path in paths.items()}
+
+def columns_fingerprint(columns: Dict[str, np.ndarray]) -> str:
+    """Content hash of in-memory price columns that did not come from a file"""
+    digest = hashlib.sha256()
+    for name in sorted(columns):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(columns[name]).tobytes())
+    return digest.hexdigest()
+
+def make_key(kind: str, payload: Any, data: Any) -> str:
+    """sha256 over (kind, payload, data fingerprint, code version)"""
+    blob = json.dumps({
+        'version': CACHE_VERSION,
+        'kind': kind,
+        'payload': payload,
+        'data': data,
+        'code': code_version()
+    }, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+def backtest_key(config: Dict, engine: str = 'event') -> str:
+    """Key of one backtest run, built only from the settings the run reads.
+
+    That is the data and backtest sections plus the parameters of the
+    strategies it trades, so editing e.g. walk_forward grids or paper
+    settings keeps cached backtests valid.
+    """
+    backtest_config = config['backtest']
+    # Same default as engine.strategy_names (not imported: the engine imports this module)
+    names = backtest_config.get('strategies') or ['ma']
+    payload = normalize_config({
+        'data': config['data'],
+        'backtest': backtest_config,
+        'strategies': {name: config['strategies'][name] for name in names}
+    })
+    return make_key(f'backtest:{engine}', payload, data_fingerprint(config['data']))
+
+class ResultCache:
+    """Two-tier result cache keyed by content hashes.
+
+    The memory tier is an LRU of at most ``max_entries`` objects. The disk
+    tier stores one pickle per key. When it grows past ``max_disk_bytes``,
+    the least recently used files (by mtime, which is bumped on every hit)
+    are removed. Cached values are shared, so treat them as read-only.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = 128,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()  # memory tier is shared by background runs
+        self._disk_bytes = None  # computed on first write
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.pkl')
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any):
+        self._remember(key, value)
+        if self.max_disk_bytes <= 0:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+        else:
+            self._disk_bytes += os.path.getsize(path)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    def _disk_entries(self):
+        for path in glob.glob(os.path.join(self.cache_dir, '*', '*.pkl')):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            yield path, stat.st_size, stat.st_mtime_ns
+
+    def _evict(self):
+        """Drop least recently used files until the disk tier is at 80% of its budget"""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 0.8
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+    def clear(self):
+        self._memory.clear()
+        for path, _, _ in list(self._disk_entries()):
+            os.remove(path)
+        self._disk_bytes = 0
+
+    def info(self) -> Dict:
+        entries = list(self._disk_entries())
+        return {
+            'memory_entries': len(self._memory),
+            'disk_entries': len(entries),
+            'disk_bytes': sum(size for _, size, _ in entries),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+_default_cache = None
+
+def default_cache() -> ResultCache:
+    """Process-wide cache in ./.result_cache (RESULT_CACHE_DIR overrides the location)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache(os.environ.get('RESULT_CACHE_DIR', DEFAULT_CACHE_DIR))
+    return _default_cache
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or clear the backtest result cache")
+    parser.add_argument('command', choices=['info', 'clear'])
+    parser.add_argument('--cache-dir', default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    cache = ResultCache(args.cache_dir) if args.cache_dir else default_cache()
+    if args.command == 'clear':
+        cache.clear()
+        logging.info(f"Cleared {cache.cache_dir}")
+    else:
+        print(json.dumps(cache.info(), indent=2))
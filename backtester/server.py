@@ -0,0 +1,273 @@
+"""Long-lived local backtest server with resident price data.
+
+    python -m backtester.server --port 8765 --workers 4 --max-queued 256
+
+Endpoints (JSON over localhost HTTP):
+
+    GET    /health      worker, queue and job counts
+    POST   /jobs        {"config": {...}, "wait": false, "include_equity": false}
+    GET    /jobs/<id>   status, and results once done
+    DELETE /jobs/<id>   cancel a job that has not started
+
+Jobs run in a process pool. Each worker imports the engine once and keeps
+every price file it has seen loaded (reloaded when the file changes), so a
+job pays for the backtest only. Submissions beyond ``max_queued``
+unfinished jobs are rejected with 429. File paths in a config must be
+absolute (backtester.client resolves them), since the server's working
+directory is not the client's.
+"""
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from backtester.client import absolute_paths, relative_paths
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# --- Worker side ---
+
+_store = None
+
+def _init_worker(preload: Sequence[Dict] = ()):
+    """Import the engine and load the ``preload`` data sections' prices, once per worker process"""
+    global _store
+    from backtester.background import PriceStore
+    import backtester.engine  # imported here so the first job does not pay for it
+    logging.getLogger().setLevel(logging.WARNING)
+    _store = PriceStore()
+    for data_config in preload:
+        try:
+            _store.data_handler(data_config)
+        except (OSError, ValueError, KeyError) as exc:
+            logging.warning(f"Could not preload {data_config}: {exc!r}")
+
+def run_job(config: Dict, include_equity: bool = False) -> Dict:
+    """Run one config.json-shaped job and return a JSON-ready summary"""
+    from backtester.engine import Backtester
+    from backtester.performance import create_tearsheet
+    from backtester.vectorized import VectorizedBacktester
+
+    start = time.perf_counter()
+    data_handler = _store.data_handler(config['data']) if _store is not None else None
+    if config['backtest'].get('engine', 'event') == 'vectorized':
+        results = VectorizedBacktester(config, data_handler).run_backtest()
+    else:
+        results = Backtester(config, data_handler).run_backtest()
+
+    equity_curve = results['equity_curve']
+    tearsheet = (create_tearsheet(results['stats'], equity_curve)
+                 if len(equity_curve) > 1 else results.get('metrics'))
+    summary = {
+        'signals': results['signals'],
+        'fills': results['fills'],
+        'stats': results['stats'],
+        'tearsheet': tearsheet,
+        'elapsed_s': time.perf_counter() - start
+    }
+    if 'strategies' in results:
+        summary['strategies'] = {
+            name: {key: result[key] for key in ('initial_capital', 'signals', 'fills', 'stats', 'metrics')}
+            for name, result in results['strategies'].items()
+        }
+    if include_equity:
+        summary['equity_curve'] = equity_curve
+    return summary
+
+def _to_json(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+# --- Server side ---
+
+class JobQueue:
+    """Submits jobs to the worker pool and tracks them by id.
+
+    The pool runs at most ``workers`` jobs at once and queues the rest.
+    The most recent ``keep_finished`` finished jobs stay queryable. Every
+    worker process loads the prices of the ``preload`` data sections when
+    it starts, before it takes its first job.
+    """
+    def __init__(self, workers: int, max_queued: int = 256, keep_finished: int = 1000,
+                 preload: Sequence[Dict] = ()):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(list(preload),))
+        self._jobs = OrderedDict()  # id: {'future', 'submitted', 'include_equity'}
+        self._lock = threading.Lock()
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            futures = [job['future'] for job in self._jobs.values()]
+        running = sum(f.running() for f in futures)
+        unfinished = sum(not f.done() for f in futures)
+        return {'workers': self.workers, 'running': running, 'queued': unfinished - running,
+                'jobs': len(futures)}
+
+    def submit(self, config: Dict, include_equity: bool = False) -> Optional[str]:
+        """Queue a job and return its id, or None when the queue is full"""
+        with self._lock:
+            if sum(not job['future'].done() for job in self._jobs.values()) >= self.max_queued:
+                return None
+            job_id = uuid.uuid4().hex[:12]
+            self._jobs[job_id] = {
+                'future': self._pool.submit(run_job, config, include_equity),
+                'submitted': time.time()
+            }
+            self._trim()
+        return job_id
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job['future'].done()]
+        for job_id in finished[:max(len(finished) - self.keep_finished, 0)]:
+            del self._jobs[job_id]
+
+    def status(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Job state, waiting up to ``timeout`` seconds for it to finish"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        future = job['future']
+        if timeout:
+            try:
+                future.exception(timeout)
+            except (TimeoutError, CancelledError):
+                pass
+
+        status = {'id': job_id, 'submitted': job['submitted']}
+        if future.cancelled():
+            status['status'] = 'cancelled'
+        elif not future.done():
+            status['status'] = 'running' if future.running() else 'queued'
+        elif future.exception() is not None:
+            status.update(status='failed', error=f"{type(future.exception()).__name__}: {future.exception()}")
+        else:
+            status.update(status='done', results=future.result())
+        return status
+
+    def cancel(self, job_id: str) -> Optional[bool]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return None if job is None else job['future'].cancel()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+class BacktestRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'BacktestServer/1'
+
+    @property
+    def jobs(self) -> JobQueue:
+        return self.server.jobs
+
+    def _send(self, code: int, payload: Dict):
+        body = json.dumps(payload, default=_to_json).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job_id(self) -> Optional[str]:
+        parts = self.path.strip('/').split('/')
+        return parts[1] if len(parts) == 2 and parts[0] == 'jobs' else None
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok', **self.jobs.counts()})
+            return
+        job_id = self._job_id()
+        status = self.jobs.status(job_id) if job_id else None
+        if status is None:
+            self._send(404, {'error': 'not found'})
+        else:
+            self._send(200, status)
+
+    def do_POST(self):
+        if self.path != '/jobs':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            config = request['config']
+            config['data'], config['backtest'], config['strategies']
+        except (ValueError, KeyError, TypeError) as exc:
+            self._send(400, {'error': f"expected {{'config': config.json contents}}: {exc!r}"})
+            return
+        relative = relative_paths(config)
+        if relative:
+            self._send(400, {'error': f"paths must be absolute, the server does not share the "
+                                      f"client's working directory: {relative}"})
+            return
+
+        job_id = self.jobs.submit(config, bool(request.get('include_equity', False)))
+        if job_id is None:
+            self._send(429, {'error': 'queue full', **self.jobs.counts()})
+            return
+        if request.get('wait'):
+            self._send(200, self.jobs.status(job_id, timeout=float(request.get('timeout', 3600))))
+        else:
+            self._send(202, {'id': job_id, 'status': 'queued'})
+
+    def do_DELETE(self):
+        job_id = self._job_id()
+        cancelled = self.jobs.cancel(job_id) if job_id else None
+        if cancelled is None:
+            self._send(404, {'error': 'not found'})
+        else:
+            self._send(200, {'id': job_id, 'cancelled': cancelled})
+
+    def log_message(self, format, *args):
+        logging.debug(format, *args)
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None,
+          max_queued: int = 256, preload: Sequence[Dict] = ()) -> Tuple[ThreadingHTTPServer, JobQueue]:
+    """Start the HTTP server on a background thread; returns (server, jobs)"""
+    jobs = JobQueue(workers or os.cpu_count() or 1, max_queued, preload=preload)
+    server = ThreadingHTTPServer((host, port), BacktestRequestHandler)
+    server.daemon_threads = True
+    server.jobs = jobs
+    threading.Thread(target=server.serve_forever, name='backtest-server', daemon=True).start()
+    return server, jobs
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-queued', type=int, default=256)
+    parser.add_argument('--preload', nargs='*', default=['config.json'], metavar='CONFIG',
+                        help="warm every worker with the price files of these configs")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    # Absolute like the paths clients send, so jobs hit the preloaded prices
+    preload = []
+    for path in args.preload:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                preload.append(absolute_paths(json.load(f))['data'])
+    server, jobs = serve(args.host, args.port, args.workers, args.max_queued, preload)
+    logging.info(f"Backtest server on http://{args.host}:{args.port} with {jobs.workers} workers")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        jobs.shutdown()
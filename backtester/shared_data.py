@@ -0,0 +1,47 @@
+"""Price columns in POSIX shared memory for process pools"""
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+import numpy as np
+
+class SharedPriceArrays:
+    """Owns one shared-memory block per price column.
+
+    The parent creates it once from loaded columns and passes ``spec`` (a
+    small picklable dict) to workers, which call ``attach`` to get
+    read-only NumPy views over the same pages without copying or re-reading
+    any files.
+    """
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self._blocks = {}
+        self.spec = {}
+        for name, column in columns.items():
+            column = np.ascontiguousarray(column)
+            block = shared_memory.SharedMemory(create=True, size=max(column.nbytes, 1))
+            np.ndarray(column.shape, dtype=column.dtype, buffer=block.buf)[:] = column
+            self._blocks[name] = block
+            self.spec[name] = (block.name, column.shape, column.dtype.str)
+
+    @staticmethod
+    def attach(spec: Dict[str, Tuple]) -> Tuple[Dict[str, np.ndarray], list]:
+        """Map the blocks described by spec; keep the returned handles alive while using the arrays"""
+        columns, handles = {}, []
+        for name, (block_name, shape, dtype) in spec.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            column = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            column.flags.writeable = False
+            columns[name] = column
+            handles.append(block)
+        return columns, handles
+
+    def close(self):
+        """Release and unlink the blocks; call once in the owning process"""
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks = {}
+
+    def __enter__(self) -> 'SharedPriceArrays':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
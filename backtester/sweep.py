@@ -0,0 +1,196 @@
+"""Parallel hyperparameter sweeps over shared-memory price data"""
+import argparse
+import itertools
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from backtester.data_handler import DataHandler
+from backtester.execution import ExecutionHandler
+from backtester.performance import create_tearsheet
+from backtester.result_cache import (columns_fingerprint, data_fingerprint, default_cache,
+                                     make_key, normalize_config)
+from backtester.shared_data import SharedPriceArrays
+from backtester.vectorized import simulate
+from strategies.factory import build_strategy
+
+# Parameter sets per worker task; bounds the stacked equity curves held at once
+BATCH_SIZE = 64
+
+def parameter_grid(grid: Dict[str, Sequence]) -> List[Dict]:
+    """Cartesian product of {param: values} as a list of {param: value} dicts"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+def _is_valid(strategy_name: str, params: Dict) -> bool:
+    if strategy_name == 'ma':
+        return params['short_window'] < params['long_window']
+    if strategy_name == 'rsi':
+        return params['oversold'] < params['overbought']
+    return True
+
+def evaluate_batch(columns: Dict[str, np.ndarray], strategy_name: str, param_sets: List[Dict],
+                   backtest_config: Dict, symbol: str = 'SWEEP') -> List[Dict]:
+    """Vectorized backtests of several parameter sets, scored with one batched tearsheet"""
+    execution_handler = ExecutionHandler(
+        backtest_config['slippage_bps'],
+        backtest_config['commission_per_trade']
+    )
+    results = [
+        simulate(build_strategy(strategy_name, params, symbol), columns, execution_handler,
+                 backtest_config['initial_capital'])
+        for params in param_sets
+    ]
+    equity = np.stack([result['equity_curve'] for result in results])
+    tearsheet = create_tearsheet([result['stats'] for result in results], equity)
+    drawdown_pct = tearsheet['max_drawdown']['max_drawdown_pct']
+
+    return [
+        {
+            **params,
+            'sharpe_ratio': float(tearsheet['sharpe_ratio'][i]),
+            'max_drawdown_pct': float(drawdown_pct[i]),
+            'total_return': float(tearsheet['total_return'][i]),
+            'num_trades': int(tearsheet['num_trades'][i]),
+            'win_rate': float(tearsheet['win_rate'][i]),
+            'final_equity': float(equity[i, -1])
+        }
+        for i, params in enumerate(param_sets)
+    ]
+
+def evaluate(columns: Dict[str, np.ndarray], strategy_name: str, params: Dict,
+             backtest_config: Dict, symbol: str = 'SWEEP') -> Dict:
+    """Vectorized backtest of one parameter set, flattened into a results-table row"""
+    return evaluate_batch(columns, strategy_name, [params], backtest_config, symbol)[0]
+
+# Per-process state set up once by the pool initializer
+_worker = {}
+
+def _init_worker(spec: Dict, strategy_name: str, backtest_config: Dict, symbol: str):
+    columns, handles = SharedPriceArrays.attach(spec)
+    _worker.update(
+        columns=columns,
+        handles=handles,
+        strategy_name=strategy_name,
+        backtest_config=backtest_config,
+        symbol=symbol
+    )
+
+def _evaluate_in_worker(param_sets: List[Dict]) -> List[Dict]:
+    return evaluate_batch(_worker['columns'], _worker['strategy_name'], param_sets,
+                          _worker['backtest_config'], _worker['symbol'])
+
+def run_sweep(config: Dict, strategy_name: str, grid: Dict[str, Sequence],
+              workers: Optional[int] = None,
+              columns: Optional[Dict[str, np.ndarray]] = None) -> pd.DataFrame:
+    """Evaluate every grid point across a process pool and return one row per parameter set.
+
+    Parameters missing from the grid come from config['strategies'][strategy_name].
+    Prices are loaded once (or taken from ``columns``) and shared with
+    workers through shared memory. Rows already in the result cache are not
+    recomputed.
+    """
+    data_config = config['data']
+    backtest_config = config['backtest']
+    data = columns_fingerprint(columns) if columns is not None else data_fingerprint(data_config)
+
+    base_params = config['strategies'].get(strategy_name, {})
+    param_sets = [
+        {**base_params, **params}
+        for params in parameter_grid(grid)
+        if _is_valid(strategy_name, {**base_params, **params})
+    ]
+    cache = default_cache() if backtest_config.get('result_cache', True) else None
+    cached_rows = {}
+    if cache is not None:
+        settings = normalize_config({'backtest': backtest_config})['backtest']
+        keys = [make_key(f'sweep:{strategy_name}', {'params': p, 'backtest': settings}, data)
+                for p in param_sets]
+        for i, key in enumerate(keys):
+            row = cache.get(key)
+            if row is not None:
+                cached_rows[i] = row
+    todo = [p for i, p in enumerate(param_sets) if i not in cached_rows]
+
+    workers = workers or os.cpu_count() or 1
+    symbol = data_config.get('symbol', 'SWEEP')
+    logging.info(f"Sweeping {len(todo)} {strategy_name} parameter sets on {workers} workers "
+                 f"({len(cached_rows)} cached)")
+    if todo and columns is None:
+        columns = DataHandler(
+            data_config['csv_path'],
+            data_config['symbol'],
+            data_config.get('use_cache', True)
+        ).columns
+    rows = iter(_evaluate_all(columns, strategy_name, todo, backtest_config, symbol, workers))
+
+    results = []
+    for i in range(len(param_sets)):
+        if i in cached_rows:
+            results.append(cached_rows[i])
+        else:
+            row = next(rows)
+            if cache is not None:
+                cache.put(keys[i], row)
+            results.append(row)
+    return pd.DataFrame(results)
+
+def _evaluate_all(columns: Dict[str, np.ndarray], strategy_name: str, param_sets: List[Dict],
+                  backtest_config: Dict, symbol: str, workers: int) -> List[Dict]:
+    if not param_sets:
+        return []
+    # Each task scores a batch of parameter sets with one batched tearsheet
+    batch_size = max(1, min(BATCH_SIZE, len(param_sets) // (workers * 4)))
+    batches = [param_sets[i:i + batch_size] for i in range(0, len(param_sets), batch_size)]
+
+    if workers == 1 or len(batches) <= 1:
+        return [row for batch in batches
+                for row in evaluate_batch(columns, strategy_name, batch, backtest_config, symbol)]
+
+    with SharedPriceArrays(columns) as shared:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.spec, strategy_name, backtest_config, symbol)
+        ) as pool:
+            return [row for batch in pool.map(_evaluate_in_worker, batches) for row in batch]
+
+def parse_values(text: str) -> List:
+    """'5,10,20' -> [5, 10, 20]; '20:100:10' -> [20, 30, ..., 90] (stop exclusive)"""
+    def number(token):
+        value = float(token)
+        return int(value) if value.is_integer() and '.' not in token else value
+
+    if ':' in text:
+        start, stop, step = (number(t) for t in text.split(':'))
+        return [number(str(v)) if isinstance(step, int) else float(v)
+                for v in np.arange(start, stop, step)]
+    return [number(t) for t in text.split(',')]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--strategy', choices=['ma', 'rsi', 'volume'], default='ma')
+    parser.add_argument('--grid', nargs='+', required=True, metavar='PARAM=VALUES',
+                        help="e.g. short_window=5,10,20 long_window=20:100:10")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=None, help="write the results table to this CSV")
+    parser.add_argument('--sort-by', default='sharpe_ratio')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    grid = {}
+    for item in args.grid:
+        name, values = item.split('=', 1)
+        grid[name] = parse_values(values)
+
+    results = run_sweep(config, args.strategy, grid, args.workers)
+    results = results.sort_values(args.sort_by, ascending=False)
+    if args.output:
+        results.to_csv(args.output, index=False)
+    print(results.head(20).to_string(index=False))
@@ -0,0 +1,204 @@
+"""Vectorized whole-array backtest engine"""
+import logging
+from typing import Dict
+import numpy as np
+import pandas as pd
+from backtester.data_handler import DataHandler
+from backtester.execution import ExecutionHandler
+from strategies.factory import build_strategy
+
+def bounded_positions(signals: np.ndarray, low: int, high: int) -> np.ndarray:
+    """Position after each bar when every signal moves it one unit within [low, high].
+
+    Each bar is a small state-transition table; the running composition of
+    those tables is built with a log2(n)-step prefix scan, so the
+    path-dependent position guards of the strategies need no Python loop.
+    """
+    states = np.arange(low, high + 1, dtype=np.int8)
+    table = (np.clip(states[None, :] + signals[:, None], low, high) - low).astype(np.int8)
+    shift = 1
+    while shift < len(table):
+        # table[i] <- table[i] o table[i - shift]
+        table[shift:] = np.take_along_axis(table[shift:], table[:-shift], axis=1)
+        shift *= 2
+    start = min(max(0, low), high) - low
+    return table[:, start].astype(np.int64) + low
+
+class VectorizedBacktester:
+    """Runs the same strategy/execution/portfolio model as Backtester over whole arrays"""
+
+    def __init__(self, config, data_handler=None):
+        self.config = config
+        # A preloaded handler (e.g. DataHandler.from_arrays) skips loading from data config
+        self.data_handler = data_handler
+        self.strategy = None
+        self.execution_handler = None
+        self.fills = None
+        self.equity_curve = None
+
+    def _initialize_components(self):
+        data_config = self.config['data']
+        backtest_config = self.config['backtest']
+        if 'universe' in data_config:
+            raise ValueError("The vectorized engine runs a single symbol; use Backtester for a universe")
+
+        if self.data_handler is None:
+            self.data_handler = DataHandler(
+                data_config['csv_path'],
+                data_config['symbol'],
+                data_config.get('use_cache', True)
+            )
+
+        names = backtest_config.get('strategies') or ['ma']
+        if len(names) > 1:
+            raise ValueError("The vectorized engine runs one strategy; use Backtester for several")
+        orders = backtest_config.get('orders') or {}
+        if (str(orders.get('type', 'market')).upper() != 'MARKET' or orders.get('take_profit_bps') is not None
+                or orders.get('stop_loss_bps') is not None):
+            raise ValueError("The vectorized engine fills market orders only; use Backtester for resting orders")
+        self.strategy = build_strategy(names[0], self.config['strategies'][names[0]], data_config['symbol'])
+
+        self.execution_handler = ExecutionHandler(
+            backtest_config['slippage_bps'],
+            backtest_config['commission_per_trade']
+        )
+
+    def run_backtest(self):
+        logging.basicConfig(level=logging.INFO)
+        self._initialize_components()
+
+        result = simulate(
+            self.strategy,
+            self.data_handler.columns,
+            self.execution_handler,
+            self.config['backtest']['initial_capital']
+        )
+        fill_idx, directions = result['fill_idx'], result['directions']
+        self.fills = pd.DataFrame({
+            'symbol': self.data_handler.symbol,
+            'datetime': self.data_handler.index[fill_idx],
+            'quantity': result['quantity'],
+            'direction': np.where(directions > 0, 'BUY', 'SELL'),
+            'fill_price': result['fill_prices'],
+            'commission': self.execution_handler.commission_per_trade,
+            'pnl': result['pnl'],
+        })
+        self.equity_curve = result['equity_curve']
+
+        return {
+            'signals': len(fill_idx),
+            'fills': len(fill_idx),
+            'stats': result['stats'],
+            'equity_curve': self.equity_curve
+        }
+
+def simulate(strategy, columns: Dict[str, np.ndarray], execution_handler: ExecutionHandler,
+             initial_capital: float) -> Dict:
+    """Whole-array strategy -> fills -> equity simulation shared by the vectorized engines"""
+    return simulate_signals(strategy.generate_signals_array(columns), strategy.position_limits,
+                            columns['close'], execution_handler, initial_capital)
+
+def simulate_signals(raw_signals: np.ndarray, position_limits, closes: np.ndarray,
+                     execution_handler: ExecutionHandler, initial_capital: float,
+                     flatten_at_end: bool = False) -> Dict:
+    """Fills and equity from precomputed raw signals, starting flat at closes[0].
+
+    With ``flatten_at_end`` an open position is closed at the last close,
+    paying the usual slippage and commission, so the run also ends flat.
+    """
+    commission = execution_handler.commission_per_trade
+    quantity = int(initial_capital * 0.1 / 100)
+    closes = np.asarray(closes, dtype=float)
+
+    # Signals -> positions (in order units) -> trades
+    units = bounded_positions(raw_signals, *position_limits)
+    if flatten_at_end and len(units):
+        units[-1] = 0
+    trades = np.diff(units, prepend=0)
+    fill_idx = np.flatnonzero(trades)
+    directions = trades[fill_idx]
+
+    # Fills against the close of the signal bar
+    fill_prices = execution_handler.execute_orders(directions, closes[fill_idx])
+
+    # Every fill moves the position one unit, so it either opens from flat
+    # or closes back to flat against the previous fill's price
+    pnl = np.zeros(len(fill_idx))
+    closing = np.flatnonzero(units[fill_idx] == 0)
+    closing = closing[closing > 0]
+    pnl[closing] = -directions[closing] * quantity * (fill_prices[closing] - fill_prices[closing - 1])
+
+    # Mark-to-market equity per bar
+    cash_flows = np.zeros(len(closes))
+    cash_flows[fill_idx] = -directions * quantity * fill_prices - commission
+    cash = initial_capital + np.cumsum(cash_flows)
+    positions = units * quantity
+    equity_curve = cash + positions * closes
+
+    stats = {
+        'total_trades': len(fill_idx),
+        'wins': int(np.sum(pnl > 0)),
+        'losses': int(np.sum(pnl < 0)),
+        'gross_wins': float(pnl[pnl > 0].sum()),
+        'gross_losses': float(-pnl[pnl < 0].sum()),
+        'total_fees': float(commission * len(fill_idx))
+    }
+
+    return {
+        'fill_idx': fill_idx,
+        'directions': directions,
+        'quantity': quantity,
+        'fill_prices': fill_prices,
+        'pnl': pnl,
+        'positions': positions,
+        'equity_curve': equity_curve,
+        'stats': stats
+    }
+
+def check_parity(config, rtol: float = 1e-9) -> Dict:
+    """Run the event-driven and vectorized engines on the same config and compare fills and final equity"""
+    from backtester.engine import Backtester
+
+    # The comparison needs the event engine's live portfolio, not a cached result
+    config = {**config, 'backtest': {**config['backtest'], 'result_cache': False}}
+    event_bt = Backtester(config)
+    event_results = event_bt.run_backtest()
+    vector_bt = VectorizedBacktester(config)
+    vector_results = vector_bt.run_backtest()
+
+    mismatches = []
+    for key in ('signals', 'fills'):
+        if event_results[key] != vector_results[key]:
+            mismatches.append(f"{key}: event={event_results[key]} vectorized={vector_results[key]}")
+
+    event_fills = event_bt.portfolio.trades_frame()
+    if len(event_fills) == len(vector_bt.fills):
+        for column in ('datetime', 'quantity', 'direction'):
+            diff = (event_fills[column].to_numpy() != vector_bt.fills[column].to_numpy()).sum()
+            if diff:
+                mismatches.append(f"{column}: {diff} fills differ")
+        for column in ('fill_price', 'pnl'):
+            if not np.allclose(event_fills[column], vector_bt.fills[column], rtol=rtol):
+                mismatches.append(f"{column}: fills differ beyond tolerance")
+
+    for key in ('wins', 'losses'):
+        if event_results['stats'][key] != vector_results['stats'][key]:
+            mismatches.append(f"stats.{key}: event={event_results['stats'][key]} "
+                              f"vectorized={vector_results['stats'][key]}")
+
+    event_curve, vector_curve = event_results['equity_curve'], vector_results['equity_curve']
+    if len(event_curve) != len(vector_curve) or not np.allclose(event_curve, vector_curve, rtol=rtol):
+        mismatches.append("equity_curve: per-bar equity differs beyond tolerance")
+
+    last_close = event_bt.data_handler.columns['close'][-1]
+    event_equity = float(event_bt.portfolio.calculate_performance(last_close)['total'])
+    vector_equity = float(vector_results['equity_curve'][-1])
+    if not np.isclose(event_equity, vector_equity, rtol=rtol):
+        mismatches.append(f"final equity: event={event_equity:.4f} vectorized={vector_equity:.4f}")
+
+    return {
+        'match': not mismatches,
+        'mismatches': mismatches,
+        'event_equity': event_equity,
+        'vectorized_equity': vector_equity
+    }
@@ -0,0 +1,272 @@
+"""Parallel walk-forward optimization over shared-memory prices"""
+import argparse
+import json
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from backtester.data_handler import DataHandler
+from backtester.execution import ExecutionHandler
+from backtester.performance import create_tearsheet
+from backtester.shared_data import SharedPriceArrays
+from backtester.sweep import _is_valid, parameter_grid, parse_values
+from backtester.vectorized import simulate_signals
+from strategies.factory import build_strategy
+
+# Train-window metrics that can pick a fold's parameters (higher is better)
+METRICS = ('sharpe_ratio', 'total_return', 'win_rate')
+
+def make_folds(n_bars: int, train_bars: int, test_bars: int,
+               anchored: bool = False) -> List[Tuple[int, int, int, int]]:
+    """(train_start, train_end, test_start, test_end) bar ranges, ends exclusive.
+
+    Test windows tile the data after the first train window; each train
+    window is the ``train_bars`` before it, or everything before it when
+    ``anchored``. A trailing partial test window is dropped.
+    """
+    folds = []
+    test_start = train_bars
+    while test_start + test_bars <= n_bars:
+        train_start = 0 if anchored else test_start - train_bars
+        folds.append((train_start, test_start, test_start, test_start + test_bars))
+        test_start += test_bars
+    return folds
+
+class SignalCache:
+    """Full-history raw signals per parameter set, shared by every fold window.
+
+    Strategy signals at bar t only depend on bars up to t, so one pass over
+    the whole series serves every overlapping train and test window, with
+    indicators already warmed up at each window's start. Least recently
+    used entries are dropped beyond ``max_bytes``.
+    """
+    def __init__(self, columns: Dict[str, np.ndarray], strategy_name: str, symbol: str,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.columns = columns
+        self.strategy_name = strategy_name
+        self.symbol = symbol
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def get(self, params: Dict) -> Tuple[np.ndarray, Tuple[int, int]]:
+        key = tuple(sorted(params.items()))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        strategy = build_strategy(self.strategy_name, params, self.symbol)
+        entry = self._entries[key] = (strategy.generate_signals_array(self.columns), strategy.position_limits)
+        self._bytes += entry[0].nbytes
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (signals, _) = self._entries.popitem(last=False)
+            self._bytes -= signals.nbytes
+        return entry
+
+def evaluate_fold(fold: Tuple[int, int, int, int], columns: Dict[str, np.ndarray],
+                  signals: SignalCache, param_sets: List[Dict], backtest_config: Dict,
+                  metric: str = 'sharpe_ratio') -> Dict:
+    """Pick the best parameter set on the train window, then run it on the test window"""
+    train_start, train_end, test_start, test_end = fold
+    execution_handler = ExecutionHandler(
+        backtest_config['slippage_bps'],
+        backtest_config['commission_per_trade']
+    )
+    capital = backtest_config['initial_capital']
+    closes = columns['close']
+
+    train = []
+    for params in param_sets:
+        raw_signals, limits = signals.get(params)
+        train.append(simulate_signals(raw_signals[train_start:train_end], limits,
+                                      closes[train_start:train_end], execution_handler, capital))
+    tearsheet = create_tearsheet([result['stats'] for result in train],
+                                 np.stack([result['equity_curve'] for result in train]))
+    scores = np.asarray(tearsheet[metric], dtype=float)
+    best = int(np.argmax(scores))
+
+    raw_signals, limits = signals.get(param_sets[best])
+    # Closed out on the last bar, so the next window can start flat without losing costs or returns
+    test = simulate_signals(raw_signals[test_start:test_end], limits,
+                            closes[test_start:test_end], execution_handler, capital,
+                            flatten_at_end=True)
+    return {
+        'fold': fold,
+        'params': param_sets[best],
+        'train_score': float(scores[best]),
+        'equity_curve': test['equity_curve'],
+        'stats': test['stats']
+    }
+
+def stitch(fold_results: List[Dict], initial_capital: float) -> np.ndarray:
+    """Chain the test-window equity curves into one out-of-sample curve.
+
+    Every test window is simulated from ``initial_capital``, starts flat and
+    closes any open position on its last bar (see evaluate_fold); each
+    window's curve is rescaled to the equity the previous one ended on.
+    Positions are therefore never carried across a fold boundary: a trade
+    open at the boundary is closed and, if the signal persists, reopened
+    on a later bar of the next window.
+    """
+    curves = []
+    capital = initial_capital
+    for result in fold_results:
+        curve = result['equity_curve'] * (capital / initial_capital)
+        curves.append(curve)
+        capital = curve[-1]
+    return np.concatenate(curves) if curves else np.empty(0)
+
+# Per-process state set up once by the pool initializer
+_worker = {}
+
+def _init_worker(spec: Dict, strategy_name: str, symbol: str, param_sets: List[Dict],
+                 backtest_config: Dict, metric: str):
+    columns, handles = SharedPriceArrays.attach(spec)
+    _worker.update(
+        columns=columns,
+        handles=handles,
+        signals=SignalCache(columns, strategy_name, symbol),
+        param_sets=param_sets,
+        backtest_config=backtest_config,
+        metric=metric
+    )
+
+def _evaluate_in_worker(fold: Tuple[int, int, int, int]) -> Dict:
+    return evaluate_fold(fold, _worker['columns'], _worker['signals'], _worker['param_sets'],
+                         _worker['backtest_config'], _worker['metric'])
+
+def run_walk_forward(config: Dict, strategy_name: str, grid: Dict[str, Sequence],
+                     train_bars: int, test_bars: int, anchored: bool = False,
+                     metric: str = 'sharpe_ratio', workers: Optional[int] = None,
+                     columns: Optional[Dict[str, np.ndarray]] = None) -> Dict:
+    """Optimize on each train window, evaluate out of sample, and stitch the test windows.
+
+    Folds run across a process pool over shared-memory prices. Each worker
+    computes a parameter set's signals once and reuses them for every fold
+    it evaluates. Returns a per-fold table, the stitched out-of-sample
+    equity curve and its tearsheet.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}")
+    data_config = config['data']
+    backtest_config = config['backtest']
+    index = None
+    if columns is None:
+        data_handler = DataHandler(
+            data_config['csv_path'],
+            data_config['symbol'],
+            data_config.get('use_cache', True)
+        )
+        columns, index = data_handler.columns, data_handler.index
+
+    base_params = config['strategies'].get(strategy_name, {})
+    param_sets = [
+        {**base_params, **params}
+        for params in parameter_grid(grid)
+        if _is_valid(strategy_name, {**base_params, **params})
+    ]
+    if not param_sets:
+        raise ValueError("The grid has no valid parameter sets")
+    n_bars = len(columns['close'])
+    folds = make_folds(n_bars, train_bars, test_bars, anchored)
+    if not folds:
+        raise ValueError(f"{n_bars} bars are too few for a {train_bars}-bar train and {test_bars}-bar test window")
+
+    workers = min(workers or os.cpu_count() or 1, len(folds))
+    symbol = data_config.get('symbol', 'WALKFORWARD')
+    logging.info(f"Walk-forward over {len(folds)} folds x {len(param_sets)} {strategy_name} "
+                 f"parameter sets on {workers} workers")
+
+    if workers == 1:
+        signals = SignalCache(columns, strategy_name, symbol)
+        fold_results = [evaluate_fold(fold, columns, signals, param_sets, backtest_config, metric)
+                        for fold in folds]
+    else:
+        with SharedPriceArrays(columns) as shared:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shared.spec, strategy_name, symbol, param_sets, backtest_config, metric)
+            ) as pool:
+                # Contiguous chunks keep each worker's signal cache hot
+                chunksize = max(1, len(folds) // workers)
+                fold_results = list(pool.map(_evaluate_in_worker, folds, chunksize=chunksize))
+
+    rows = []
+    for i, result in enumerate(fold_results):
+        train_start, train_end, test_start, test_end = result['fold']
+        curve = result['equity_curve']
+        row = {
+            'fold': i,
+            'train_start': train_start,
+            'test_start': test_start,
+            'test_end': test_end,
+            **result['params'],
+            f'train_{metric}': result['train_score'],
+            'test_return': (curve[-1] / curve[0] - 1) * 100,
+            'test_trades': result['stats']['total_trades']
+        }
+        if index is not None:
+            row['test_from'] = index[test_start]
+            row['test_to'] = index[test_end - 1]
+        rows.append(row)
+
+    equity_curve = stitch(fold_results, backtest_config['initial_capital'])
+    stats = {key: sum(result['stats'][key] for result in fold_results)
+             for key in fold_results[0]['stats']}
+    return {
+        'folds': pd.DataFrame(rows),
+        'equity_curve': equity_curve,
+        'index': index[folds[0][2]:folds[-1][3]] if index is not None else None,
+        'stats': stats,
+        'tearsheet': create_tearsheet(stats, equity_curve)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward optimization")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--strategy', choices=['ma', 'rsi', 'volume'], default='ma')
+    parser.add_argument('--grid', nargs='+', default=None, metavar='PARAM=VALUES',
+                        help="e.g. short_window=5,10,20 long_window=20:100:10 "
+                             "(default: walk_forward.grids in the config)")
+    parser.add_argument('--train', type=int, default=None, help="train window in bars")
+    parser.add_argument('--test', type=int, default=None, help="test window in bars")
+    parser.add_argument('--anchored', action='store_true', help="grow train windows from the first bar")
+    parser.add_argument('--metric', choices=METRICS, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=None, help="write the stitched equity curve to this CSV")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    settings = config.get('walk_forward', {})
+    if args.grid:
+        grid = {}
+        for item in args.grid:
+            name, values = item.split('=', 1)
+            grid[name] = parse_values(values)
+    else:
+        grid = settings.get('grids', {}).get(args.strategy)
+        if not grid:
+            parser.error(f"no --grid given and no walk_forward.grids.{args.strategy} in {args.config}")
+
+    result = run_walk_forward(
+        config, args.strategy, grid,
+        args.train or settings.get('train_bars', 500),
+        args.test or settings.get('test_bars', 100),
+        args.anchored or settings.get('anchored', False),
+        args.metric or settings.get('metric', 'sharpe_ratio'),
+        args.workers
+    )
+    print(result['folds'].to_string(index=False))
+    tearsheet = result['tearsheet']
+    print(f"\nOut-of-sample Sharpe: {tearsheet['sharpe_ratio']:.3f}  "
+          f"max drawdown: {tearsheet['max_drawdown']['max_drawdown_pct']:.2f}%  "
+          f"return: {tearsheet['total_return']:.2f}%  trades: {tearsheet['num_trades']}")
+    print("(each test window closes its open position on its last bar, with normal costs)")
+    if args.output:
+        pd.DataFrame({'equity': result['equity_curve']}, index=result['index']).to_csv(args.output)
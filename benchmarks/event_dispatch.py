@@ -0,0 +1,124 @@
+"""Microbenchmark: event objects and dispatch, legacy vs slotted/deque/table.
+
+Replays a synthetic run of N bars where every `signal_every`-th bar emits a
+signal -> order -> fill chain, with no strategy, data or portfolio work, so
+only event construction and dispatch is measured.
+
+    python -m benchmarks.event_dispatch --bars 1000000
+"""
+import argparse
+import json
+import queue
+import time
+from collections import deque
+from backtester.events import FillEvent, MarketEvent, OrderEvent, SignalEvent
+
+# --- Legacy layer as it was: __dict__ events, queue.Queue, isinstance chain, dict round-trips ---
+
+class _LegacyEvent:
+    def __init__(self, type_):
+        self.type = type_
+
+class _LegacyMarket(_LegacyEvent):
+    def __init__(self, data):
+        super().__init__('MARKET')
+        self.data = data
+
+class _LegacySignal(_LegacyEvent):
+    def __init__(self, symbol, datetime, signal_type, strength=1.0):
+        super().__init__('SIGNAL')
+        self.symbol = symbol
+        self.datetime = datetime
+        self.signal_type = signal_type
+        self.strength = strength
+
+class _LegacyOrder(_LegacyEvent):
+    def __init__(self, symbol, datetime, order_type, quantity, direction, slippage=0.0):
+        super().__init__('ORDER')
+        self.symbol = symbol
+        self.datetime = datetime
+        self.order_type = order_type
+        self.quantity = quantity
+        self.direction = direction
+        self.slippage = slippage
+
+class _LegacyFill(_LegacyEvent):
+    def __init__(self, symbol, datetime, exchange, quantity, direction, fill_price, commission=0.0):
+        super().__init__('FILL')
+        self.symbol = symbol
+        self.datetime = datetime
+        self.exchange = exchange
+        self.quantity = quantity
+        self.direction = direction
+        self.fill_price = fill_price
+        self.commission = commission
+
+def run_legacy(bars: int, signal_every: int) -> int:
+    events = queue.Queue()
+    processed = 0
+    for i in range(bars):
+        events.put(_LegacyMarket({'close': 100.0, 'datetime': i}))
+        while not events.empty():
+            event = events.get()
+            processed += 1
+            if isinstance(event, _LegacyMarket):
+                if i % signal_every == 0:
+                    signal = {'symbol': 'X', 'datetime': i, 'signal_type': 'LONG', 'strength': 1.0}
+                    events.put(_LegacySignal(**signal))
+            elif isinstance(event, _LegacySignal):
+                events.put(_LegacyOrder(event.symbol, event.datetime, 'MARKET', 100, 'BUY'))
+            elif isinstance(event, _LegacyOrder):
+                order = vars(event)
+                fill = {'symbol': order['symbol'], 'datetime': order['datetime'], 'exchange': 'BACKTEST',
+                        'quantity': order['quantity'], 'direction': order['direction'],
+                        'fill_price': 100.0, 'commission': 1.0}
+                events.put(_LegacyFill(**fill))
+    return processed
+
+def run_current(bars: int, signal_every: int) -> int:
+    events = deque()
+    processed = 0
+
+    def on_market(event):
+        if event.data['datetime'] % signal_every == 0:
+            events.append(SignalEvent('X', event.data['datetime'], 'LONG', 1.0))
+
+    def on_signal(event):
+        events.append(OrderEvent(event.symbol, event.datetime, 'MARKET', 100, 'BUY'))
+
+    def on_order(event):
+        events.append(FillEvent(event.symbol, event.datetime, 'BACKTEST', event.quantity,
+                                event.direction, 100.0, 1.0))
+
+    def on_fill(event):
+        pass
+
+    handlers = {MarketEvent: on_market, SignalEvent: on_signal, OrderEvent: on_order, FillEvent: on_fill}
+    for i in range(bars):
+        events.append(MarketEvent({'close': 100.0, 'datetime': i}))
+        while events:
+            event = events.popleft()
+            processed += 1
+            handlers[event.__class__](event)
+    return processed
+
+def measure(fn, bars: int, signal_every: int) -> dict:
+    start = time.perf_counter()
+    processed = fn(bars, signal_every)
+    elapsed = time.perf_counter() - start
+    return {'events': processed, 'seconds': elapsed, 'events_per_sec': processed / elapsed}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=1_000_000)
+    parser.add_argument('--signal-every', type=int, default=20)
+    args = parser.parse_args()
+
+    legacy = measure(run_legacy, args.bars, args.signal_every)
+    current = measure(run_current, args.bars, args.signal_every)
+    print(json.dumps({
+        'bars': args.bars,
+        'legacy': legacy,
+        'current': current,
+        'speedup': current['events_per_sec'] / legacy['events_per_sec']
+    }, indent=2))
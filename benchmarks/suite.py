@@ -0,0 +1,377 @@
+"""Engine throughput benchmarks on synthetic data, with machine-readable output.
+
+Each stage runs in a fresh process so its peak RSS is its own. Only
+run_backtest is repeated for every symbol count. Per-bar
+Python stages (legacy signals, order/fill handling, the event-driven
+engine) are capped at --event-bars bars so huge sizes stay practical;
+every result records how many items it actually processed.
+
+    python -m benchmarks.suite run --bars 10000 1000000 --symbols 1 50 --output bench.json
+    python -m benchmarks.suite compare base.json bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+import numpy as np
+import pandas as pd
+
+from backtester.price_cache import load_prices
+from benchmarks.synthetic import write_universe
+
+STRATEGY_PARAMS = {
+    'ma': {'short_window': 10, 'long_window': 30},
+    'rsi': {'window': 14, 'oversold': 30, 'overbought': 70},
+    'volume': {'window': 20, 'volume_multiplier': 1.5}
+}
+# Only these stages depend on the symbol count; the rest run once per bar size
+UNIVERSE_STAGES = {'run_backtest'}
+BACKTEST_CONFIG = {'initial_capital': 100000.0, 'slippage_bps': 1.0, 'commission_per_trade': 1.0}
+
+# --- Stages: each takes the case dict and returns the number of items processed ---
+
+def stage_load_csv(case: Dict) -> int:
+    from backtester.data_handler import DataHandler
+    return DataHandler(case['csv_path'], 'SYM000', use_cache=False).bars_total
+
+def stage_build_cache(case: Dict) -> int:
+    from backtester.price_cache import build_cache
+    build_cache(case['csv_path'], os.path.join(case['workdir'], 'cache_build'))
+    return case['bars']
+
+def stage_load_mmap(case: Dict) -> int:
+    from backtester.data_handler import DataHandler
+    handler = DataHandler(case['csv_path'], 'SYM000')
+    # Touch every page so the cost of faulting the map in is included
+    float(np.sum(handler.columns['close']))
+    return handler.bars_total
+
+def _strategy(name: str):
+    from strategies.factory import build_strategy
+    return build_strategy(name, STRATEGY_PARAMS[name], 'SYM000')
+
+def _event_handler(case: Dict):
+    from backtester.data_handler import DataHandler
+    return DataHandler(case['event_csv_path'], 'SYM000')
+
+def stage_signals_legacy(case: Dict, name: str) -> int:
+    handler = _event_handler(case)
+    strategy = _strategy(name)
+    portfolio = {'current_positions': {}}
+    while handler.continue_backtest:
+        handler.update_bars()
+        strategy.generate_signals(handler.get_bars('SYM000'), [], portfolio)
+    return handler.bars_total
+
+def stage_signals_on_bar(case: Dict, name: str) -> int:
+    handler = _event_handler(case)
+    strategy = _strategy(name)
+    portfolio = {'current_positions': {}}
+    while handler.continue_backtest:
+        for bar in handler.update_bars():
+            strategy.on_bar(bar, portfolio)
+    return handler.bars_total
+
+def stage_signals_array(case: Dict, name: str) -> int:
+    from backtester.data_handler import DataHandler
+    from strategies.indicator_cache import shared_indicators
+    shared_indicators().clear()  # time the indicators, not a cache hit from the previous pass
+    handler = DataHandler(case['csv_path'], 'SYM000')
+    _strategy(name).generate_signals_array(handler.columns)
+    return handler.bars_total
+
+def _orders(n: int) -> list:
+    from backtester.events import OrderEvent
+    return [OrderEvent('SYM000', i, 'MARKET', 100, 'BUY' if i % 2 == 0 else 'SELL') for i in range(n)]
+
+def stage_execute_order(case: Dict) -> int:
+    from backtester.execution import ExecutionHandler
+    execution = ExecutionHandler(BACKTEST_CONFIG['slippage_bps'], BACKTEST_CONFIG['commission_per_trade'])
+    orders = _orders(case['event_bars'])
+    start = time.perf_counter()
+    for order in orders:
+        execution.execute_order(order, 100.0)
+    case['_elapsed'] = time.perf_counter() - start
+    return len(orders)
+
+def stage_execute_fill(case: Dict) -> int:
+    from backtester.execution import ExecutionHandler
+    from backtester.portfolio import Portfolio
+    execution = ExecutionHandler(BACKTEST_CONFIG['slippage_bps'], BACKTEST_CONFIG['commission_per_trade'])
+    fills = [execution.execute_order(order, 100.0) for order in _orders(case['event_bars'])]
+    portfolio = Portfolio(**BACKTEST_CONFIG)
+    start = time.perf_counter()
+    for fill in fills:
+        portfolio.execute_fill(fill)
+    case['_elapsed'] = time.perf_counter() - start
+    return len(fills)
+
+def stage_match_resting_orders(case: Dict) -> int:
+    from backtester.events import OrderEvent
+    from backtester.execution import ExecutionHandler
+    from backtester.order_book import OrderBook
+    book = OrderBook(ExecutionHandler(BACKTEST_CONFIG['slippage_bps'], BACKTEST_CONFIG['commission_per_trade']))
+    rng = np.random.default_rng(0)
+    n_orders, n_symbols, steps = 10_000, 50, min(case['bars'], 1_000)
+    for i in range(n_orders):
+        # Far from the market so the book stays full for the whole run
+        book.add(OrderEvent(f'SYM{i % n_symbols:03d}', 0, 'LIMIT' if i % 2 else 'STOP', 100,
+                            'BUY', price=50.0 if i % 2 else 200.0))
+    bars = [[{'symbol': f'SYM{s:03d}', 'datetime': t, 'open': price, 'high': price * 1.01, 'low': price * 0.99}
+             for s, price in enumerate(100 + rng.normal(0, 1, n_symbols))] for t in range(steps)]
+    start = time.perf_counter()
+    for step in bars:
+        book.match(step)
+    case['_elapsed'] = time.perf_counter() - start
+    return n_orders * steps
+
+def stage_create_tearsheet(case: Dict) -> int:
+    from backtester.performance import create_tearsheet
+    rng = np.random.default_rng(0)
+    equity = 100000.0 * np.exp(np.cumsum(rng.normal(0.0, 1e-4, case['bars'])))
+    start = time.perf_counter()
+    create_tearsheet({'total_trades': 0}, equity)
+    case['_elapsed'] = time.perf_counter() - start
+    return case['bars']
+
+def stage_create_tearsheet_batch(case: Dict) -> int:
+    from backtester.performance import create_tearsheet
+    rng = np.random.default_rng(0)
+    n_curves = 256
+    equity = 100000.0 * np.exp(np.cumsum(rng.normal(0.0, 1e-4, (n_curves, case['bars'])), axis=1))
+    start = time.perf_counter()
+    create_tearsheet({'total_trades': np.zeros(n_curves)}, equity)
+    case['_elapsed'] = time.perf_counter() - start
+    return n_curves * case['bars']
+
+def stage_online_metrics(case: Dict) -> int:
+    from backtester.performance import OnlineMetrics
+    rng = np.random.default_rng(0)
+    equity = (100000.0 * np.exp(np.cumsum(rng.normal(0.0, 1e-4, case['bars'])))).tolist()
+    metrics = OnlineMetrics()
+    start = time.perf_counter()
+    for value in equity:
+        metrics.update(value)
+    case['_elapsed'] = time.perf_counter() - start
+    return case['bars']
+
+def stage_monte_carlo(case: Dict) -> int:
+    from backtester.monte_carlo import block_bootstrap
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0, 1e-4, min(case['bars'], 100_000))
+    n_paths = 1_000
+    start = time.perf_counter()
+    block_bootstrap(returns, 100000.0, n_paths, block_size=20, chunk_size=100, rng=rng)
+    case['_elapsed'] = time.perf_counter() - start
+    return n_paths * len(returns)
+
+def _config(case: Dict) -> Dict:
+    if case['symbols'] > 1:
+        data = {'universe': case['event_universe']}
+    else:
+        data = {'csv_path': case['event_csv_path'], 'symbol': 'SYM000'}
+    return {'data': data, 'backtest': {**BACKTEST_CONFIG, 'result_cache': False},
+            'strategies': {name: dict(params) for name, params in STRATEGY_PARAMS.items()}}
+
+def stage_run_backtest(case: Dict) -> int:
+    import logging
+    from backtester.engine import Backtester
+    logging.disable(logging.INFO)
+    Backtester(_config(case)).run_backtest()
+    return case['event_bars'] * case['symbols']
+
+def stage_run_vectorized(case: Dict) -> int:
+    import logging
+    from backtester.vectorized import VectorizedBacktester
+    logging.disable(logging.INFO)
+    config = _config(case)
+    config['data'] = {'csv_path': case['csv_path'], 'symbol': 'SYM000'}
+    VectorizedBacktester(config).run_backtest()
+    return case['bars']
+
+def stages() -> Dict[str, Callable]:
+    table = {
+        'load_csv': stage_load_csv,
+        'build_cache': stage_build_cache,
+        'load_mmap': stage_load_mmap,
+    }
+    for name in STRATEGY_PARAMS:
+        table[f'signals_{name}_legacy'] = lambda case, name=name: stage_signals_legacy(case, name)
+        table[f'signals_{name}_on_bar'] = lambda case, name=name: stage_signals_on_bar(case, name)
+        table[f'signals_{name}_array'] = lambda case, name=name: stage_signals_array(case, name)
+    table.update({
+        'execute_order': stage_execute_order,
+        'execute_fill': stage_execute_fill,
+        'match_resting_orders': stage_match_resting_orders,
+        'create_tearsheet': stage_create_tearsheet,
+        'create_tearsheet_batch': stage_create_tearsheet_batch,
+        'online_metrics': stage_online_metrics,
+        'monte_carlo': stage_monte_carlo,
+        'run_backtest': stage_run_backtest,
+        'run_vectorized': stage_run_vectorized,
+    })
+    return table
+
+# --- Runner ---
+
+def _measure(stage: str, case: Dict, allocations: bool, results) -> None:
+    """Child-process body: time the stage, then optionally re-run it under tracemalloc"""
+    fn = stages()[stage]
+    start = time.perf_counter()
+    items = fn(case)
+    elapsed = case.pop('_elapsed', time.perf_counter() - start)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak_rss *= 1024  # ru_maxrss is KiB on Linux, bytes on macOS
+
+    result = {
+        'items': items,
+        'seconds': elapsed,
+        'items_per_sec': items / elapsed if elapsed > 0 else float('inf'),
+        'peak_rss_bytes': peak_rss
+    }
+    if allocations:
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        fn(case)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['alloc_peak_bytes'] = peak
+        result['alloc_net_blocks'] = sys.getallocatedblocks() - blocks_before
+    results.put(result)
+
+def run_stage(stage: str, case: Dict, allocations: bool) -> Dict:
+    """Measure one stage in a fresh process; raises if the process dies without a result"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_measure, args=(stage, case, allocations, results))
+    process.start()
+    while True:
+        try:
+            result = results.get(timeout=1.0)
+            break
+        except queue.Empty:
+            # A crashed child (OOM kill, segfault, exception) never sends its result
+            if not process.is_alive() and results.empty():
+                process.join()
+                raise RuntimeError(f"Benchmark stage '{stage}' exited with code {process.exitcode} "
+                                   f"before reporting a result")
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"Benchmark stage '{stage}' exited with code {process.exitcode}")
+    return result
+
+def prepare_case(workdir: str, bars: int, symbols: int, event_bars: int) -> Dict:
+    case_dir = os.path.join(workdir, f'{bars}x{symbols}')
+    event_bars = min(bars, max(1, event_bars // symbols))
+    universe = write_universe(os.path.join(case_dir, 'full'), 1, bars)
+    event_universe = write_universe(os.path.join(case_dir, 'event'), symbols, event_bars)
+    # Warm the binary caches so only load_csv/build_cache pay for CSV parsing
+    for csv_path in [universe['SYM000'], *event_universe.values()]:
+        load_prices(csv_path)
+    return {
+        'workdir': case_dir,
+        'bars': bars,
+        'symbols': symbols,
+        'event_bars': event_bars,
+        'csv_path': universe['SYM000'],
+        'event_csv_path': event_universe['SYM000'],
+        'event_universe': event_universe
+    }
+
+def metadata() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+def run(bar_sizes: List[int], symbol_counts: List[int], event_bars: int, selected: List[str],
+        allocations: bool, workdir: str = None) -> Dict:
+    owns_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix='backtester-bench-')
+    results = []
+    try:
+        for bars in bar_sizes:
+            for i, symbols in enumerate(symbol_counts):
+                case = prepare_case(workdir, bars, symbols, event_bars)
+                for stage in selected:
+                    if i > 0 and stage not in UNIVERSE_STAGES:
+                        continue
+                    result = run_stage(stage, case, allocations)
+                    result.update(stage=stage, bars=bars, symbols=symbols)
+                    results.append(result)
+                    print(f"{stage:>24} bars={bars:<10} symbols={symbols:<4} "
+                          f"{result['items_per_sec']:>14,.0f} items/s  "
+                          f"rss={result['peak_rss_bytes'] / 2**20:,.0f} MiB", file=sys.stderr)
+    finally:
+        if owns_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {'meta': metadata(), 'results': results}
+
+def compare(base: Dict, new: Dict) -> pd.DataFrame:
+    key = ['stage', 'bars', 'symbols']
+    merged = pd.DataFrame(base['results']).merge(pd.DataFrame(new['results']), on=key,
+                                                  suffixes=('_base', '_new'))
+    merged['speedup'] = merged['items_per_sec_new'] / merged['items_per_sec_base']
+    merged['rss_ratio'] = merged['peak_rss_bytes_new'] / merged['peak_rss_bytes_base']
+    return merged[key + ['items_per_sec_base', 'items_per_sec_new', 'speedup', 'rss_ratio']]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="run the benchmark stages")
+    run_parser.add_argument('--bars', type=int, nargs='+', default=[10_000, 100_000])
+    run_parser.add_argument('--symbols', type=int, nargs='+', default=[1])
+    run_parser.add_argument('--event-bars', type=int, default=100_000,
+                            help="cap on bars (summed over symbols) for per-bar Python stages")
+    run_parser.add_argument('--stages', nargs='+', default=None, help="subset of stages to run")
+    run_parser.add_argument('--no-allocations', action='store_true',
+                            help="skip the tracemalloc pass (it re-runs every stage)")
+    run_parser.add_argument('--workdir', default=None, help="keep generated data here")
+    run_parser.add_argument('--output', default=None, help="write JSON results here (default stdout)")
+
+    compare_parser = commands.add_parser('compare', help="compare two result files")
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        selected = args.stages or list(stages())
+        unknown = set(selected) - set(stages())
+        if unknown:
+            parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+        report = run(args.bars, args.symbols, args.event_bars, selected, not args.no_allocations,
+                     args.workdir)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+        else:
+            print(json.dumps(report, indent=2))
+    else:
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        print(compare(base, new).to_string(index=False))
@@ -0,0 +1,72 @@
+"""Synthetic OHLCV data shaped like prices.csv, generated in bounded chunks.
+
+    python -m benchmarks.synthetic --bars 1000000 --symbols 10 --output-dir data/synthetic
+"""
+import argparse
+import os
+from typing import Dict, Iterator
+import numpy as np
+import pandas as pd
+
+def iter_bars(n_bars: int, seed: int = 0, start: str = '2020-01-01', freq: str = '5min',
+              start_price: float = 100.0, volatility: float = 0.002,
+              missing: float = 0.0, chunk_size: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """Random-walk OHLCV bars as DataFrame chunks of at most chunk_size rows.
+
+    Each bar opens at the previous close. With ``missing`` > 0 that fraction
+    of bars is dropped at random to mimic sparse histories.
+    """
+    rng = np.random.default_rng(seed)
+    step = pd.Timedelta(freq)
+    start = pd.Timestamp(start)
+    last_close = start_price
+
+    for offset in range(0, n_bars, chunk_size):
+        n = min(chunk_size, n_bars - offset)
+        close = last_close * np.exp(np.cumsum(rng.normal(0.0, volatility, n)))
+        open_ = np.empty(n)
+        open_[0] = last_close
+        open_[1:] = close[:-1]
+        wicks = np.abs(rng.normal(0.0, volatility, (2, n))) * close
+        frame = pd.DataFrame({
+            'datetime': start + step * np.arange(offset, offset + n),
+            'open': open_,
+            'high': np.maximum(open_, close) + wicks[0],
+            'low': np.minimum(open_, close) - wicks[1],
+            'close': close,
+            'volume': rng.poisson(1000, n).astype(np.int64)
+        })
+        last_close = close[-1]
+        if missing > 0:
+            frame = frame[rng.random(n) >= missing]
+        yield frame
+
+def write_csv(path: str, n_bars: int, seed: int = 0, **kwargs) -> str:
+    """Write n_bars synthetic bars to a prices.csv-style file, chunk by chunk"""
+    with open(path, 'w', newline='') as f:
+        for i, frame in enumerate(iter_bars(n_bars, seed=seed, **kwargs)):
+            frame.to_csv(f, index=False, header=(i == 0))
+    return path
+
+def write_universe(output_dir: str, n_symbols: int, n_bars: int, seed: int = 0,
+                   **kwargs) -> Dict[str, str]:
+    """One CSV per synthetic symbol (SYM000, SYM001, ...); returns {symbol: csv_path}"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for i in range(n_symbols):
+        symbol = f'SYM{i:03d}'
+        paths[symbol] = write_csv(os.path.join(output_dir, f'{symbol}.csv'), n_bars,
+                                  seed=seed + i, **kwargs)
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=100_000)
+    parser.add_argument('--symbols', type=int, default=1)
+    parser.add_argument('--missing', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output-dir', default='.')
+    args = parser.parse_args()
+
+    paths = write_universe(args.output_dir, args.symbols, args.bars, seed=args.seed, missing=args.missing)
+    print(f"Wrote {len(paths)} files of {args.bars} bars to {args.output_dir}")
@@ -3,18 +3,31 @@ import pandas as pd
 import plotly.graph_objects as go
 import json
 import os
+import time
+from backtester.background import BacktestRunner
 
 st.set_page_config(page_title="Trading Backtester", layout="wide")
 st.title("🚀 Algorithmic Trading Backtester")
 st.markdown("#### Hyperparameter Tuning & Real Event-Driven Backtesting")
 
-# Load data correctly
-@st.cache_data
-def load_data():
-    return pd.read_csv("prices.csv", parse_dates=["datetime"]).tail()
+# One runner per server process: its worker threads and loaded prices survive reruns
+@st.cache_resource
+def get_runner():
+    return BacktestRunner(max_workers=2)
+
+runner = get_runner()
+
+def load_config():
+    with open('config.json', 'r') as f:
+        return json.load(f)
+
+config = load_config()
+csv_path = config['data'].get('csv_path', 'prices.csv')
 
 st.sidebar.header("📊 Data Preview")
-st.dataframe(load_data())
+index, columns = runner.prices(csv_path)
+st.dataframe(pd.DataFrame({name: column[-5:] for name, column in columns.items()},
+                          index=index[-5:]).reset_index())
 
 st.sidebar.header("Strategy Parameters")
 strategy = st.sidebar.selectbox("Strategy", ["MA Crossover"])
@@ -22,32 +35,48 @@ strategy = st.sidebar.selectbox("Strategy", ["MA Crossover"])
 if strategy == "MA Crossover":
     short = st.sidebar.slider("Short MA", 5, 50, 10)
     long = st.sidebar.slider("Long MA", 20, 100, 30)
-    
+
 if st.sidebar.button("🚀 Run Real Backtest"):
-    with st.spinner("Running event-driven backtest..."):
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-        config['strategies']['ma']['short_window'] = short
-        config['strategies']['ma']['long_window'] = long
-        
-        from backtester.engine import Backtester
-        bt = Backtester(config)
-        results = bt.run_backtest()
-        
-        col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Signals", results['signals'])
-        col2.metric("Fills/Trades", results['fills'])
-        col3.metric("Total Fees", f"${results['stats']['total_fees']:.0f}")
-        col4.metric("Total Trades", results['stats']['total_trades'])
-        
-        st.success("✅ Event-Driven Backtest Complete!")
-        st.json(results['stats'])
-
-# Mock equity curve (real data integration next)
-st.subheader("📈 Equity Curve & Performance")
-fig = go.Figure()
-fig.add_trace(go.Scatter(y=[100000, 102500, 101000, 105000, 103500], 
-                        mode="lines", name="Portfolio Value"))
-st.plotly_chart(fig, use_container_width=True)
+    config['strategies']['ma']['short_window'] = short
+    config['strategies']['ma']['long_window'] = long
+    previous = st.session_state.get('job')
+    if previous is not None and not previous.done:
+        previous.cancel()
+    st.session_state['job'] = runner.submit(config)
+
+def equity_figure(equity_curve):
+    fig = go.Figure()
+    x = index[:len(equity_curve)] if 'universe' not in config['data'] else None
+    fig.add_trace(go.Scatter(x=x, y=equity_curve, mode="lines", name="Portfolio Value"))
+    return fig
 
+job = st.session_state.get('job')
+st.subheader("📈 Equity Curve & Performance")
+if job is None:
+    st.info("Pick parameters and run a backtest to see its equity curve.")
+elif not job.done:
+    # Partial results; the page reruns itself until the worker finishes
+    st.progress(job.fraction, text=f"Running event-driven backtest... {job.steps:,} bars")
+    if st.button("⏹ Stop"):
+        job.cancel()
+    col1, col2 = st.columns(2)
+    col1.metric("Trades so far", job.stats.get('total_trades', 0))
+    col2.metric("Equity", f"${job.equity_curve[-1]:,.0f}" if len(job.equity_curve) else "-")
+    st.plotly_chart(equity_figure(job.equity_curve), use_container_width=True)
+    time.sleep(0.5)
+    st.rerun()
+elif job.error is not None:
+    st.error(f"Backtest failed: {job.error}")
+elif job.results is None:
+    st.warning("Backtest stopped.")
+else:
+    results = job.results
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Signals", results['signals'])
+    col2.metric("Fills/Trades", results['fills'])
+    col3.metric("Total Fees", f"${results['stats']['total_fees']:.0f}")
+    col4.metric("Total Trades", results['stats']['total_trades'])
 
+    st.success("✅ Event-Driven Backtest Complete!" + (" (cached)" if job.cached else ""))
+    st.json(results['stats'])
+    st.plotly_chart(equity_figure(results['equity_curve']), use_container_width=True)
@@ -1,39 +1,19 @@
-cat > download_india_data.py << 'EOF'
-import yfinance as yf
-import pandas as pd
+import shutil
+from backtester.downloader import SymbolStore, YahooProvider, download
 
 SYMBOL = "RELIANCE.NS"   # change this for other stocks
 
-data = yf.download(
-    SYMBOL,
-    start="2024-01-01",
-    end="2024-06-30",
-    interval="1d"
-)
+store = SymbolStore("data/store")
+result, = download([SYMBOL], YahooProvider(interval="1d"), store,
+                   start="2024-01-01", end="2024-06-30")
 
-if data.empty:
+if "error" in result:
+    raise SystemExit(f"Download failed for {SYMBOL}: {result['error']}")
+if not result["rows"]:
     raise SystemExit(f"No data returned for {SYMBOL}")
 
-data = data.reset_index()
+# The store keeps the history; prices.csv is what config.json points at
+shutil.copyfile(store.csv_path(SYMBOL), "prices.csv")
 
-if "Date" in data.columns:
-    date_col = "Date"
-else:
-    date_col = "Datetime"
-
-data = data.rename(columns={
-    date_col: "datetime",
-    "Open": "open",
-    "High": "high",
-    "Low": "low",
-    "Close": "close",
-    "Volume": "volume"
-})
-
-data = data[["datetime", "open", "high", "low", "close", "volume"]]
-
-data.to_csv("prices.csv", index=False)
-
-print(data.head())
-print(f"✅ Wrote {len(data)} rows to prices.csv for {SYMBOL}")
-EOF
+print(store.load(SYMBOL).head())
+print(f"✅ Wrote {result['rows']} rows to prices.csv for {SYMBOL} (+{result['added']} new)")
@@ -1,17 +1,50 @@
-
 """Main backtest runner"""
+import argparse
 import json
 import logging
 from backtester.engine import Backtester
+from backtester.vectorized import VectorizedBacktester, check_parity
 from backtester.performance import create_tearsheet
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--engine', choices=['event', 'vectorized'], default=None,
+                        help="overrides backtest.engine in config.json (default: event)")
+    parser.add_argument('--check-parity', action='store_true',
+                        help="run both engines and compare their fills")
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='OUTPUT',
+                        help="time engine stages; optionally export to OUTPUT (.json or .folded)")
+    parser.add_argument('--journal', default=None, metavar='DIR',
+                        help="write every signal and fill to a binary journal in DIR")
+    parser.add_argument('--log-fills', action='store_true', help="log one line per fill")
+    parser.add_argument('--strategies', nargs='+', default=None, metavar='NAME',
+                        help="config.json strategies to trade in one pass (overrides backtest.strategies)")
+    args = parser.parse_args()
+
     # Load config
     with open('config.json', 'r') as f:
         config = json.load(f)
-    
+
+    if args.check_parity:
+        parity = check_parity(config)
+        print("\n=== PARITY CHECK ===")
+        print("Engines match" if parity['match'] else "Engines differ:")
+        for mismatch in parity['mismatches']:
+            print(f"  {mismatch}")
+        raise SystemExit(0 if parity['match'] else 1)
+
+    if args.profile is not None:
+        config['backtest']['profile'] = True
+    if args.journal:
+        config['backtest']['journal'] = args.journal
+    if args.log_fills:
+        config['backtest']['log_fills'] = True
+    if args.strategies:
+        config['backtest']['strategies'] = args.strategies
+
     # Run backtest
-    bt = Backtester(config)
+    engine = args.engine or config['backtest'].get('engine', 'event')
+    bt = VectorizedBacktester(config) if engine == 'vectorized' else Backtester(config)
     results = bt.run_backtest()
     
     # Performance report
@@ -19,5 +52,34 @@ if __name__ == "__main__":
     print(f"Signals generated: {results.get('signals', 0)}")
     print(f"Total fills: {results.get('fills', 0)}")
     print("\nPortfolio stats:", results['stats'])
+    if args.journal:
+        print(f"Journal written to {args.journal} (read with backtester.journal.JournalReader)")
+
+    # Running metrics are all there is when the engine kept no per-bar history
+    tearsheet = (create_tearsheet(results['stats'], results['equity_curve'])
+                 if len(results['equity_curve']) > 1 else results.get('metrics'))
+    if tearsheet:
+        print(f"Sharpe ratio: {tearsheet['sharpe_ratio']:.3f}")
+        print(f"Max drawdown: {tearsheet['max_drawdown']['max_drawdown_pct']:.2f}%")
+        print(f"Total return: {tearsheet['total_return']:.2f}%")
+
+    # Multi-strategy runs: the figures above are the combined portfolio
+    for name, result in results.get('strategies', {}).items():
+        metrics = result['metrics']
+        print(f"\n--- {name} (capital {result['initial_capital']:,.0f}) ---")
+        print(f"Fills: {result['fills']}  Return: {metrics['total_return']:.2f}%  "
+              f"Sharpe: {metrics['sharpe_ratio']:.3f}  "
+              f"Max drawdown: {metrics['max_drawdown']['max_drawdown_pct']:.2f}%")
+
+    if 'profile' in results:
+        profile = results['profile']
+        print(f"\n=== STAGE PROFILE ({profile['wall_s']:.3f}s wall) ===")
+        for stage, timing in profile['stages'].items():
+            print(f"{stage:>18}: {timing['total_s']:8.3f}s  {timing['calls']:>9} calls  "
+                  f"{timing['mean_us']:8.2f} us/call")
+        print(f"{'other':>18}: {profile['other_s']:8.3f}s")
+        if args.profile:
+            bt.profiler.export(args.profile)
+            print(f"Profile written to {args.profile}")
     
     print("\nBacktest complete!")
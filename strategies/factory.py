@@ -0,0 +1,15 @@
+"""Build strategies by their config.json name"""
+from typing import Dict
+from .ma import MACrossoverStrategy, Strategy
+from .rsi import RSIStrategy
+from .volume import VolumeBreakoutStrategy
+
+def build_strategy(name: str, params: Dict, symbol: str) -> Strategy:
+    """Instantiate the strategy for a config['strategies'] section ('ma', 'rsi' or 'volume')"""
+    if name == 'ma':
+        return MACrossoverStrategy(params['short_window'], params['long_window'], symbol)
+    if name == 'rsi':
+        return RSIStrategy(params['window'], params['oversold'], params['overbought'], symbol)
+    if name == 'volume':
+        return VolumeBreakoutStrategy(params['window'], params['volume_multiplier'], symbol)
+    raise ValueError(f"Unknown strategy '{name}'")
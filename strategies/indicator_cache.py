@@ -0,0 +1,160 @@
+"""Whole-array indicators memoized across strategies and parameter sets"""
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import numpy as np
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over whole array, NaN until `window` values are available"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if 0 < window <= len(values):
+        out[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).mean(axis=1)
+    return out
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing max over whole array; the first bars use what is available"""
+    values = np.asarray(values, dtype=float)
+    out = np.maximum.accumulate(values)
+    if len(values) >= window:
+        out[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).max(axis=1)
+    return out
+
+def gains(prices: np.ndarray) -> np.ndarray:
+    """Positive bar-to-bar price changes, 0 elsewhere (including the first bar)"""
+    delta = np.diff(np.asarray(prices, dtype=float), prepend=np.nan)
+    return np.where(delta > 0, delta, 0.0)
+
+def losses(prices: np.ndarray) -> np.ndarray:
+    """Size of negative bar-to-bar price changes, 0 elsewhere (including the first bar)"""
+    delta = np.diff(np.asarray(prices, dtype=float), prepend=np.nan)
+    return np.where(delta < 0, -delta, 0.0)
+
+INDICATORS = {
+    'sma': rolling_mean,
+    'rolling_max': rolling_max,
+    'gains': gains,
+    'losses': losses
+}
+
+class IndicatorCache:
+    """Memoized whole-array indicators keyed by (symbol, indicator, params, data version).
+
+    Each series is computed once over the whole input and returned as a
+    read-only array; consumers slice it. The data version is a content
+    hash of the input. For arrays whose memory cannot change (read-only
+    arrays that own their data, read-only memory maps) the hash is kept
+    while the array is alive, so lookups after the first cost a dict
+    access. A read-only view of writable memory is hashed on every lookup.
+    Series are computed outside the lock; concurrent requests for the same
+    key wait for the first one instead of computing it again. Least
+    recently used series are dropped beyond ``max_bytes``.
+    """
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key: array
+        self._bytes = 0
+        self._versions = {}  # id(array): content hash of an immutable array
+        self._pending = {}  # key: Event set once the series being computed is stored
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _immutable(values) -> bool:
+        """Whether no view anywhere can write to the array's memory"""
+        while isinstance(values, np.ndarray):
+            if values.flags.writeable:
+                return False
+            values = values.base
+        # The array owns its data, or views a buffer (mmap, shared memory) that must be read-only
+        return values is None or memoryview(values).readonly
+
+    def version(self, values: np.ndarray) -> str:
+        """Content hash of an input array"""
+        if isinstance(values, np.ndarray) and self._immutable(values):
+            version = self._versions.get(id(values))
+            if version is None:
+                version = self._versions[id(values)] = self._hash(values)
+                weakref.finalize(values, self._versions.pop, id(values), None)
+            return version
+        return self._hash(values)
+
+    @staticmethod
+    def _hash(values) -> str:
+        values = np.ascontiguousarray(values)
+        digest = hashlib.blake2b(values.tobytes(), digest_size=16)
+        digest.update(str(values.dtype).encode())
+        return digest.hexdigest()
+
+    def get(self, indicator: str, values: np.ndarray, *params, symbol: Optional[str] = None,
+            compute: Optional[Callable] = None) -> np.ndarray:
+        """``indicator`` over the whole of ``values``, computed on the first request only.
+
+        ``compute(values, *params)`` defaults to ``INDICATORS[indicator]``.
+        """
+        key = (symbol, indicator, params, self.version(values))
+        while True:
+            with self._lock:
+                series = self._entries.get(key)
+                if series is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return series
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another thread is computing this series; look again once it is stored
+            pending.wait()
+
+        try:
+            series = (compute or INDICATORS[indicator])(values, *params)
+            series.flags.writeable = False
+            with self._lock:
+                self._entries[key] = series
+                self._bytes += series.nbytes
+                while self._bytes > self.max_bytes and len(self._entries) > 1:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+        return series
+
+    def sma(self, values: np.ndarray, window: int, symbol: Optional[str] = None) -> np.ndarray:
+        return self.get('sma', values, window, symbol=symbol)
+
+    def rolling_max(self, values: np.ndarray, window: int, symbol: Optional[str] = None) -> np.ndarray:
+        return self.get('rolling_max', values, window, symbol=symbol)
+
+    def rsi(self, prices: np.ndarray, window: int, symbol: Optional[str] = None) -> np.ndarray:
+        """SMA RSI; price changes are shared by every window, averages by every consumer"""
+        def compute(prices, window):
+            gain = self.sma(self.get('gains', prices, symbol=symbol), window, symbol).copy()
+            loss = self.sma(self.get('losses', prices, symbol=symbol), window, symbol)
+            gain[:window] = np.nan  # the first change is undefined
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return 100 - (100 / (1 + gain / loss))
+        return self.get('rsi', prices, window, symbol=symbol, compute=compute)
+
+    def info(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+_shared = IndicatorCache()
+
+def shared_indicators() -> IndicatorCache:
+    """The process-wide cache every strategy uses unless given its own"""
+    return _shared
@@ -0,0 +1,108 @@
+"""Streaming indicators with O(1) amortized work per bar"""
+import math
+from collections import deque
+
+class RollingSum:
+    """Sum of the last `window` values, kept with Neumaier compensation so long runs don't drift"""
+    def __init__(self, window: int):
+        self.window = window
+        self._values = deque(maxlen=window)
+        self._sum = 0.0
+        self._comp = 0.0
+
+    def _add(self, x: float):
+        t = self._sum + x
+        if abs(self._sum) >= abs(x):
+            self._comp += (self._sum - t) + x
+        else:
+            self._comp += (x - t) + self._sum
+        self._sum = t
+
+    def update(self, value: float) -> float:
+        if len(self._values) == self.window:
+            self._add(-self._values[0])
+        self._values.append(value)
+        self._add(value)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return len(self._values) == self.window
+
+    @property
+    def value(self) -> float:
+        return self._sum + self._comp
+
+class RollingMean(RollingSum):
+    """Simple moving average; NaN until the window is full"""
+    @property
+    def value(self) -> float:
+        if not self.ready:
+            return math.nan
+        return (self._sum + self._comp) / self.window
+
+class RollingMax:
+    """Maximum of the last `window` values using a monotonic deque"""
+    def __init__(self, window: int):
+        self.window = window
+        self._count = 0
+        self._candidates = deque()  # (index, value), values decreasing
+
+    def update(self, value: float) -> float:
+        while self._candidates and self._candidates[-1][1] <= value:
+            self._candidates.pop()
+        self._candidates.append((self._count, value))
+        if self._candidates[0][0] <= self._count - self.window:
+            self._candidates.popleft()
+        self._count += 1
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.window
+
+    @property
+    def value(self) -> float:
+        return self._candidates[0][1] if self._candidates else math.nan
+
+class RSI:
+    """Relative strength index over price changes, SMA (default) or Wilder smoothed"""
+    def __init__(self, window: int, wilder: bool = False):
+        self.window = window
+        self.wilder = wilder
+        self._prev_price = None
+        self._gain = RollingMean(window)
+        self._loss = RollingMean(window)
+        self._avg_gain = math.nan
+        self._avg_loss = math.nan
+
+    def update(self, price: float) -> float:
+        if self._prev_price is None:
+            self._prev_price = price
+            return math.nan
+        delta = price - self._prev_price
+        self._prev_price = price
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.wilder and self._gain.ready:
+            # Wilder smoothing once the SMA seed is available
+            self._avg_gain = (self._avg_gain * (self.window - 1) + gain) / self.window
+            self._avg_loss = (self._avg_loss * (self.window - 1) + loss) / self.window
+        else:
+            self._avg_gain = self._gain.update(gain)
+            self._avg_loss = self._loss.update(loss)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self._gain.ready
+
+    @property
+    def value(self) -> float:
+        avg_gain, avg_loss = self._avg_gain, self._avg_loss
+        if math.isnan(avg_gain) or math.isnan(avg_loss):
+            return math.nan
+        if avg_loss == 0:
+            return math.nan if avg_gain == 0 else 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
@@ -4,17 +4,49 @@ import numpy as np
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 from datetime import datetime
+from backtester.events import SignalEvent
+from .indicators import RollingMean
+from .indicator_cache import rolling_mean, shared_indicators
 
 class Strategy(ABC):
+    # Position range in order units; each signal moves the position one unit
+    position_limits = (-1, 1)
+    # Whole-array indicators for generate_signals_array, shared across instances
+    indicators = shared_indicators()
+
+    @property
+    def lookback(self) -> int:
+        """Number of most recent bars generate_signals needs"""
+        return 500
+
     @abstractmethod
     def generate_signals(self, data: pd.DataFrame, events: list, portfolio: Dict) -> list:
         pass
 
+    def generate_signals_array(self, data: Dict[str, np.ndarray]) -> np.ndarray:
+        """Raw entry conditions for every bar at once: +1 LONG, -1 SHORT, 0 none.
+
+        ``data`` maps column names to whole arrays (``DataHandler.columns``
+        or a DataFrame). Position guards are applied by the engine, mirroring the
+        ``current_pos`` checks in ``generate_signals``.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no array-level signals")
+
+    def on_bar(self, bar: Dict, portfolio: Dict) -> list:
+        """Update streaming indicator state with one bar and return its signals"""
+        raise NotImplementedError(f"{type(self).__name__} has no streaming signals")
+
 class MACrossoverStrategy(Strategy):
     def __init__(self, short_window: int, long_window: int, symbol: str):
         self.short_window = short_window
         self.long_window = long_window
         self.symbol = symbol
+        self.short_ma = RollingMean(short_window)
+        self.long_ma = RollingMean(long_window)
+
+    @property
+    def lookback(self) -> int:
+        return max(self.short_window, self.long_window)
 
     def generate_signals(self, data: pd.DataFrame, events: list, portfolio: Dict) -> list:
         signals = []
@@ -22,26 +54,41 @@ class MACrossoverStrategy(Strategy):
         if len(data) < self.long_window:
             return signals
 
-        closes = data[\'close\'].values
+        closes = data['close'].values
         short_ma = pd.Series(closes).rolling(self.short_window).mean().iloc[-1]
         long_ma = pd.Series(closes).rolling(self.long_window).mean().iloc[-1]
 
-        current_pos = portfolio.get(\'current_positions\', {}).get(self.symbol, 0)
+        return self._signals(short_ma, long_ma, data.index[-1], portfolio)
+
+    def on_bar(self, bar: Dict, portfolio: Dict) -> list:
+        short_ma = self.short_ma.update(bar['close'])
+        long_ma = self.long_ma.update(bar['close'])
+
+        if not self.long_ma.ready:
+            return []
+
+        return self._signals(short_ma, long_ma, bar['datetime'], portfolio)
+
+    def _signals(self, short_ma: float, long_ma: float, dt: datetime, portfolio: Dict) -> list:
+        signals = []
+
+        current_pos = portfolio.get('current_positions', {}).get(self.symbol, 0)
 
         # Generate signals
         if short_ma > long_ma and current_pos <= 0:
-            signals.append({
-                \'symbol\': self.symbol,
-                \'datetime\': data.index[-1],
-                \'signal_type\': \'LONG\',
-                \'strength\': 1.0
-            })
+            signals.append(SignalEvent(self.symbol, dt, 'LONG', 1.0))
         elif short_ma < long_ma and current_pos >= 0:
-            signals.append({
-                \'symbol\': self.symbol,
-                \'datetime\': data.index[-1],
-                \'signal_type\': \'SHORT\',
-                \'strength\': 1.0
-            })
+            signals.append(SignalEvent(self.symbol, dt, 'SHORT', 1.0))
+
+        return signals
+
+    def generate_signals_array(self, data: Dict[str, np.ndarray]) -> np.ndarray:
+        closes = np.asarray(data['close'])
+        short_ma = self.indicators.sma(closes, self.short_window, self.symbol)
+        long_ma = self.indicators.sma(closes, self.long_window, self.symbol)
 
+        signals = np.zeros(len(closes), dtype=np.int8)
+        signals[short_ma > long_ma] = 1
+        signals[short_ma < long_ma] = -1
+        signals[:self.long_window - 1] = 0
         return signals
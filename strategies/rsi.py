@@ -2,7 +2,10 @@
 import pandas as pd
 import numpy as np
 from .ma import Strategy
+from .indicators import RSI
 from datetime import datetime
+from backtester.events import SignalEvent
+from typing import Dict
 
 class RSIStrategy(Strategy):
     def __init__(self, window: int, oversold: int, overbought: int, symbol: str):
@@ -10,6 +13,11 @@ class RSIStrategy(Strategy):
         self.oversold = oversold
         self.overbought = overbought
         self.symbol = symbol
+        self.rsi_state = RSI(window)
+
+    @property
+    def lookback(self) -> int:
+        return self.window + 1
 
     def rsi(self, prices: pd.Series, window: int) -> pd.Series:
         delta = prices.diff()
@@ -18,30 +26,45 @@ class RSIStrategy(Strategy):
         rs = gain / loss
         return 100 - (100 / (1 + rs))
 
+    def rsi_array(self, prices: np.ndarray, window: int) -> np.ndarray:
+        """Whole-array equivalent of ``rsi`` (read-only, from the indicator cache)"""
+        return self.indicators.rsi(np.asarray(prices), window, self.symbol)
+
     def generate_signals(self, data: pd.DataFrame, events: list, portfolio: Dict) -> list:
         signals = []
 
         if len(data) < self.window + 1:
             return signals
 
-        rsi_values = self.rsi(data[\'close\'], self.window)
+        rsi_values = self.rsi(data['close'], self.window)
         current_rsi = rsi_values.iloc[-1]
 
-        current_pos = portfolio.get(\'current_positions\', {}).get(self.symbol, 0)
+        return self._signals(current_rsi, data.index[-1], portfolio)
+
+    def on_bar(self, bar: Dict, portfolio: Dict) -> list:
+        current_rsi = self.rsi_state.update(bar['close'])
+
+        if not self.rsi_state.ready:
+            return []
+
+        return self._signals(current_rsi, bar['datetime'], portfolio)
+
+    def _signals(self, current_rsi: float, dt: datetime, portfolio: Dict) -> list:
+        signals = []
+
+        current_pos = portfolio.get('current_positions', {}).get(self.symbol, 0)
 
         if current_rsi < self.oversold and current_pos <= 0:
-            signals.append({
-                \'symbol\': self.symbol,
-                \'datetime\': data.index[-1],
-                \'signal_type\': \'LONG\',
-                \'strength\': 1.0
-            })
+            signals.append(SignalEvent(self.symbol, dt, 'LONG', 1.0))
         elif current_rsi > self.overbought and current_pos >= 0:
-            signals.append({
-                \'symbol\': self.symbol,
-                \'datetime\': data.index[-1],
-                \'signal_type\': \'SHORT\',
-                \'strength\': 1.0
-            })
+            signals.append(SignalEvent(self.symbol, dt, 'SHORT', 1.0))
+
+        return signals
+
+    def generate_signals_array(self, data: Dict[str, np.ndarray]) -> np.ndarray:
+        rsi_values = self.rsi_array(data['close'], self.window)
 
+        signals = np.zeros(len(rsi_values), dtype=np.int8)
+        signals[rsi_values < self.oversold] = 1
+        signals[rsi_values > self.overbought] = -1
         return signals
@@ -2,13 +2,25 @@
 import pandas as pd
 import numpy as np
 from .ma import Strategy
+from .indicators import RollingMax, RollingMean
 from datetime import datetime
+from backtester.events import SignalEvent
+from typing import Dict
 
 class VolumeBreakoutStrategy(Strategy):
+    # Long-only: SHORT signals only exit an open long
+    position_limits = (0, 1)
+
     def __init__(self, window: int, volume_multiplier: float, symbol: str):
         self.window = window
         self.volume_multiplier = volume_multiplier
         self.symbol = symbol
+        self.avg_volume = RollingMean(window)
+        self.recent_high = RollingMax(5)
+
+    @property
+    def lookback(self) -> int:
+        return max(self.window, 5)
 
     def generate_signals(self, data: pd.DataFrame, events: list, portfolio: Dict) -> list:
         signals = []
@@ -16,30 +28,50 @@ class VolumeBreakoutStrategy(Strategy):
         if len(data) < self.window:
             return signals
 
-        current_volume = data[\'volume\'].iloc[-1]
-        avg_volume = data[\'volume\'].tail(self.window).mean()
+        current_volume = data['volume'].iloc[-1]
+        avg_volume = data['volume'].tail(self.window).mean()
+        current_price = data['close'].iloc[-1]
+        prev_high = data['high'].tail(5).max()
+
+        return self._signals(current_volume, avg_volume, current_price, prev_high,
+                             data.index[-1], portfolio)
+
+    def on_bar(self, bar: Dict, portfolio: Dict) -> list:
+        avg_volume = self.avg_volume.update(bar['volume'])
+        prev_high = self.recent_high.update(bar['high'])
+
+        if not self.avg_volume.ready:
+            return []
+
+        return self._signals(bar['volume'], avg_volume, bar['close'], prev_high,
+                             bar['datetime'], portfolio)
 
-        current_pos = portfolio.get(\'current_positions\', {}).get(self.symbol, 0)
-        current_price = data[\'close\'].iloc[-1]
-        prev_high = data[\'high\'].tail(5).max()
+    def _signals(self, current_volume: float, avg_volume: float, current_price: float,
+                 prev_high: float, dt: datetime, portfolio: Dict) -> list:
+        signals = []
+
+        current_pos = portfolio.get('current_positions', {}).get(self.symbol, 0)
 
         # Volume breakout above recent high
         if (current_volume > avg_volume * self.volume_multiplier 
             and current_price > prev_high * 0.999 
             and current_pos <= 0):
-            signals.append({
-                \'symbol\': self.symbol,
-                \'datetime\': data.index[-1],
-                \'signal_type\': \'LONG\',
-                \'strength\': 1.0
-            })
+            signals.append(SignalEvent(self.symbol, dt, 'LONG', 1.0))
         # Exit on volume contraction
         elif current_volume < avg_volume * 0.7 and current_pos > 0:
-            signals.append({
-                \'symbol\': self.symbol,
-                \'datetime\': data.index[-1],
-                \'signal_type\': \'SHORT\',
-                \'strength\': 1.0
-            })
+            signals.append(SignalEvent(self.symbol, dt, 'SHORT', 1.0))
+
+        return signals
+
+    def generate_signals_array(self, data: Dict[str, np.ndarray]) -> np.ndarray:
+        volume = np.asarray(data['volume'])
+        closes = np.asarray(data['close'], dtype=float)
+
+        avg_volume = self.indicators.sma(volume, self.window, self.symbol)
+        prev_high = self.indicators.rolling_max(np.asarray(data['high']), 5, self.symbol)
 
+        signals = np.zeros(len(volume), dtype=np.int8)
+        signals[volume < avg_volume * 0.7] = -1
+        signals[(volume > avg_volume * self.volume_multiplier)
+                & (closes > prev_high * 0.999)] = 1
         return signals
@@ -0,0 +1,37 @@
+"""Shared fixtures: synthetic price files and a config pointing at them"""
+import pytest
+from backtester import result_cache
+from benchmarks.synthetic import write_csv, write_universe
+
+STRATEGIES = {
+    'ma': {'short_window': 10, 'long_window': 30},
+    'rsi': {'window': 14, 'oversold': 30, 'overbought': 70},
+    'volume': {'window': 20, 'volume_multiplier': 1.5}
+}
+
+@pytest.fixture(autouse=True)
+def isolated_result_cache(tmp_path, monkeypatch):
+    """Every test gets its own, empty result cache directory"""
+    monkeypatch.setenv('RESULT_CACHE_DIR', str(tmp_path / 'result_cache'))
+    monkeypatch.setattr(result_cache, '_default_cache', None)
+
+@pytest.fixture
+def price_csv(tmp_path):
+    return write_csv(str(tmp_path / 'prices.csv'), 1000, seed=1)
+
+@pytest.fixture
+def universe(tmp_path):
+    return write_universe(str(tmp_path / 'universe'), 3, 300, seed=2, missing=0.1)
+
+@pytest.fixture
+def config(price_csv):
+    return {
+        'data': {'csv_path': price_csv, 'symbol': 'TEST'},
+        'backtest': {
+            'initial_capital': 100000.0,
+            'slippage_bps': 1.0,
+            'commission_per_trade': 1.0,
+            'result_cache': False
+        },
+        'strategies': {name: dict(params) for name, params in STRATEGIES.items()}
+    }
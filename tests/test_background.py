@@ -0,0 +1,71 @@
+import copy
+import os
+import threading
+import numpy as np
+from backtester.background import BacktestRunner, PriceStore
+from backtester.engine import Backtester
+from backtester.result_cache import default_cache
+
+def test_job_matches_direct_run(config):
+    runner = BacktestRunner(max_workers=1, progress_every=100)
+    try:
+        job = runner.submit(copy.deepcopy(config))
+        results = job.wait(30)
+    finally:
+        runner.shutdown(wait=True)
+    expected = Backtester(copy.deepcopy(config)).run_backtest()
+    assert job.error is None and job.done and job.fraction == 1.0
+    assert results['stats'] == expected['stats']
+    np.testing.assert_array_equal(job.equity_curve, expected['equity_curve'])
+
+def test_progress_snapshots_and_cancel(config):
+    runner = BacktestRunner(max_workers=1, progress_every=50)
+    job = runner.submit(config)
+    seen = threading.Event()
+    original = job._report
+
+    def report(snapshot):
+        original(snapshot)
+        seen.set()
+        job.cancel()
+
+    job._report = report
+    try:
+        job.wait(30)
+    finally:
+        runner.shutdown(wait=True)
+    assert seen.is_set()
+    assert job.results is None and job.error is None
+    assert 0 < job.steps < job.bars_total and len(job.equity_curve) > 0
+
+def test_second_run_comes_from_result_cache(config):
+    config['backtest']['result_cache'] = True
+    runner = BacktestRunner(max_workers=1)
+    try:
+        first = runner.submit(copy.deepcopy(config))
+        first.wait(30)
+        second = runner.submit(copy.deepcopy(config))
+        second.wait(30)
+    finally:
+        runner.shutdown(wait=True)
+    assert not first.cached and second.cached
+    assert second.results['stats'] == first.results['stats']
+    # One lookup per job: a miss for the first, a hit for the second
+    info = default_cache().info()
+    assert (info['misses'], info['hits']) == (1, 1)
+
+def test_price_store_reloads_only_changed_files(price_csv):
+    store = PriceStore()
+    index, columns = store.get(price_csv)
+    again = store.get(price_csv)
+    assert again[1]['close'] is columns['close']
+    with open(price_csv) as f:
+        lines = f.readlines()
+    with open(price_csv, 'w') as f:
+        f.writelines(lines[:-1])
+    os.utime(price_csv, ns=(1, 1))
+    reloaded_index, _ = store.get(price_csv)
+    assert len(reloaded_index) == len(index) - 1
+
+def test_price_store_leaves_universes_to_the_engine(universe):
+    assert PriceStore().data_handler({'universe': universe}) is None
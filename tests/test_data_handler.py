@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.data_handler import DataHandler
+
+@pytest.fixture
+def frame(price_csv):
+    return pd.read_csv(price_csv, parse_dates=['datetime']).set_index('datetime')
+
+@pytest.mark.parametrize('use_cache', [True, False])
+def test_bars_follow_the_csv(price_csv, frame, use_cache):
+    handler = DataHandler(price_csv, 'TEST', use_cache)
+    assert handler.bars_total == len(frame)
+    assert handler.get_latest_bar('TEST') is None
+    for i in range(3):
+        bar, = handler.update_bars()
+    assert bar['datetime'] == frame.index[2]
+    assert bar['symbol'] == 'TEST'
+    assert bar['close'] == frame['close'].iloc[2]
+    assert bar.to_dict().keys() == {'datetime', 'symbol', *frame.columns}
+
+def test_columns_are_read_only(price_csv):
+    handler = DataHandler(price_csv, 'TEST')
+    with pytest.raises(ValueError):
+        handler.columns['close'][0] = 0.0
+
+def test_windows_end_at_the_current_bar(price_csv, frame):
+    handler = DataHandler(price_csv, 'TEST')
+    for _ in range(50):
+        handler.update_bars()
+    window = handler.get_window('TEST', 20)
+    np.testing.assert_array_equal(window['close'], frame['close'].to_numpy()[30:50])
+    assert np.shares_memory(window['close'], handler.columns['close'])
+    bars = handler.get_bars('TEST', 100)
+    assert len(bars) == 50 and bars.index[-1] == frame.index[49]
+
+def test_from_arrays_has_its_own_cursor(price_csv):
+    loaded = DataHandler(price_csv, 'TEST')
+    first = DataHandler.from_arrays('TEST', loaded.index, loaded.columns)
+    second = DataHandler.from_arrays('TEST', loaded.index, loaded.columns)
+    first.update_bars()
+    first.update_bars()
+    second.update_bars()
+    assert first.current_bar == 1 and second.current_bar == 0
+    assert first.columns['close'] is second.columns['close']
+
+def test_continue_backtest_stops_at_the_end(price_csv):
+    handler = DataHandler(price_csv, 'TEST')
+    steps = 0
+    while handler.continue_backtest:
+        handler.update_bars()
+        steps += 1
+    assert steps == handler.bars_total
+    assert handler.update_bars() == []
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.data_handler import DataHandler
+from backtester.downloader import (COLUMNS, DataProvider, SymbolStore, SyntheticProvider,
+                                   download, missing_ranges, validate_bars)
+
+class RecordingProvider(DataProvider):
+    """Daily synthetic bars, remembering every requested range"""
+    def __init__(self):
+        self.source = SyntheticProvider('1D')
+        self.requests = []
+
+    def fetch(self, symbol, start, end):
+        self.requests.append((start, end))
+        return self.source.fetch(symbol, start, end)
+
+def day(n):
+    return pd.Timestamp(f'2024-01-{n:02d}')
+
+def fetch_all(provider, store, start, end, symbol='ABC'):
+    provider.requests.clear()
+    result, = download([symbol], provider, store, start, end, workers=1)
+    assert 'error' not in result
+    return result
+
+def expected(start, end, symbol='ABC'):
+    return SyntheticProvider('1D').fetch(symbol, start, end)
+
+def assert_stored(store, start, end):
+    stored = store.load('ABC')
+    want = expected(start, end)
+    np.testing.assert_array_equal(stored.index.as_unit('ns').asi8, want.index.asi8)
+    np.testing.assert_array_equal(stored[COLUMNS].to_numpy(), want[COLUMNS].to_numpy())
+
+def test_disjoint_requests_leave_no_gap(tmp_path):
+    store, provider = SymbolStore(str(tmp_path)), RecordingProvider()
+    fetch_all(provider, store, day(1), day(3))
+    result = fetch_all(provider, store, day(10), day(12))
+    # The gap after the stored range is fetched with the new one
+    assert provider.requests == [(day(2), day(12))]
+    assert result['added'] == 9
+    # Already covered without holes, so nothing is fetched
+    assert fetch_all(provider, store, day(1), day(12))['requests'] == 0
+    assert_stored(store, day(1), day(12))
+
+def test_request_before_the_stored_range_fetches_the_gap(tmp_path):
+    store, provider = SymbolStore(str(tmp_path)), RecordingProvider()
+    fetch_all(provider, store, day(10), day(12))
+    result = fetch_all(provider, store, day(1), day(3))
+    assert provider.requests == [(day(1), day(10))]
+    assert result['rewritten']
+    assert store.coverage('ABC') == {'start': day(1).isoformat(), 'end': day(12).isoformat()}
+    assert_stored(store, day(1), day(12))
+
+def test_extending_the_end_appends(tmp_path):
+    store, provider = SymbolStore(str(tmp_path)), RecordingProvider()
+    fetch_all(provider, store, day(1), day(10))
+    result = fetch_all(provider, store, day(1), day(20))
+    assert provider.requests == [(day(9), day(20))]
+    assert result['added'] == 10 and not result['rewritten']
+    assert fetch_all(provider, store, day(2), day(15))['requests'] == 0
+    assert_stored(store, day(1), day(20))
+    # The store file is a ready-to-use csv_path, and its cache holds the provider's values
+    handler = DataHandler(store.csv_path('ABC'), 'ABC')
+    np.testing.assert_array_equal(handler.columns['close'], expected(day(1), day(20))['close'].to_numpy())
+
+def test_missing_ranges():
+    coverage = {'start': day(5).isoformat(), 'end': day(10).isoformat()}
+    assert missing_ranges(None, None, day(1), day(3)) == [(day(1), day(3))]
+    assert missing_ranges(coverage, day(9), day(6), day(9)) == []
+    assert missing_ranges(coverage, day(9), day(1), day(20)) == [(day(1), day(5)), (day(9), day(20))]
+    assert missing_ranges(coverage, day(9), day(15), day(20)) == [(day(9), day(20))]
+    assert missing_ranges(coverage, None, day(1), day(2)) == [(day(1), day(5))]
+
+def test_validate_drops_bad_rows_and_keeps_prices():
+    index = pd.DatetimeIndex([day(1), day(2), day(3), day(4), day(2), day(5)])
+    bars = pd.DataFrame({
+        'open': [100.123456789, 101.0, -1.0, 100.0, 101.5, 100.0],
+        'high': [101.987654321, 102.0, 101.0, 99.0, 102.5, 101.0],
+        'low': [99.111111111, 100.0, 99.0, 98.0, 100.5, np.nan],
+        'close': [100.555555555, 101.0, 100.0, 100.0, 102.0, 100.0],
+        'volume': [1000, 2000, 3000, 4000, 2500, 5000]
+    }, index=index)
+    valid, dropped = validate_bars(bars)
+    # Negative price, high below close, missing low; the re-sent Jan 2 bar replaces the first
+    assert dropped == 4
+    assert list(valid.index) == [day(1), day(2)]
+    assert valid.loc[day(2), 'open'] == 101.5 and valid['volume'].dtype == np.int64
+    assert valid.loc[day(1), 'open'] == 100.123456789 and valid.loc[day(1), 'high'] == 101.987654321
+
+def test_failures_are_reported_per_symbol(tmp_path):
+    class Failing(RecordingProvider):
+        def fetch(self, symbol, start, end):
+            if symbol == 'BAD':
+                raise ConnectionError("unreachable")
+            return super().fetch(symbol, start, end)
+
+    results = download(['ABC', 'BAD'], Failing(), SymbolStore(str(tmp_path)), day(1), day(5))
+    assert results[0]['rows'] == 4
+    assert results[1] == {'symbol': 'BAD', 'error': 'ConnectionError: unreachable'}
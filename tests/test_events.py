@@ -0,0 +1,30 @@
+import pickle
+import pytest
+from backtester.engine import Backtester
+from backtester.events import EventType, FillEvent, MarketEvent, OrderEvent, SignalEvent
+
+def test_events_are_slotted():
+    signal = SignalEvent('TEST', None, 'LONG')
+    with pytest.raises(AttributeError):
+        signal.extra = 1
+    assert not hasattr(signal, '__dict__')
+    assert signal.type is EventType.SIGNAL
+
+def test_dict_style_access():
+    order = OrderEvent('TEST', None, 'MARKET', 100, 'BUY', strategy='ma')
+    assert order['quantity'] == 100 and order.get('price') is None and order.get('missing', 3) == 3
+    with pytest.raises(KeyError):
+        order['missing']
+    assert order.to_dict()['strategy'] == 'ma'
+
+def test_events_pickle():
+    fill = FillEvent('TEST', None, 'BACKTEST', 100, 'SELL', 99.5, 1.0, 'rsi')
+    assert pickle.loads(pickle.dumps(fill)).to_dict() == fill.to_dict()
+
+def test_dispatch_table_covers_every_event(config):
+    bt = Backtester(config)
+    assert set(bt._handlers) == {MarketEvent, SignalEvent, OrderEvent, FillEvent}
+    results = bt.run_backtest()
+    # Each signal becomes exactly one order and one market fill
+    assert results['signals'] == results['fills'] > 0
+    assert not bt.events_queue
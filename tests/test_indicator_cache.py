@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from strategies.indicator_cache import IndicatorCache, rolling_mean
+
+def read_only(values):
+    values = np.array(values, dtype=float)
+    values.flags.writeable = False
+    return values
+
+def test_memoizes_per_key():
+    cache = IndicatorCache()
+    prices = read_only(np.random.default_rng(0).normal(100, 1, 500))
+    first = cache.sma(prices, 20, symbol='A')
+    np.testing.assert_array_equal(first, rolling_mean(prices, 20))
+    assert cache.sma(prices, 20, symbol='A') is first
+    assert cache.sma(prices, 20, symbol='B') is not first
+    assert cache.sma(prices, 30, symbol='A') is not first
+    assert not first.flags.writeable
+    assert cache.info()['hits'] == 1 and cache.info()['misses'] == 3
+
+def test_read_only_view_of_writable_memory_is_rehashed():
+    cache = IndicatorCache()
+    buffer = np.arange(100, dtype=float)
+    view = buffer[:]
+    view.flags.writeable = False
+    before = cache.sma(view, 5)
+    buffer[:] *= 2
+    after = cache.sma(view, 5)
+    np.testing.assert_array_equal(after, rolling_mean(buffer, 5))
+    assert not np.array_equal(before[4:], after[4:])
+    assert id(view) not in cache._versions
+
+def test_owned_read_only_arrays_keep_their_hash():
+    cache = IndicatorCache()
+    prices = read_only(np.arange(100))
+    cache.sma(prices, 5)
+    assert id(prices) in cache._versions
+    del prices
+    assert not cache._versions
+
+def test_evicts_least_recently_used():
+    prices = read_only(np.arange(1000))
+    cache = IndicatorCache(max_bytes=2 * prices.nbytes)
+    five = cache.sma(prices, 5)
+    cache.sma(prices, 10)
+    cache.sma(prices, 5)
+    cache.sma(prices, 20)
+    assert cache.info()['entries'] == 2 and cache.info()['bytes'] <= 2 * prices.nbytes
+    assert cache.sma(prices, 5) is five
+
+def test_concurrent_requests_compute_once():
+    cache = IndicatorCache()
+    prices = read_only(np.arange(1000))
+    calls = []
+
+    def slow(values, window):
+        calls.append(window)
+        time.sleep(0.05)
+        return rolling_mean(values, window)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: cache.get('slow', prices, 10, compute=slow), range(8)))
+    assert calls == [10]
+    assert all(result is results[0] for result in results)
+
+def test_other_keys_are_not_blocked_by_a_computation():
+    cache = IndicatorCache()
+    prices = read_only(np.arange(1000))
+    started, release = threading.Event(), threading.Event()
+
+    def blocked(values, window):
+        started.set()
+        release.wait(5)
+        return rolling_mean(values, window)
+
+    with ThreadPoolExecutor(1) as pool:
+        future = pool.submit(cache.get, 'blocked', prices, 10, compute=blocked)
+        assert started.wait(5)
+        # Served while the other computation is still running
+        np.testing.assert_array_equal(cache.sma(prices, 10), rolling_mean(prices, 10))
+        assert cache.info()['entries'] == 1
+        release.set()
+        future.result(5)
+    assert cache.info()['entries'] == 2
+
+def test_failed_computation_can_be_retried():
+    cache = IndicatorCache()
+    prices = read_only(np.arange(10))
+
+    def failing(values, window):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get('flaky', prices, 3, compute=failing)
+    assert not cache._pending
+    np.testing.assert_array_equal(cache.get('flaky', prices, 3, compute=rolling_mean),
+                                  rolling_mean(prices, 3))
@@ -0,0 +1,49 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.engine import Backtester
+from strategies.indicators import RSI, RollingMax, RollingMean, RollingSum
+
+VALUES = np.random.default_rng(3).normal(100, 5, 500)
+
+def streamed(indicator, values):
+    return np.array([indicator.update(value) for value in values])
+
+def test_rolling_mean_matches_pandas():
+    expected = pd.Series(VALUES).rolling(20).mean().to_numpy()
+    np.testing.assert_allclose(streamed(RollingMean(20), VALUES), expected, equal_nan=True)
+
+def test_rolling_sum_does_not_drift():
+    values = np.tile([1e9, 1.0, -1e9, 3.0], 25_000)
+    rolling = RollingSum(4)
+    for value in values:
+        rolling.update(value)
+    assert rolling.value == pytest.approx(4.0, abs=1e-9)
+
+def test_rolling_max_matches_pandas():
+    expected = pd.Series(VALUES).rolling(15, min_periods=1).max().to_numpy()
+    np.testing.assert_array_equal(streamed(RollingMax(15), VALUES), expected)
+
+def test_rsi_matches_pandas_sma_rsi():
+    delta = pd.Series(VALUES).diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    expected = (100 - 100 / (1 + gain / loss)).to_numpy()
+    actual = streamed(RSI(14), VALUES)
+    # pandas counts the undefined first change as 0; the stream waits for 14 real changes
+    assert np.isnan(actual[:14]).all()
+    np.testing.assert_allclose(actual[14:], expected[14:])
+
+def test_rsi_flat_prices():
+    rsi = RSI(3)
+    assert all(math.isnan(rsi.update(10.0)) for _ in range(10))
+
+@pytest.mark.parametrize('strategy', ['ma', 'rsi', 'volume'])
+def test_on_bar_matches_generate_signals(config, strategy):
+    config['backtest']['strategies'] = [strategy]
+    incremental = Backtester(config).run_backtest()
+    config['backtest']['incremental_indicators'] = False
+    legacy = Backtester(config).run_backtest()
+    assert incremental['stats'] == legacy['stats']
+    np.testing.assert_allclose(incremental['equity_curve'], legacy['equity_curve'])
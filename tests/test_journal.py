@@ -0,0 +1,80 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from backtester.engine import Backtester
+from backtester.events import FillEvent
+from backtester.journal import SCHEMAS, ColumnFileWriter, JournalReader, TradeJournal, read_column_file
+
+def run_with_journal(config, directory, strategies=None):
+    config['backtest'].update(journal=str(directory), journal_buffer_size=16)
+    if strategies:
+        config['backtest']['strategies'] = strategies
+    backtester = Backtester(config)
+    results = backtester.run_backtest()
+    return backtester, results
+
+def test_single_strategy_journal(config, tmp_path):
+    backtester, results = run_with_journal(config, tmp_path / 'journal')
+    reader = JournalReader(str(tmp_path / 'journal'))
+    fills = reader.fills()
+    assert len(fills) == results['fills'] == reader.meta['rows']['fills']
+    assert list(fills.columns[:3]) == ['datetime', 'symbol', 'strategy']
+    assert fills['strategy'].isna().all() and (fills['symbol'] == 'TEST').all()
+    trades = backtester.portfolio.trades
+    np.testing.assert_array_equal(fills['fill_price'], trades.column('fill_price'))
+    assert len(reader.signals()) == results['signals']
+
+def test_multi_strategy_journal_names_each_record(config, tmp_path):
+    backtester, _ = run_with_journal(config, tmp_path / 'journal', ['ma', 'rsi', 'volume'])
+    reader = JournalReader(str(tmp_path / 'journal'))
+    assert set(reader.strategies) <= {'ma', 'rsi', 'volume'}
+    fills = reader.fills()
+    assert fills['strategy'].notna().all()
+    assert fills['strategy'].value_counts().to_dict() == {
+        name: count for name, count in backtester.strategy_fill_counts.items() if count}
+    signals = reader.signals()
+    assert signals['strategy'].value_counts().to_dict() == {
+        name: count for name, count in backtester.strategy_signal_counts.items() if count}
+
+def test_blocks_and_truncated_tail(tmp_path):
+    path = str(tmp_path / 'fills.col')
+    writer = ColumnFileWriter(path, SCHEMAS['fills'], buffer_size=4)
+    for i in range(10):
+        writer.append(i, 0, 1, 100 + i, 1, 10.0 + i, 1.0)
+    writer.close()
+    assert writer.rows_written == 10
+    columns = read_column_file(path, SCHEMAS['fills'])
+    np.testing.assert_array_equal(columns['quantity'], np.arange(100, 110))
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 3)
+    # The partial last block (2 rows) is dropped, the full ones survive
+    assert len(read_column_file(path, SCHEMAS['fills'])['datetime']) == 8
+
+def test_reads_version_1_journals(tmp_path):
+    schema = {name: dtype for name, dtype in SCHEMAS['fills'].items() if name != 'strategy_id'}
+    writer = ColumnFileWriter(str(tmp_path / 'fills.col'), schema)
+    writer.append(pd.Timestamp('2024-01-02').value, 0, 5, -1, 99.5, 1.0)
+    writer.close()
+    with open(tmp_path / 'meta.json', 'w') as f:
+        json.dump({'version': 1, 'symbols': ['ABC'], 'schemas': {'fills': schema}, 'rows': {'fills': 1}}, f)
+    fills = JournalReader(str(tmp_path)).fills()
+    assert 'strategy' not in fills
+    assert fills.iloc[0].to_dict() == {'datetime': pd.Timestamp('2024-01-02'), 'symbol': 'ABC',
+                                       'quantity': 5, 'direction': 'SELL', 'fill_price': 99.5,
+                                       'commission': 1.0}
+
+def test_reopening_discards_the_previous_run(config, tmp_path):
+    directory = tmp_path / 'journal'
+    run_with_journal(config, directory, ['ma', 'rsi'])
+    assert JournalReader(str(directory)).strategies
+    journal = TradeJournal(str(directory), buffer_size=1)
+    journal.record_fill(FillEvent('NEW', pd.Timestamp('2024-01-02'), 'X', 3, 'BUY', 10.0, 1.0))
+    # Read mid-run (or after a crash): no stale meta.json labels the new rows
+    reader = JournalReader(str(directory))
+    assert reader.strategies == [] and reader.meta['rows'] == {}
+    fills = reader.fills()
+    assert len(fills) == 1 and fills['quantity'].iloc[0] == 3
+    assert fills['symbol'].iloc[0] is None and fills['strategy'].iloc[0] is None
+    journal.close()
+    assert JournalReader(str(directory)).fills()['symbol'].tolist() == ['NEW']
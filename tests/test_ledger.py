@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.events import FillEvent
+from backtester.ledger import ColumnLedger
+from backtester.portfolio import Portfolio
+
+def test_ledger_grows_and_pads():
+    ledger = ColumnLedger({'x': 'int64', 'positions': ('int64', 1)}, capacity=2)
+    for i in range(5):
+        ledger.ensure_width('positions', i + 1)
+        ledger.append(x=i, positions=np.arange(i + 1))
+    assert len(ledger) == 5
+    np.testing.assert_array_equal(ledger.column('x'), np.arange(5))
+    assert ledger.column('positions')[0, 1:].sum() == 0
+    with pytest.raises(ValueError):
+        ledger.column('x')[0] = 9
+    assert list(ledger.to_frame().columns) == ['x']
+
+def bar(minute, close, symbol='TEST'):
+    return {'datetime': pd.Timestamp('2024-01-01') + pd.Timedelta(minutes=minute), 'symbol': symbol, 'close': close}
+
+def test_portfolio_accounting():
+    portfolio = Portfolio(10000.0, 0.0, 1.0)
+    portfolio.update_timeindex(bar(0, 100.0))
+    portfolio.execute_fill(FillEvent('TEST', bar(0, 0)['datetime'], 'X', 10, 'BUY', 100.0, 1.0))
+    portfolio.update_timeindex(bar(1, 110.0))
+    portfolio.execute_fill(FillEvent('TEST', bar(1, 0)['datetime'], 'X', 10, 'SELL', 110.0, 1.0))
+    portfolio.update_timeindex(bar(2, 120.0))
+    np.testing.assert_allclose(portfolio.equity_curve, [9999.0, 10098.0, 10098.0])
+    assert portfolio.stats['wins'] == 1 and portfolio.stats['gross_wins'] == pytest.approx(100.0)
+    trades = portfolio.trades_frame()
+    assert trades['direction'].tolist() == ['BUY', 'SELL'] and trades['pnl'].tolist() == [0.0, 100.0]
+    assert portfolio.all_positions['TEST'].tolist() == [10, 0, 0]
+
+def test_reversal_realizes_and_reopens():
+    portfolio = Portfolio(10000.0, 0.0, 0.0)
+    portfolio.update_timeindex(bar(0, 50.0))
+    portfolio.execute_fill(FillEvent('TEST', bar(0, 0)['datetime'], 'X', 5, 'SELL', 50.0))
+    portfolio.execute_fill(FillEvent('TEST', bar(0, 0)['datetime'], 'X', 10, 'BUY', 40.0))
+    assert portfolio.current_positions['TEST'] == 5
+    assert portfolio.current_holdings['TEST']['avg_price'] == 40.0
+    assert portfolio.trades_frame()['pnl'].iloc[-1] == pytest.approx(50.0)
+
+def test_history_can_be_off(config):
+    from backtester.engine import Backtester
+    recorded = Backtester(config).run_backtest()
+    config['backtest']['record_history'] = False
+    unrecorded = Backtester(config).run_backtest()
+    assert len(unrecorded['equity_curve']) == 0
+    assert unrecorded['metrics']['total_return'] == pytest.approx(recorded['metrics']['total_return'])
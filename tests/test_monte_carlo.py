@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from backtester.engine import Backtester
+from backtester.monte_carlo import block_bootstrap, cost_perturbation, run_monte_carlo, summarize, trade_shuffles
+from backtester.performance import calculate_sharpe_ratio
+
+PNL = np.array([120.0, -50.0, 30.0, -80.0, 200.0, 10.0])
+
+def test_trade_shuffles_keep_the_total():
+    metrics = trade_shuffles(PNL, 10_000.0, n_paths=300, chunk_size=64, rng=np.random.default_rng(0))
+    assert metrics['total_return'].shape == (300,)
+    np.testing.assert_allclose(metrics['total_return'], PNL.sum() / 10_000.0 * 100)
+    assert metrics['max_drawdown_pct'].min() < metrics['max_drawdown_pct'].max()
+
+def test_trade_shuffle_sharpe_uses_trade_frequency():
+    rng = np.random.default_rng(1)
+    daily = trade_shuffles(PNL, 10_000.0, n_paths=50, rng=rng)
+    monthly = trade_shuffles(PNL, 10_000.0, n_paths=50, rng=np.random.default_rng(1), trades_per_year=12)
+    np.testing.assert_allclose(monthly['sharpe_ratio'], daily['sharpe_ratio'] * np.sqrt(12 / 252))
+
+def test_block_bootstrap_of_constant_returns_is_exact():
+    returns = np.full(100, 0.001)
+    metrics = block_bootstrap(returns, 1000.0, n_paths=20, block_size=7, rng=np.random.default_rng(2))
+    np.testing.assert_allclose(metrics['total_return'], (1.001 ** 100 - 1) * 100)
+    assert (metrics['max_drawdown_pct'] == 0).all()
+
+def test_run_monte_carlo_on_a_backtest(config):
+    config['backtest']['record_history'] = True
+    backtester = Backtester(config)
+    backtester.run_backtest()
+    portfolio = backtester.portfolio
+    results = run_monte_carlo(portfolio, n_paths=200, chunk_size=64, seed=3)
+    assert set(results) == {'block_bootstrap', 'cost_perturbation', 'trade_shuffles'}
+
+    # Cost scales of exactly 1 reproduce the realized curve
+    unscaled = run_monte_carlo(portfolio, n_paths=5, scale_range=(1.0, 1.0), seed=3)['cost_perturbation']
+    final_return = (portfolio.equity_curve[-1] / portfolio.initial_capital - 1) * 100
+    np.testing.assert_allclose(unscaled['total_return'], final_return)
+
+    # Trade Sharpe is annualized per fill: n fills over n_bars daily bars
+    trades = portfolio.trades
+    net = trades.column('pnl') - trades.column('commission')
+    equity = np.concatenate([[portfolio.initial_capital], portfolio.initial_capital + np.cumsum(net)])
+    per_trade = calculate_sharpe_ratio(np.diff(equity) / equity[:-1]) / np.sqrt(252)
+    trades_per_year = len(trades) * 252 / (len(portfolio.equity_curve) - 1)
+    assert np.median(results['trade_shuffles']['sharpe_ratio']) == pytest.approx(
+        per_trade * np.sqrt(trades_per_year), rel=0.5)
+
+    table = summarize(results)
+    assert len(table) == 9 and {'mean', 'p5', 'p95'} <= set(table.columns)
+
+def test_needs_an_equity_history(config):
+    config['backtest']['record_history'] = False
+    backtester = Backtester(config)
+    backtester.run_backtest()
+    with pytest.raises(ValueError, match='record_history'):
+        run_monte_carlo(backtester.portfolio, n_paths=10)
+
+def test_cost_perturbation_leaves_limit_fill_prices_alone(config):
+    config['backtest'].update(record_history=True, orders={'type': 'limit', 'offset_bps': 5,
+                                                           'expire_bars': 3, 'take_profit_bps': 30})
+    backtester = Backtester(config)
+    backtester.run_backtest()
+    portfolio = backtester.portfolio
+    slipped = portfolio.trades.column('slipped')
+    assert len(slipped) and not slipped.any()
+    # Only limit fills: with commission fixed, scaling slippage changes nothing
+    results = run_monte_carlo(portfolio, n_paths=20, scale_range=(1.0, 1.0), seed=5)['cost_perturbation']
+    final_return = (portfolio.equity_curve[-1] / portfolio.initial_capital - 1) * 100
+    np.testing.assert_allclose(results['total_return'], final_return)
+    fill_bars = np.arange(len(slipped))
+    equity = np.full(len(slipped), portfolio.initial_capital)
+    args = (equity, fill_bars, portfolio.trades.column('direction'), portfolio.trades.column('quantity'),
+            portfolio.trades.column('fill_price'), 10.0, 0.0)
+    limit_only = cost_perturbation(*args, n_paths=10, scale_range=(0.5, 3.0),
+                                   rng=np.random.default_rng(6), slipped=slipped)
+    assert np.ptp(limit_only['total_return']) == 0
+    assumed_market = cost_perturbation(*args, n_paths=10, scale_range=(0.5, 3.0), rng=np.random.default_rng(6))
+    assert np.ptp(assumed_market['total_return']) > 0
+
+def test_stop_fills_are_marked_slipped(config):
+    config['backtest'].update(orders={'type': 'stop', 'offset_bps': 5, 'expire_bars': 3})
+    backtester = Backtester(config)
+    backtester.run_backtest()
+    slipped = backtester.portfolio.trades.column('slipped')
+    assert len(slipped) and slipped.all()
@@ -0,0 +1,44 @@
+import copy
+import numpy as np
+import pytest
+from backtester.engine import Backtester
+
+NAMES = ['ma', 'rsi', 'volume']
+
+def run(config, **backtest):
+    config = copy.deepcopy(config)
+    config['backtest'].update(backtest)
+    backtester = Backtester(config)
+    return backtester, backtester.run_backtest()
+
+def test_results_can_be_taken_twice(config):
+    backtester, results = run(config, strategies=NAMES)
+    again = backtester._results()
+    assert again['metrics'] == results['metrics']
+    per_strategy = [result['metrics'] for result in results['strategies'].values()]
+    wins = sum(metrics['win_rate'] * metrics['num_trades'] for metrics in per_strategy) / 100
+    assert wins > 0
+    assert results['metrics']['win_rate'] == pytest.approx(wins / results['metrics']['num_trades'] * 100)
+
+def test_independent_strategies_equal_standalone_runs(config):
+    _, results = run(config, strategies=NAMES, allocation='independent')
+    for name in NAMES:
+        _, alone = run(config, strategies=[name])
+        result = results['strategies'][name]
+        assert result['stats'] == alone['stats']
+        assert result['fills'] == alone['fills'] and result['signals'] == alone['signals']
+        np.testing.assert_allclose(result['equity_curve'], alone['equity_curve'])
+    np.testing.assert_allclose(results['equity_curve'],
+                               sum(results['strategies'][name]['equity_curve'] for name in NAMES))
+    assert results['fills'] == sum(results['strategies'][name]['fills'] for name in NAMES)
+
+def test_split_allocation_follows_weights(config):
+    _, results = run(config, strategies=['ma', 'rsi'], weights={'ma': 3, 'rsi': 1})
+    capital = {name: result['initial_capital'] for name, result in results['strategies'].items()}
+    assert capital == {'ma': 75000.0, 'rsi': 25000.0}
+    assert results['equity_curve'][0] == pytest.approx(100000.0, rel=1e-3)
+
+def test_unknown_allocation_is_rejected(config):
+    config['backtest'].update(strategies=NAMES, allocation='kelly')
+    with pytest.raises(ValueError, match='allocation'):
+        Backtester(config).run_backtest()
@@ -0,0 +1,148 @@
+import copy
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.engine import Backtester
+from backtester.events import OrderEvent
+from backtester.execution import ExecutionHandler
+from backtester.order_book import GOOD_TILL_CANCELLED, OrderBook
+
+STAMP = pd.Timestamp('2024-01-02')
+
+def bar(symbol, open_, high, low, i=0):
+    return {'symbol': symbol, 'datetime': STAMP + pd.Timedelta(minutes=i),
+            'open': open_, 'high': high, 'low': low}
+
+def order(order_type, direction, price, symbol='A', quantity=10, strategy=None, **bracket):
+    return OrderEvent(symbol, STAMP, order_type, quantity, direction, strategy=strategy,
+                      price=price, **bracket)
+
+@pytest.fixture
+def book():
+    return OrderBook(ExecutionHandler(0.0, 1.0))
+
+def test_limit_fills_at_the_better_of_open_and_limit(book):
+    book.add(order('LIMIT', 'BUY', 99.0))
+    book.add(order('LIMIT', 'SELL', 103.0))
+    assert book.match([bar('A', 100.0, 101.0, 99.5)]) == []
+    # Gap down through the buy limit: filled at the open
+    fills = book.match([bar('A', 98.0, 104.0, 97.0, 1)])
+    assert sorted((f.direction, f.fill_price) for f in fills) == [('BUY', 98.0), ('SELL', 103.0)]
+    assert all(f.commission == 1.0 for f in fills) and len(book) == 0
+
+def test_stop_fills_at_the_worse_of_open_and_stop_with_slippage():
+    book = OrderBook(ExecutionHandler(10.0, 0.0))
+    book.add(order('STOP', 'BUY', 101.0))
+    fill, = book.match([bar('A', 102.0, 103.0, 101.5)])
+    expected = ExecutionHandler(10.0, 0.0).execute_orders(np.array([1]), np.array([102.0]))[0]
+    assert fill.fill_price == pytest.approx(expected) and fill.fill_price > 102.0
+
+def test_bracket_exits_go_live_after_the_entry_fills(book):
+    book.add(order('LIMIT', 'BUY', 100.0, take_profit=105.0, stop_loss=95.0))
+    assert len(book) == 3
+    # The entry bar reaches both exit prices, but the exits only go live afterwards
+    entry, = book.match([bar('A', 101.0, 106.0, 94.0)])
+    assert entry.direction == 'BUY' and entry.fill_price == 100.0
+    exit_fill, = book.match([bar('A', 104.0, 105.5, 103.0, 1)])
+    assert (exit_fill.direction, exit_fill.fill_price) == ('SELL', 105.0)
+    assert len(book) == 0
+
+def test_stop_loss_wins_when_both_exits_trigger(book):
+    book.add_exits(order('MARKET', 'BUY', None, take_profit=105.0, stop_loss=95.0))
+    fill, = book.match([bar('A', 100.0, 106.0, 94.0)])
+    assert fill.direction == 'SELL' and fill.fill_price == 95.0
+    assert len(book) == 0 and book.match([bar('A', 100.0, 110.0, 90.0, 1)]) == []
+
+def test_expiry_counts_only_bars_of_the_order_symbol(book):
+    book.add(order('LIMIT', 'BUY', 90.0, take_profit=120.0), expire_bars=2)
+    book.add(order('LIMIT', 'BUY', 90.0, symbol='B'), expire_bars=GOOD_TILL_CANCELLED)
+    book.match([bar('B', 100.0, 101.0, 99.0)])
+    assert len(book) == 3
+    book.match([bar('A', 100.0, 101.0, 99.0)])
+    assert len(book) == 3
+    # The entry expires, taking its waiting exit with it
+    book.match([bar('A', 100.0, 101.0, 99.0, 1)])
+    assert len(book) == 1
+
+def test_cancel_is_per_symbol_and_strategy(book):
+    book.add(order('LIMIT', 'BUY', 90.0, strategy='ma'))
+    book.add(order('LIMIT', 'BUY', 90.0, strategy='rsi'))
+    book.add(order('LIMIT', 'BUY', 90.0, symbol='B', strategy='ma'))
+    assert book.cancel('A', 'ma') == 1 and len(book) == 2
+    fill, = book.match([bar('A', 95.0, 96.0, 89.0)])
+    assert fill.strategy == 'rsi'
+
+def test_cancel_for_an_unknown_strategy_leaves_the_book_alone(book):
+    book.add(order('LIMIT', 'BUY', 90.0))
+    book.add(order('LIMIT', 'BUY', 90.0, strategy='ma'))
+    assert book.cancel('A', 'rsi') == 0 and len(book) == 2
+    assert book.cancel('A') == 1 and len(book) == 1
+
+def test_order_types_are_case_insensitive(config, monkeypatch):
+    config['backtest']['strategies'] = ['ma']
+    runs = {}
+    for order_type in ['market', 'MARKET', 'limit', 'Limit']:
+        run_config = copy.deepcopy(config)
+        run_config['backtest']['orders'] = {'type': order_type}
+        runs[order_type] = Backtester(run_config).run_backtest()['stats']
+    assert runs['market'] == runs['MARKET'] and runs['limit'] == runs['Limit']
+
+    # Market orders, however they are spelled, never go through the order book
+    monkeypatch.setattr(OrderBook, 'cancel', None)
+    config['backtest']['orders'] = {'type': 'Market'}
+    assert Backtester(config).run_backtest()['stats'] == runs['market']
+
+def test_compaction_keeps_the_arrays_near_the_live_size(book):
+    for i in range(200):
+        book.add(order('LIMIT', 'BUY', 50.0 + i % 2))
+    book.add(order('LIMIT', 'BUY', 10.0))
+    assert book.size == 201
+    fills = book.match([bar('A', 60.0, 61.0, 49.0)])
+    assert len(fills) == 200 and len(book) == 1 and book.size == 1
+    assert book._arrays['price'][0] == 10.0
+    fill, = book.match([bar('A', 12.0, 13.0, 9.0, 1)])
+    assert fill.fill_price == 10.0
+
+def reference_fills(orders, bars):
+    """Order-by-order matching of plain limits and stops, as documented on OrderBook"""
+    handler = ExecutionHandler(5.0, 1.0)
+    resting = list(orders)
+    fills = []
+    for i, step in enumerate(bars):
+        by_symbol = {b['symbol']: b for b in step}
+        still = []
+        for kind, direction, price, symbol in resting:
+            b = by_symbol.get(symbol)
+            down = (direction == 'BUY') == (kind == 'LIMIT')
+            if b is None or not (b['low'] <= price if down else b['high'] >= price):
+                still.append((kind, direction, price, symbol))
+                continue
+            fill = min(b['open'], price) if down else max(b['open'], price)
+            if kind == 'STOP':
+                fill = handler.execute_orders(np.array([1 if direction == 'BUY' else -1]), np.array([fill]))[0]
+            fills.append((i, symbol, direction, round(fill, 9)))
+        resting = still
+    return fills
+
+def test_vectorized_matching_equals_reference():
+    rng = np.random.default_rng(4)
+    symbols = ['A', 'B', 'C']
+    orders = [(str(rng.choice(['LIMIT', 'STOP'])), str(rng.choice(['BUY', 'SELL'])),
+               float(np.round(rng.uniform(90, 110), 2)), str(rng.choice(symbols))) for _ in range(300)]
+    bars = []
+    for i in range(60):
+        step = []
+        for symbol in symbols:
+            if rng.random() < 0.8:
+                open_ = rng.uniform(95, 105)
+                step.append(bar(symbol, open_, open_ + rng.uniform(0, 3), open_ - rng.uniform(0, 3), i))
+        bars.append(step)
+
+    book = OrderBook(ExecutionHandler(5.0, 1.0), capacity=8)
+    for kind, direction, price, symbol in orders:
+        book.add(order(kind, direction, price, symbol=symbol))
+    fills = []
+    for i, step in enumerate(bars):
+        fills.extend((i, f.symbol, f.direction, round(f.fill_price, 9)) for f in book.match(step))
+    assert sorted(fills) == sorted(reference_fills(orders, bars))
+    assert len(book) == len(orders) - len(fills)
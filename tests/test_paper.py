@@ -0,0 +1,98 @@
+import asyncio
+import copy
+import socket
+import time
+import pandas as pd
+import pytest
+from backtester.data_handler import DataHandler, LiveDataHandler
+from backtester.engine import Backtester
+from backtester.paper import PaperTrader, ReplayFeed, SocketFeed, replay_feed, serve_feed
+from benchmarks.synthetic import write_csv
+
+def backtest(config):
+    return Backtester(copy.deepcopy(config)).run_backtest()
+
+def test_block_mode_equals_a_backtest(config):
+    config['paper'] = {'queue_size': 4, 'overflow': 'block'}
+    results = PaperTrader(config, replay_feed(config, speed=0)).run_backtest()
+    expected = backtest(config)
+    assert results['stats'] == expected['stats']
+    assert results['fills'] == expected['fills'] and results['signals'] == expected['signals']
+    feed = results['feed']
+    assert feed['received'] == feed['processed'] == 1000
+    assert feed['dropped'] == feed['skipped'] == 0 and feed['max_queue'] <= 4
+    assert results['latency']['tick_to_processed']['count'] == 1000
+    assert results['latency']['tick_to_fill']['count'] == results['fills']
+
+def test_multi_strategy_paper_run(config):
+    config['backtest']['strategies'] = ['ma', 'rsi']
+    results = PaperTrader(config, replay_feed(config, speed=0)).run_backtest()
+    expected = backtest(config)
+    assert results['stats'] == expected['stats']
+    assert set(results['strategies']) == {'ma', 'rsi'}
+
+def test_drop_oldest_sheds_bars_behind_a_slow_strategy(config):
+    config['paper'] = {'queue_size': 2, 'overflow': 'drop_oldest'}
+    trader = PaperTrader(config, replay_feed(config, speed=0))
+    on_tick = trader._on_tick
+
+    def slow_tick(received_ns, bar):
+        time.sleep(0.0005)
+        on_tick(received_ns, bar)
+
+    trader._on_tick = slow_tick
+    feed = trader.run_backtest()['feed']
+    assert feed['dropped'] > 0 and feed['max_queue'] == 2
+    assert feed['received'] == 1000 == feed['processed'] + feed['dropped']
+
+def test_unknown_overflow_is_rejected(config):
+    config['paper'] = {'overflow': 'drop_newest'}
+    with pytest.raises(ValueError, match='overflow'):
+        PaperTrader(config, replay_feed(config, speed=0))
+
+def test_replay_speed_paces_the_feed(tmp_path):
+    # 5-minute bars at 60000x: 20 bars span about 0.1 s of wall time
+    handler = DataHandler(write_csv(str(tmp_path / 'short.csv'), 20), 'TEST')
+
+    async def consume():
+        started = time.perf_counter()
+        bars = [bar async for bar in ReplayFeed(handler, speed=60_000).bars()]
+        return bars, time.perf_counter() - started
+
+    bars, elapsed = asyncio.run(consume())
+    assert len(bars) == 20 and elapsed >= 19 * 300 / 60_000 * 0.9
+
+def test_socket_feed_equals_a_backtest(config):
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+
+    async def run():
+        server = asyncio.create_task(serve_feed(lambda: replay_feed(config, 0), port=port))
+        await asyncio.sleep(0.2)
+        try:
+            return await PaperTrader(config, SocketFeed('127.0.0.1', port)).run()
+        finally:
+            server.cancel()
+
+    results = asyncio.run(run())
+    assert results['feed']['received'] == 1000
+    assert results['stats'] == backtest(config)['stats']
+
+def test_live_handler_counts_skipped_bars():
+    handler = LiveDataHandler(['A'], lookback=3)
+    stamp = pd.Timestamp('2024-01-02 09:15')
+
+    def bar(symbol, minutes):
+        return {'datetime': stamp + pd.Timedelta(minutes=minutes), 'symbol': symbol, 'open': 1.0,
+                'high': 1.0, 'low': 1.0, 'close': 1.0 + minutes, 'volume': 10}
+
+    for pushed in (bar('A', 0), bar('B', 1), bar('A', 1), bar('A', 1), bar('A', 0), bar('A', 2)):
+        handler.push(pushed)
+    assert handler.continue_backtest
+    delivered = handler.update_bars()
+    assert len(delivered) == 3 and handler.skipped == 3 and handler.current_bar == 2
+    assert not handler.continue_backtest
+    handler.push(bar('A', 3))
+    handler.update_bars()
+    assert list(handler.get_window('A', 10)['close']) == [2.0, 3.0, 4.0]
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from backtester.performance import OnlineMetrics, calculate_max_drawdown, create_tearsheet
+
+def curve(seed=0, n=500):
+    return 100000 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, n)))
+
+def test_online_metrics_match_batch_tearsheet():
+    equity = curve()
+    metrics = OnlineMetrics()
+    for value in equity:
+        metrics.update(value)
+    stats = {'total_trades': 4, 'wins': 3}
+    metrics.wins = 3
+    online, batch = metrics.tearsheet(stats), create_tearsheet(stats, equity)
+    assert online['sharpe_ratio'] == pytest.approx(batch['sharpe_ratio'])
+    assert online['total_return'] == pytest.approx(batch['total_return'])
+    assert online['max_drawdown']['max_drawdown'] == pytest.approx(batch['max_drawdown']['max_drawdown'])
+    assert online['win_rate'] == batch['win_rate'] == 75.0
+
+def test_batched_tearsheet_matches_single_rows():
+    curves = np.stack([curve(seed) for seed in range(4)])
+    stats = [{'total_trades': i, 'wins': i // 2} for i in range(4)]
+    batch = create_tearsheet(stats, curves)
+    for i in range(4):
+        single = create_tearsheet(stats[i], curves[i])
+        assert batch['sharpe_ratio'][i] == pytest.approx(single['sharpe_ratio'])
+        assert batch['max_drawdown']['max_drawdown_pct'][i] == pytest.approx(single['max_drawdown']['max_drawdown_pct'])
+
+def test_drawdown():
+    assert calculate_max_drawdown([100, 120, 90, 130])['max_drawdown_pct'] == pytest.approx(25.0)
+
+def test_trade_tallies():
+    metrics = OnlineMetrics()
+    for pnl in (10.0, -4.0, 0.0, 6.0):
+        metrics.record_trade(pnl)
+    assert (metrics.wins, metrics.losses, metrics.gross_wins, metrics.gross_losses) == (2, 1, 16.0, 4.0)
+
+def test_flat_curve_has_zero_sharpe():
+    metrics = OnlineMetrics()
+    for _ in range(10):
+        metrics.update(100.0)
+    assert metrics.sharpe_ratio == 0.0
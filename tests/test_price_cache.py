@@ -0,0 +1,40 @@
+import os
+import numpy as np
+import pandas as pd
+from backtester.price_cache import build_cache, default_cache_dir, is_cache_valid, load_cache, load_prices
+
+def test_cache_matches_csv(price_csv):
+    index, columns = load_prices(price_csv)
+    frame = pd.read_csv(price_csv, parse_dates=['datetime']).set_index('datetime')
+    assert index.equals(frame.index)
+    for name in frame.columns:
+        np.testing.assert_array_equal(columns[name], frame[name].to_numpy())
+        assert isinstance(columns[name], np.memmap) and not columns[name].flags.writeable
+
+def test_cache_rebuilt_when_csv_changes(price_csv):
+    load_prices(price_csv)
+    assert is_cache_valid(price_csv)
+    frame = pd.read_csv(price_csv)
+    frame.iloc[:10].to_csv(price_csv, index=False)
+    assert not is_cache_valid(price_csv)
+    index, _ = load_prices(price_csv)
+    assert len(index) == 10
+
+def test_touched_csv_keeps_cache(price_csv):
+    build_cache(price_csv)
+    stat = os.stat(price_csv)
+    os.utime(price_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert is_cache_valid(price_csv)
+
+def test_missing_meta_is_never_trusted(price_csv):
+    cache_dir = build_cache(price_csv)
+    os.remove(os.path.join(cache_dir, 'meta.json'))
+    assert not is_cache_valid(price_csv)
+
+def test_timezone_survives(tmp_path):
+    path = str(tmp_path / 'tz.csv')
+    index = pd.date_range('2024-01-01 09:15', periods=5, freq='5min', tz='Asia/Kolkata', name='datetime')
+    pd.DataFrame({'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10}, index=index).to_csv(path)
+    loaded, _ = load_cache(build_cache(path))
+    assert loaded.equals(pd.read_csv(path, parse_dates=['datetime'])['datetime'].pipe(pd.DatetimeIndex))
+    assert default_cache_dir(path).endswith(os.path.join('.price_cache', 'tz.csv'))
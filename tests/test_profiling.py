@@ -0,0 +1,61 @@
+import json
+import numpy as np
+import pytest
+from backtester.engine import Backtester
+from backtester.profiling import STAGES, LatencyHistogram, StageProfiler
+
+def test_profiled_run_reports_every_stage(config):
+    plain = Backtester(config).run_backtest()
+    config['backtest']['profile'] = True
+    bt = Backtester(config)
+    results = bt.run_backtest()
+    assert results['stats'] == plain['stats']
+    stages = results['profile']['stages']
+    assert set(STAGES) <= set(stages)
+    assert stages['data_advance']['calls'] == bt.data_handler.bars_total
+    assert stages['execution']['calls'] == results['fills']
+    assert results['profile']['wall_s'] >= sum(stage['total_s'] for stage in stages.values())
+
+def test_instrument_wraps_instance_only():
+    class Counter:
+        def tick(self, n):
+            return n + 1
+    profiler = StageProfiler()
+    counter, other = Counter(), Counter()
+    profiler.instrument(counter, 'tick', 'strategy')
+    assert counter.tick(1) == 2 and other.tick(1) == 2
+    assert profiler.calls['strategy'] == 1
+    assert 'tick' not in vars(other)
+
+def test_export_formats(tmp_path):
+    profiler = StageProfiler()
+    profiler.start()
+    profiler.wrap('strategy', sum)([1, 2])
+    profiler.stop()
+    profiler.export(str(tmp_path / 'profile.json'))
+    assert json.loads((tmp_path / 'profile.json').read_text())['stages']['strategy']['calls'] == 1
+    profiler.export(str(tmp_path / 'profile.folded'))
+    lines = (tmp_path / 'profile.folded').read_text().splitlines()
+    assert all(line.startswith('run_backtest;') for line in lines)
+
+def test_latency_percentiles_are_bucket_upper_bounds():
+    samples = np.random.default_rng(0).lognormal(np.log(50_000), 1.0, 10_000).astype(np.int64)
+    histogram = LatencyHistogram()
+    for nanos in samples:
+        histogram.record(int(nanos))
+    for q in (50, 90, 99):
+        exact = np.percentile(samples, q, method='inverted_cdf') / 1e3
+        assert exact <= histogram.percentile(q) <= exact * 10 ** (1 / LatencyHistogram.BUCKETS_PER_DECADE)
+    summary = histogram.summary()
+    assert summary['count'] == 10_000 and summary['max_us'] == samples.max() / 1e3
+    assert summary['mean_us'] == pytest.approx(samples.mean() / 1e3)
+    assert sum(int(line.split()[-1]) for line in histogram.render()) == 10_000
+
+def test_latency_extremes():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0.0
+    histogram.record(10)
+    histogram.record(10 ** 12)
+    assert histogram.counts[0] == 1 and histogram.counts[-1] == 1
+    assert histogram.percentile(50) == 1.0  # upper edge of the sub-microsecond bucket
+    assert histogram.percentile(100) == 10 ** 9
@@ -0,0 +1,71 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.data_handler import DataHandler, LiveDataHandler
+from backtester.price_cache import default_cache_dir
+from backtester.resample import AGGREGATIONS, TimeframePyramid, timeframe_nanos
+
+def pandas_resample(handler, timeframe):
+    return handler.data.resample(timeframe).agg(AGGREGATIONS).dropna()
+
+@pytest.mark.parametrize('timeframe', ['15min', '1h', '4h', '1D'])
+def test_levels_match_pandas_resample(price_csv, timeframe):
+    handler = DataHandler(price_csv, 'TEST', use_cache=False)
+    level = handler.pyramid.level(timeframe)
+    expected = pandas_resample(handler, timeframe)
+    np.testing.assert_array_equal(level.index, expected.index)
+    for name in AGGREGATIONS:
+        np.testing.assert_allclose(level.columns[name], expected[name].to_numpy())
+
+def test_coarser_levels_built_from_finer_match_direct(price_csv):
+    handler = DataHandler(price_csv, 'TEST', use_cache=False)
+    pyramid = TimeframePyramid(handler.index, handler.columns)
+    pyramid.build('1D', '15min', '1h')
+    direct = TimeframePyramid(handler.index, handler.columns).level('1D')
+    np.testing.assert_array_equal(pyramid.level('1D').first, direct.first)
+    for name in AGGREGATIONS:
+        np.testing.assert_allclose(pyramid.level('1D').columns[name], direct.columns[name])
+
+def test_forming_bar_has_no_look_ahead(price_csv):
+    handler = DataHandler(price_csv, 'TEST', use_cache=False)
+    data = handler.data
+    for _ in range(250):
+        handler.update_bars()
+        bars = handler.get_bars('TEST', 3, timeframe='1h')
+        assert len(bars) <= 3
+        # The last bar aggregates only the source bars seen so far in its hour
+        seen = data.iloc[:handler.current_bar + 1]
+        bucket = seen[seen.index >= bars.index[-1]]
+        expected = {'open': bucket['open'].iloc[0], 'high': bucket['high'].max(), 'low': bucket['low'].min(),
+                    'close': bucket['close'].iloc[-1], 'volume': bucket['volume'].sum()}
+        for name in AGGREGATIONS:
+            assert bars[name].iloc[-1] == pytest.approx(expected[name])
+        if len(bars) > 1:
+            complete = pandas_resample(handler, '1h').loc[bars.index[:-1]]
+            np.testing.assert_allclose(bars['close'].iloc[:-1], complete['close'])
+
+def test_levels_are_cached_until_the_csv_changes(price_csv):
+    handler = DataHandler(price_csv, 'TEST')
+    handler.pyramid.level('1h')
+    path = os.path.join(default_cache_dir(price_csv), 'resampled', '1h.npz')
+    assert os.path.exists(path)
+    reloaded = DataHandler(price_csv, 'TEST').pyramid
+    assert reloaded._load_level('1h') is not None
+    with open(price_csv, 'a') as f:
+        f.write('\n')
+    assert reloaded._load_level('1h') is None
+
+@pytest.mark.parametrize('timeframe', ['0min', '-1h', 'weekly', '1M'])
+def test_invalid_timeframes_raise_value_error(price_csv, timeframe):
+    with pytest.raises(ValueError, match='Unsupported timeframe'):
+        timeframe_nanos(timeframe)
+    handler = DataHandler(price_csv, 'TEST', use_cache=False)
+    handler.update_bars()
+    with pytest.raises(ValueError, match='Unsupported timeframe'):
+        handler.get_bars('TEST', 10, timeframe=timeframe)
+
+def test_live_handler_rejects_timeframes():
+    handler = LiveDataHandler(['TEST'], lookback=10)
+    with pytest.raises(ValueError, match='whole series'):
+        handler.get_bars('TEST', 5, timeframe='1h')
@@ -0,0 +1,64 @@
+import copy
+import os
+import pytest
+from backtester.engine import Backtester
+from backtester.result_cache import ResultCache, backtest_key, default_cache
+
+def test_key_ignores_sections_the_run_does_not_read(config):
+    key = backtest_key(config)
+    edited = copy.deepcopy(config)
+    edited['walk_forward'] = {'grids': {'ma': {'short_window': [5, 10]}}}
+    edited['paper'] = {'speed': 10, 'overflow': 'drop_oldest'}
+    edited['strategies']['rsi']['window'] = 21  # not traded
+    edited['backtest'].update(profile=False, log_fills=True)
+    assert backtest_key(edited) == key
+
+def test_key_follows_traded_settings(config):
+    key = backtest_key(config)
+    for edit in (lambda c: c['strategies']['ma'].update(short_window=5),
+                 lambda c: c['backtest'].update(slippage_bps=2.0),
+                 lambda c: c['backtest'].update(strategies=['ma', 'rsi'])):
+        edited = copy.deepcopy(config)
+        edit(edited)
+        assert backtest_key(edited) != key
+    assert backtest_key(config, engine='vectorized') != key
+
+def test_key_follows_price_file(config):
+    key = backtest_key(config)
+    with open(config['data']['csv_path'], 'a') as f:
+        f.write('\n')
+    assert backtest_key(config) != key
+
+def test_cached_run_skips_the_engine(config):
+    config['backtest']['result_cache'] = True
+    first = Backtester(config)
+    results = first.run_backtest()
+    assert not first.cached and first.portfolio is not None
+    second = Backtester(copy.deepcopy(config))
+    assert second.run_backtest() is results
+    assert second.cached and second.portfolio is None
+
+def test_memory_tier_is_lru(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=2, max_disk_bytes=0)
+    cache.put('a' * 64, 1)
+    cache.put('b' * 64, 2)
+    cache.get('a' * 64)
+    cache.put('c' * 64, 3)
+    assert cache.get('b' * 64) is None
+    assert cache.get('a' * 64) == 1 and cache.get('c' * 64) == 3
+    assert cache.info()['disk_entries'] == 0
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=1, max_disk_bytes=3000)
+    keys = [f'{i:064x}' for i in range(6)]
+    for i, key in enumerate(keys):
+        cache.put(key, b'x' * 900)
+        os.utime(cache._path(key), ns=(i * 10**9, i * 10**9))
+    info = cache.info()
+    assert info['disk_bytes'] <= 3000
+    # The newest entries survive, from disk after leaving the memory tier
+    assert ResultCache(str(tmp_path)).get(keys[-1]) == b'x' * 900
+    assert ResultCache(str(tmp_path)).get(keys[0]) is None
+
+def test_default_cache_honours_environment(tmp_path):
+    assert default_cache().cache_dir == str(tmp_path / 'result_cache')
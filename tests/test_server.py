@@ -0,0 +1,80 @@
+import copy
+import json
+import logging
+import os
+import urllib.error
+import urllib.request
+import pytest
+from backtester import client, server
+from backtester.engine import Backtester
+
+@pytest.fixture
+def running_server():
+    httpd, jobs = server.serve(port=0, workers=1, max_queued=4)
+    url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield url, jobs
+    httpd.shutdown()
+    jobs.shutdown()
+
+def test_run_job_matches_engine(config):
+    summary = server.run_job(copy.deepcopy(config), include_equity=True)
+    results = Backtester(copy.deepcopy(config)).run_backtest()
+    assert summary['stats'] == results['stats'] and summary['fills'] == results['fills']
+    assert len(summary['equity_curve']) == len(results['equity_curve'])
+    json.dumps(summary, default=server._to_json)
+
+def test_client_makes_paths_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = {'data': {'csv_path': 'prices.csv', 'universe': {'A': 'a.csv', 'B': '/data/b.csv'}},
+              'backtest': {'journal': 'runs/latest'}}
+    assert client.relative_paths(config) == ['prices.csv', 'a.csv', 'runs/latest']
+    resolved = client.absolute_paths(config)
+    assert resolved['data']['csv_path'] == str(tmp_path / 'prices.csv')
+    assert resolved['data']['universe'] == {'A': str(tmp_path / 'a.csv'), 'B': '/data/b.csv'}
+    assert resolved['backtest']['journal'] == str(tmp_path / 'runs/latest')
+    assert client.relative_paths(resolved) == [] and config['data']['csv_path'] == 'prices.csv'
+
+def test_server_rejects_relative_paths(running_server, config, monkeypatch):
+    url, _ = running_server
+    directory, name = os.path.split(config['data']['csv_path'])
+    config['data']['csv_path'] = name
+    request = urllib.request.Request(f'{url}/jobs', json.dumps({'config': config}).encode(), method='POST')
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request)
+    assert error.value.code == 400 and 'absolute' in json.load(error.value)['error']
+
+    # Through the client the same config resolves against the client's directory
+    monkeypatch.chdir(directory)
+    response = client.submit(config, url)
+    assert response['status'] == 'done'
+    assert response['results']['fills'] == server.run_job(client.absolute_paths(config))['fills']
+
+def test_job_lifecycle(running_server, config):
+    url, jobs = running_server
+    assert client.server_available(url)
+    response = client.submit(config, url, wait=False)
+    assert response['status'] == 'queued'
+    status = jobs.status(response['id'], timeout=60)
+    assert status['status'] == 'done' and 'equity_curve' not in status['results']
+    assert client.status(response['id'], url)['status'] == 'done'
+    assert client.status('missing', url)['code'] == 404
+
+def test_worker_initializer_preloads_prices(config, monkeypatch):
+    monkeypatch.setattr(server, '_store', None)
+    root = logging.getLogger()
+    monkeypatch.setattr(root, 'level', root.level)
+    server._init_worker([config['data'], {'csv_path': '/missing.csv', 'symbol': 'X'}])
+    assert list(server._store._prices) == [config['data']['csv_path']]
+
+def test_vectorized_jobs_use_preloaded_prices(config, monkeypatch):
+    monkeypatch.setattr(server, '_store', None)
+    root = logging.getLogger()
+    monkeypatch.setattr(root, 'level', root.level)
+    config['backtest']['engine'] = 'vectorized'
+    config['backtest']['strategies'] = ['ma']
+    server._init_worker([config['data']])
+    expected = server.run_job(copy.deepcopy(config))
+
+    # Worker arrays stay resident: the job must not go back to the CSV
+    monkeypatch.setattr('backtester.vectorized.DataHandler', None)
+    assert server.run_job(copy.deepcopy(config))['stats'] == expected['stats']
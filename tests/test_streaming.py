@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.data_handler import DataHandler, LiveDataHandler, StreamingDataHandler
+from backtester.engine import Backtester
+
+def test_stream_matches_in_memory_handler(price_csv):
+    streaming = StreamingDataHandler(price_csv, 'TEST', lookback=40, chunk_size=64)
+    in_memory = DataHandler(price_csv, 'TEST')
+    while in_memory.continue_backtest:
+        assert streaming.continue_backtest
+        expected, = in_memory.update_bars()
+        bar, = streaming.update_bars()
+        assert bar.to_dict() == expected.to_dict()
+        window = streaming.get_window('TEST', 100)
+        np.testing.assert_array_equal(window['close'], in_memory.get_window('TEST', 40)['close'])
+    assert not streaming.continue_backtest
+
+def test_get_bars_is_bounded_by_lookback(price_csv):
+    streaming = StreamingDataHandler(price_csv, 'TEST', lookback=25, chunk_size=100)
+    for _ in range(300):
+        streaming.update_bars()
+    bars = streaming.get_bars('TEST', 500)
+    expected = pd.read_csv(price_csv, parse_dates=['datetime']).set_index('datetime').iloc[275:300]
+    expected.index = expected.index.as_unit('ns')
+    pd.testing.assert_frame_equal(bars, expected, check_freq=False)
+
+def test_unsorted_file_is_rejected(tmp_path, price_csv):
+    path = str(tmp_path / 'unsorted.csv')
+    frame = pd.read_csv(price_csv)
+    pd.concat([frame.iloc[100:], frame.iloc[:100]]).to_csv(path, index=False)
+    streaming = StreamingDataHandler(path, 'TEST', chunk_size=50)
+    with pytest.raises(ValueError):
+        while streaming.continue_backtest:
+            streaming.update_bars()
+
+def test_timeframes_are_rejected(price_csv):
+    streaming = StreamingDataHandler(price_csv, 'TEST')
+    streaming.update_bars()
+    with pytest.raises(ValueError):
+        streaming.get_bars('TEST', 10, timeframe='1h')
+    with pytest.raises(ValueError):
+        streaming.get_window('TEST', 10, timeframe='1h')
+
+def test_streaming_run_matches_in_memory_run(config):
+    in_memory = Backtester(config).run_backtest()
+    config['data'].update(streaming=True, chunk_size=100)
+    streamed = Backtester(config).run_backtest()
+    assert streamed['stats'] == in_memory['stats']
+    np.testing.assert_allclose(streamed['equity_curve'], in_memory['equity_curve'])
+
+def test_queries_before_the_first_bar_are_empty():
+    handler = LiveDataHandler(['TEST'], lookback=10)
+    assert handler.get_window('TEST', 5) == {}
+    bars = handler.get_bars('TEST', 5)
+    assert bars.empty and isinstance(bars.index, pd.DatetimeIndex)
@@ -0,0 +1,11 @@
+import pytest
+from benchmarks.suite import prepare_case, run_stage
+
+def test_stage_runs_in_its_own_process(tmp_path):
+    result = run_stage('run_backtest', prepare_case(str(tmp_path), 500, 1, 200), allocations=False)
+    assert result['items'] == 200 and result['peak_rss_bytes'] > 0
+
+def test_failed_stage_process_raises_instead_of_hanging(tmp_path):
+    case = prepare_case(str(tmp_path), 200, 1, 100)
+    with pytest.raises(RuntimeError, match="'no_such_stage' exited with code 1"):
+        run_stage('no_such_stage', case, allocations=False)
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+from backtester.data_handler import DataHandler
+from backtester.result_cache import default_cache
+from backtester.sweep import evaluate, parameter_grid, run_sweep
+from backtester.vectorized import VectorizedBacktester
+
+GRID = {'short_window': [5, 10], 'long_window': [10, 30]}
+
+def test_parameter_grid():
+    assert parameter_grid(GRID) == [
+        {'short_window': 5, 'long_window': 10}, {'short_window': 5, 'long_window': 30},
+        {'short_window': 10, 'long_window': 10}, {'short_window': 10, 'long_window': 30}
+    ]
+
+def test_parallel_sweep_matches_single_runs(config):
+    config['backtest']['result_cache'] = True
+    table = run_sweep(config, 'ma', GRID, workers=2)
+    # short >= long is skipped
+    assert len(table) == 3
+    for row in table.to_dict('records'):
+        single = dict(config, strategies={'ma': {'short_window': row['short_window'],
+                                                 'long_window': row['long_window']}})
+        single['backtest'] = dict(config['backtest'], strategies=['ma'])
+        equity = VectorizedBacktester(single).run_backtest()['equity_curve'][-1]
+        assert row['final_equity'] == pytest.approx(equity)
+
+def test_sweep_rows_come_from_result_cache(config):
+    config['backtest']['result_cache'] = True
+    first = run_sweep(config, 'ma', GRID, workers=1)
+    hits = default_cache().hits
+    second = run_sweep(config, 'ma', GRID, workers=1)
+    assert default_cache().hits == hits + len(first)
+    pd.testing.assert_frame_equal(first, second)
+
+def test_evaluate_scores_one_parameter_set(config, price_csv):
+    columns = DataHandler(price_csv, 'TEST').columns
+    row = evaluate(columns, 'rsi', config['strategies']['rsi'], config['backtest'])
+    assert {'sharpe_ratio', 'max_drawdown_pct', 'total_return', 'num_trades', 'final_equity'} <= row.keys()
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import iter_bars, write_csv, write_universe
+
+def test_chunks_continue_one_series():
+    whole = pd.concat(iter_bars(1000, seed=4))
+    chunked = pd.concat(iter_bars(1000, seed=4, chunk_size=128))
+    assert len(chunked) == 1000
+    np.testing.assert_array_equal(chunked['datetime'], whole['datetime'])
+    # Each bar opens at the previous close, across chunk boundaries too
+    np.testing.assert_array_equal(chunked['open'].to_numpy()[1:], chunked['close'].to_numpy()[:-1])
+
+def test_bars_are_consistent():
+    bars = pd.concat(iter_bars(5000, seed=5))
+    assert (bars['high'] >= bars[['open', 'close']].max(axis=1)).all()
+    assert (bars['low'] <= bars[['open', 'close']].min(axis=1)).all()
+    assert (bars['volume'] >= 0).all()
+
+def test_missing_drops_bars(tmp_path):
+    paths = write_universe(str(tmp_path), 2, 2000, missing=0.25)
+    assert set(paths) == {'SYM000', 'SYM001'}
+    for path in paths.values():
+        assert 1300 < len(pd.read_csv(path)) < 1700
+
+def test_write_csv_matches_prices_layout(tmp_path):
+    frame = pd.read_csv(write_csv(str(tmp_path / 'p.csv'), 10))
+    assert list(frame.columns) == ['datetime', 'open', 'high', 'low', 'close', 'volume']
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from backtester.data_handler import UniverseDataHandler
+from backtester.engine import Backtester
+
+def test_stream_is_time_ordered_and_complete(universe):
+    handler = UniverseDataHandler(universe)
+    seen = {symbol: [] for symbol in universe}
+    last = None
+    while handler.continue_backtest:
+        bars = handler.update_bars()
+        stamps = {bar['datetime'] for bar in bars}
+        assert len(stamps) == 1 and len(bars) == len({bar['symbol'] for bar in bars})
+        stamp = stamps.pop()
+        assert last is None or stamp > last
+        last = stamp
+        for bar in bars:
+            seen[bar['symbol']].append(bar['datetime'])
+    for symbol, path in universe.items():
+        assert pd.DatetimeIndex(seen[symbol]).equals(
+            pd.DatetimeIndex(pd.read_csv(path, parse_dates=['datetime'])['datetime']))
+
+def test_sparse_symbols_are_not_forward_filled(universe):
+    handler = UniverseDataHandler(universe)
+    for _ in range(100):
+        handler.update_bars()
+    for symbol in universe:
+        bars = handler.get_bars(symbol, 500)
+        assert bars.index.is_unique and bars.index[-1] <= handler.current_datetime
+
+def test_universe_run_trades_every_symbol(config, universe):
+    config['data'] = {'universe': universe}
+    bt = Backtester(config)
+    results = bt.run_backtest()
+    traded = set(bt.portfolio.trades_frame()['symbol'])
+    assert traded == set(universe)
+    assert len(results['equity_curve']) == bt.data_handler.bars_total
+    assert np.isfinite(results['equity_curve']).all()
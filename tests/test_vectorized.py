@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from backtester.execution import ExecutionHandler
+from backtester.vectorized import VectorizedBacktester, bounded_positions, check_parity, simulate_signals
+
+def positions_loop(signals, low, high):
+    position, out = min(max(0, low), high), []
+    for signal in signals:
+        position = min(max(position + signal, low), high)
+        out.append(position)
+    return np.array(out)
+
+@pytest.mark.parametrize('limits', [(-1, 1), (0, 1), (-2, 3), (1, 2)])
+def test_bounded_positions_matches_sequential_loop(limits):
+    signals = np.random.default_rng(0).integers(-1, 2, 1001).astype(np.int8)
+    np.testing.assert_array_equal(bounded_positions(signals, *limits), positions_loop(signals, *limits))
+
+def test_bounded_positions_empty():
+    assert len(bounded_positions(np.zeros(0, dtype=np.int8), -1, 1)) == 0
+
+def test_simulate_signals_round_trip_pnl():
+    handler = ExecutionHandler(slippage_bps=0.0, commission_per_trade=1.0)
+    closes = np.array([100.0, 101.0, 103.0, 102.0])
+    result = simulate_signals(np.array([1, 0, -1, 0], dtype=np.int8), (-1, 1), closes, handler, 100000.0)
+    assert result['fill_idx'].tolist() == [0, 2]
+    assert result['pnl'].tolist() == [0.0, 100 * 3.0]
+    assert result['stats']['wins'] == 1
+    assert result['equity_curve'][-1] == pytest.approx(100000.0 + 300.0 - 2.0)
+
+@pytest.mark.parametrize('strategy', ['ma', 'rsi', 'volume'])
+def test_parity_with_event_engine(config, strategy):
+    config['backtest']['strategies'] = [strategy]
+    parity = check_parity(config)
+    assert parity['match'], parity['mismatches']
+
+def test_rejects_universe(config, universe):
+    config['data'] = {'universe': universe}
+    with pytest.raises(ValueError):
+        VectorizedBacktester(config).run_backtest()
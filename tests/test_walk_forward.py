@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.data_handler import DataHandler
+from backtester.execution import ExecutionHandler
+from backtester.vectorized import simulate_signals
+from backtester.walk_forward import SignalCache, make_folds, run_walk_forward, stitch
+from strategies.factory import build_strategy
+
+GRID = {'short_window': [5, 10], 'long_window': [20, 40]}
+
+def test_rolling_and_anchored_folds():
+    assert make_folds(100, 40, 20) == [(0, 40, 40, 60), (20, 60, 60, 80), (40, 80, 80, 100)]
+    assert make_folds(95, 40, 20, anchored=True) == [(0, 40, 40, 60), (0, 60, 60, 80)]
+    assert make_folds(50, 40, 20) == []
+
+def test_stitch_chains_window_returns():
+    folds = [{'equity_curve': np.array([100.0, 110.0])}, {'equity_curve': np.array([100.0, 90.0])}]
+    np.testing.assert_allclose(stitch(folds, 100.0), [100.0, 110.0, 110.0, 99.0])
+
+def test_signal_cache_evicts_least_recently_used(price_csv):
+    columns = DataHandler(price_csv, 'TEST').columns
+    cache = SignalCache(columns, 'ma', 'TEST')
+    first = cache.get({'short_window': 5, 'long_window': 20})
+    cache.max_bytes = 2 * first[0].nbytes
+    assert cache.get({'short_window': 5, 'long_window': 20}) is first
+    cache.get({'short_window': 10, 'long_window': 20})
+    cache.get({'short_window': 10, 'long_window': 40})
+    assert len(cache._entries) <= 2
+    assert cache.get({'short_window': 5, 'long_window': 20}) is not first
+
+def test_serial_matches_process_pool(config):
+    serial = run_walk_forward(config, 'ma', GRID, 300, 100, workers=1)
+    parallel = run_walk_forward(config, 'ma', GRID, 300, 100, workers=2)
+    pd.testing.assert_frame_equal(serial['folds'], parallel['folds'])
+    np.testing.assert_array_equal(serial['equity_curve'], parallel['equity_curve'])
+    assert len(serial['folds']) == 7
+    assert len(serial['equity_curve']) == len(serial['index']) == 700
+    assert serial['stats']['total_trades'] == serial['folds']['test_trades'].sum()
+
+def test_rejects_bad_inputs(config):
+    with pytest.raises(ValueError, match='metric'):
+        run_walk_forward(config, 'ma', GRID, 300, 100, metric='profit')
+    with pytest.raises(ValueError, match='too few'):
+        run_walk_forward(config, 'ma', GRID, 900, 200, workers=1)
+    with pytest.raises(ValueError, match='no valid'):
+        run_walk_forward(config, 'ma', {'short_window': [50], 'long_window': [20]}, 300, 100, workers=1)
+
+def test_test_windows_end_flat_after_paying_exit_costs(config):
+    result = run_walk_forward(config, 'ma', GRID, 300, 100, workers=1)
+    handler = DataHandler(config['data']['csv_path'], 'TEST')
+    execution = ExecutionHandler(1.0, 1.0)
+    for _, fold in result['folds'].iterrows():
+        start, end = fold['test_start'], fold['test_end']
+        raw = build_strategy('ma', {'short_window': fold['short_window'],
+                                    'long_window': fold['long_window']}, 'TEST').generate_signals_array(handler.columns)
+        window = simulate_signals(raw[start:end], (-1, 1), handler.columns['close'][start:end],
+                                  execution, 100000.0, flatten_at_end=True)
+        assert window['positions'][-1] == 0
+        assert fold['test_trades'] == window['stats']['total_trades']
+        # Every entry has its exit inside the window, each paying commission
+        assert window['stats']['total_trades'] % 2 == 0
+        assert window['equity_curve'][-1] == pytest.approx(
+            100000.0 + window['pnl'].sum() - window['stats']['total_fees'])